@@ -0,0 +1,276 @@
+"""Paints laid-out captions with outline, shadow and backing box effects."""
+
+import threading
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Tuple, Union
+from PIL import Image, ImageColor, ImageDraw
+from MemeGenerator.CaptionStyle import CaptionStyle
+from MemeGenerator.FontRegistry import FontRegistry, font_registry
+from MemeGenerator.TextLayout import CaptionLayout
+
+
+class CaptionRenderer:
+    """
+    Draw captions onto images with outline, shadow and backing box effects.
+
+    A plain style is drawn directly with ``ImageDraw.text``. Any other style
+    is built from coverage masks: the glyphs, drawn once, and the glyphs
+    grown by the outline width with a vectorized NumPy dilation (much cheaper
+    than rendering the text again with a stroke). The shadow is the grown mask
+    scaled by the shadow opacity. Each layer, box first, is then blended into
+    the image by a single ``Image.paste`` of a solid colour through its mask,
+    so no per-pixel work happens in Python.
+
+    Masks depend only on the caption, font, size, outline width and shadow
+    opacity, so they are cached, least recently used first, and a repeated
+    caption costs only the blending.
+
+    Attributes:
+        DEFAULT_MAX_MASKS (int): The default number of cached caption masks.
+        hits (int): The number of captions whose masks were cached.
+        misses (int): The number of captions whose masks were rendered.
+
+    Methods:
+        __init__(self, fonts: FontRegistry, max_masks: int):
+            Initialize a renderer with an empty mask cache.
+
+        draw(self, img: Image.Image, layout: CaptionLayout, font_path: str, position: tuple,
+             style: CaptionStyle) -> Image.Image:
+            Paint a caption onto an image and return the image.
+
+        layer(self, layout: CaptionLayout, font_path: str, style: CaptionStyle) -> Tuple[Image.Image, tuple]:
+            Render a caption once as a transparent layer.
+
+        stats(self) -> dict:
+            Return the mask cache counters.
+
+    """
+
+    DEFAULT_MAX_MASKS = 256
+
+    def __init__(self, fonts: Union[FontRegistry, None] = None, max_masks: int = DEFAULT_MAX_MASKS):
+        """
+        Initialize a renderer with an empty mask cache.
+
+        Args:
+            fonts (FontRegistry | None): The font pool. The process-wide
+                registry is used if omitted.
+            max_masks (int): The maximum number of cached caption masks.
+
+        """
+        self._fonts = fonts if fonts is not None else font_registry
+        self._max_masks = max_masks
+        self._masks = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def draw(self, img: Image.Image, layout: CaptionLayout, font_path: str, position: tuple,
+             style: CaptionStyle) -> Image.Image:
+        """
+        Paint a caption onto an image and return the image.
+
+        Effects are composited in RGB, so an image in another mode is
+        converted first and the converted copy is returned.
+
+        Args:
+            img (Image.Image): The image to paint on; modified in place if it is RGB.
+            layout (CaptionLayout): The laid out caption.
+            font_path (str): The path to the TrueType font file.
+            position (tuple): The (x, y) of the top left corner of the text.
+            style (CaptionStyle): The colours and effects.
+
+        Returns:
+            Image.Image: The image with the caption.
+
+        """
+        text_x, text_y = position
+        if style.plain:
+            font = self._fonts.get(font_path, layout.size)
+            draw = ImageDraw.Draw(img)
+            for index, line in enumerate(layout.lines):
+                draw.text((text_x, text_y + index * layout.line_height), line, font=font, fill=style.fill)
+            return img
+
+        if img.mode != 'RGB':
+            img = img.convert('RGB')
+
+        if style.box_opacity:
+            padding = style.box_padding
+            box = (text_x - padding, text_y - padding,
+                   text_x + layout.width + padding, text_y + layout.height + padding)
+            box_mask = Image.new('L', (box[2] - box[0], box[3] - box[1]), round(style.box_opacity * 255))
+            img.paste(_rgb(style.box_fill), box, box_mask)
+
+        shadow_opacity = style.shadow_opacity if any(style.shadow_offset) else 0
+        text_mask, stroke_mask, shadow_mask = self._caption_masks(layout, font_path, style.outline_width,
+                                                                  shadow_opacity)
+        margin = style.outline_width
+        origin = (text_x - margin, text_y - margin)
+        if shadow_mask is not None:
+            shadow_x, shadow_y = style.shadow_offset
+            img.paste(_rgb(style.shadow_fill), (origin[0] + shadow_x, origin[1] + shadow_y), shadow_mask)
+        if style.outline_width:
+            img.paste(_rgb(style.outline_fill), origin, stroke_mask)
+        img.paste(_rgb(style.fill), origin, text_mask)
+        return img
+
+    def layer(self, layout: CaptionLayout, font_path: str, style: CaptionStyle) -> Tuple[Image.Image, tuple]:
+        """
+        Render a caption once as a transparent layer.
+
+        The layer holds every effect of the style, so pasting it through its
+        own alpha (``img.paste(layer, box, layer)``) paints the caption with a
+        single operation. Animations use it to caption every frame without
+        drawing the text again.
+
+        Args:
+            layout (CaptionLayout): The laid out caption.
+            font_path (str): The path to the TrueType font file.
+            style (CaptionStyle): The colours and effects.
+
+        Returns:
+            Tuple[Image.Image, tuple]: The RGBA layer, and the (x, y) offset
+                of its top left corner from the top left corner of the text.
+
+        """
+        shadow_opacity = style.shadow_opacity if any(style.shadow_offset) else 0
+        text_mask, stroke_mask, shadow_mask = self._caption_masks(layout, font_path, style.outline_width,
+                                                                  shadow_opacity)
+        margin = style.outline_width
+        pieces = []
+        if style.box_opacity:
+            padding = style.box_padding
+            box_mask = Image.new('L', (layout.width + 2 * padding, layout.height + 2 * padding),
+                                 round(style.box_opacity * 255))
+            pieces.append((style.box_fill, box_mask, (-padding, -padding)))
+        if shadow_mask is not None:
+            shadow_x, shadow_y = style.shadow_offset
+            pieces.append((style.shadow_fill, shadow_mask, (shadow_x - margin, shadow_y - margin)))
+        if style.outline_width:
+            pieces.append((style.outline_fill, stroke_mask, (-margin, -margin)))
+        pieces.append((style.fill, text_mask, (-margin, -margin)))
+
+        left = min(x for _, _, (x, _) in pieces)
+        top = min(y for _, _, (_, y) in pieces)
+        right = max(x + mask.width for _, mask, (x, _) in pieces)
+        bottom = max(y + mask.height for _, mask, (_, y) in pieces)
+        layer = Image.new('RGBA', (right - left, bottom - top), (0, 0, 0, 0))
+        for color, mask, (x, y) in pieces:
+            solid = Image.new('RGBA', mask.size, _rgb(color) + (0,))
+            solid.putalpha(mask)
+            layer.alpha_composite(solid, (x - left, y - top))
+        return layer, (left, top)
+
+    def stats(self) -> dict:
+        """
+        Return the mask cache counters.
+
+        Returns:
+            dict: The hits, misses and number of cached masks.
+
+        """
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'entries': len(self._masks),
+        }
+
+    def _caption_masks(self, layout: CaptionLayout, font_path: str, outline_width: int,
+                       shadow_opacity: float) -> Tuple[Image.Image, Image.Image, Union[Image.Image, None]]:
+        """
+        Return the masks of a caption, rendering them on a miss.
+
+        The masks have a border of ``outline_width`` pixels around the text.
+
+        Args:
+            layout (CaptionLayout): The laid out caption.
+            font_path (str): The path to the TrueType font file.
+            outline_width (int): The outline width.
+            shadow_opacity (float): The shadow opacity, or 0 for no shadow.
+
+        Returns:
+            Tuple[Image.Image, Image.Image, Image.Image | None]: The glyph mask,
+                the glyphs grown by the outline, and the grown mask scaled by
+                the shadow opacity (None without a shadow).
+
+        """
+        key = (layout, font_path, outline_width, shadow_opacity)
+        with self._lock:
+            masks = self._masks.get(key)
+            if masks is not None:
+                self._masks.move_to_end(key)
+                self.hits += 1
+                return masks
+
+        font = self._fonts.get(font_path, layout.size)
+        margin = outline_width
+        text_image = Image.new('L', (layout.width + 2 * margin, layout.height + 2 * margin), 0)
+        draw = ImageDraw.Draw(text_image)
+        for index, line in enumerate(layout.lines):
+            draw.text((margin, margin + index * layout.line_height), line, font=font, fill=255)
+
+        # NumPy is only needed for effects, so the plain style never imports it.
+        import numpy as np
+
+        stroke = np.asarray(text_image)
+        stroke_image = text_image
+        if outline_width:
+            stroke = _dilate(stroke, outline_width)
+            stroke_image = Image.fromarray(stroke, 'L')
+        shadow_image = None
+        if shadow_opacity:
+            shadow = (stroke * np.float32(shadow_opacity) + np.float32(0.5)).astype(np.uint8)
+            shadow_image = Image.fromarray(shadow, 'L')
+
+        masks = (text_image, stroke_image, shadow_image)
+        with self._lock:
+            self.misses += 1
+            self._masks[key] = masks
+            while len(self._masks) > self._max_masks:
+                self._masks.popitem(last=False)
+        return masks
+
+
+@lru_cache(maxsize=64)
+def _rgb(color: str) -> Tuple[int, int, int]:
+    """
+    Parse a colour into an RGB tuple.
+
+    Args:
+        color (str): Any colour understood by Pillow.
+
+    Returns:
+        Tuple[int, int, int]: The red, green and blue components.
+
+    """
+    return ImageColor.getrgb(color)[:3]
+
+
+def _dilate(mask: 'numpy.ndarray', radius: int) -> 'numpy.ndarray':
+    """
+    Grow a coverage mask by a disk of the given radius.
+
+    Each pixel takes the maximum coverage within the disk around it, computed
+    as an element-wise maximum over shifted views of the padded mask.
+
+    Args:
+        mask (np.ndarray): A 2-D uint8 coverage mask.
+        radius (int): The radius of the disk in pixels.
+
+    Returns:
+        np.ndarray: The grown mask.
+
+    """
+    import numpy as np
+
+    height, width = mask.shape
+    padded = np.pad(mask, radius)
+    grown = mask.copy()
+    for dy in range(-radius, radius + 1):
+        for dx in range(-radius, radius + 1):
+            if dx * dx + dy * dy <= radius * radius + radius:
+                np.maximum(grown, padded[radius + dy:radius + dy + height, radius + dx:radius + dx + width],
+                           out=grown)
+    return grown
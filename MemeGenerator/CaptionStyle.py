@@ -0,0 +1,110 @@
+"""Visual settings for meme captions."""
+
+from typing import NamedTuple, Tuple
+
+# The settings of each named style; the fields they do not set keep their defaults.
+_PRESETS = {
+    'outline': {'fill': '#ffffff', 'outline_width': 2, 'outline_fill': '#000000'},
+    'shadow': {'fill': '#ffffff', 'shadow_offset': (2, 2), 'shadow_opacity': 0.8},
+    'box': {'fill': '#ffffff', 'box_opacity': 0.55},
+    'plain': {},
+}
+
+
+class CaptionStyle(NamedTuple):
+    """
+    How a caption is painted onto a meme.
+
+    The field defaults give plain text in the original red. An outline, a
+    drop shadow and a semi-transparent backing box can be added to keep
+    captions readable on busy photos; they are painted box first, then
+    shadow, outline and text.
+
+    ``preset`` returns one of the named styles offered by the web app and the
+    command line: white text with a black ``outline`` (the default, readable
+    on any photo), with a drop ``shadow``, on a dark ``box``, or the ``plain``
+    red text of earlier versions.
+
+    Attributes:
+        PRESETS (tuple): The names of the predefined styles.
+        DEFAULT_PRESET (str): The style used when none is chosen.
+        fill (str): The text colour.
+        outline_width (int): The width of the outline around each glyph, or 0 for none.
+        outline_fill (str): The outline colour.
+        shadow_offset (tuple): The (x, y) offset of the drop shadow, or (0, 0) for none.
+        shadow_fill (str): The shadow colour.
+        shadow_opacity (float): The shadow opacity, from 0 to 1.
+        box_fill (str): The backing box colour.
+        box_opacity (float): The backing box opacity, from 0 (no box) to 1.
+        box_padding (int): The space between the text and the edges of the box.
+
+    Methods:
+        plain (property) -> bool:
+            Whether the style has no outline, shadow or box.
+
+        validate(self) -> CaptionStyle:
+            Check the sizes and opacities and return the style.
+
+        preset(cls, name: str) -> CaptionStyle:
+            Return a predefined style by name.
+
+    """
+
+    PRESETS = tuple(_PRESETS)
+    DEFAULT_PRESET = 'outline'
+
+    fill: str = '#f20f0f'
+    outline_width: int = 0
+    outline_fill: str = '#000000'
+    shadow_offset: Tuple[int, int] = (0, 0)
+    shadow_fill: str = '#000000'
+    shadow_opacity: float = 0.6
+    box_fill: str = '#000000'
+    box_opacity: float = 0.0
+    box_padding: int = 8
+
+    @property
+    def plain(self) -> bool:
+        """Whether the style has no outline, shadow or box."""
+        return not self.outline_width and not any(self.shadow_offset) and not self.box_opacity
+
+    def validate(self) -> 'CaptionStyle':
+        """
+        Check the sizes and opacities and return the style.
+
+        Returns:
+            CaptionStyle: The style, with the shadow offset as a tuple.
+
+        Raises:
+            ValueError: If a size is negative or an opacity is outside 0 to 1.
+
+        """
+        style = self._replace(shadow_offset=tuple(self.shadow_offset))
+        if style.outline_width < 0 or style.box_padding < 0:
+            raise ValueError("Outline width and box padding must not be negative")
+        if len(style.shadow_offset) != 2:
+            raise ValueError(f"Shadow offset must be an (x, y) pair, got {self.shadow_offset!r}")
+        for name in ('shadow_opacity', 'box_opacity'):
+            if not 0 <= getattr(style, name) <= 1:
+                raise ValueError(f"{name} must be between 0 and 1, got {getattr(style, name)}")
+        return style
+
+    @classmethod
+    def preset(cls, name: str) -> 'CaptionStyle':
+        """
+        Return a predefined style by name.
+
+        Args:
+            name (str): One of ``PRESETS``, case-insensitive.
+
+        Returns:
+            CaptionStyle: The style.
+
+        Raises:
+            ValueError: If there is no style with that name.
+
+        """
+        settings = _PRESETS.get(name.lower())
+        if settings is None:
+            raise ValueError(f"Unknown caption style {name!r}, expected one of {cls.PRESETS}")
+        return cls(**settings)
@@ -0,0 +1,159 @@
+"""Output encoding settings for rendered memes."""
+
+from typing import IO, NamedTuple, Union
+from PIL import Image
+
+
+class EncodeOptions(NamedTuple):
+    """
+    How a rendered meme is encoded.
+
+    Options that a format does not support are ignored: PNG and GIF are
+    lossless and ignore ``quality``, ``progressive`` and ``subsampling``; WebP
+    ignores ``progressive`` and ``subsampling``, and uses its slowest, smallest
+    compression method when ``optimize`` is set. A ``quality`` or
+    ``subsampling`` of None keeps Pillow's default.
+
+    Images in a mode the format cannot store, such as CMYK for anything but
+    JPEG, are converted to RGB, or to RGBA if they have transparency and the
+    format can keep it.
+
+    Only GIF and WebP can hold an animation; ``animated`` maps the other
+    formats to GIF for animated sources.
+
+    Attributes:
+        FORMATS (dict): Maps each supported format to its file extension and MIME type.
+        ANIMATED_FORMATS (tuple): The formats that can hold an animation.
+        SUBSAMPLING (tuple): The supported JPEG chroma subsampling values.
+        MODES (dict): The image modes each format stores without conversion.
+        format (str): The output format: ``JPEG``, ``WEBP``, ``PNG`` or ``GIF``.
+        quality (int | None): The lossy quality, from 1 to 100.
+        progressive (bool): Write a progressive JPEG.
+        optimize (bool): Spend more encoding time for a smaller file.
+        subsampling (str | None): The JPEG chroma subsampling: ``4:4:4``, ``4:2:2`` or ``4:2:0``.
+
+    Methods:
+        extension, mimetype (properties) -> str:
+            The file extension (without the dot) and MIME type of the format.
+
+        validate(self) -> EncodeOptions:
+            Check the options and return them with the format upper-cased.
+
+        animated(self) -> EncodeOptions:
+            Return the options used when the source image is animated.
+
+        for_extension(extension: str) -> str | None:
+            Return the format written with a file extension.
+
+        save(self, img: Image.Image, fp: str | IO[bytes]):
+            Encode an image to a path or file object.
+
+    """
+
+    format: str = 'JPEG'
+    quality: Union[int, None] = None
+    progressive: bool = False
+    optimize: bool = False
+    subsampling: Union[str, None] = None
+
+    FORMATS = {
+        'JPEG': ('jpg', 'image/jpeg'),
+        'WEBP': ('webp', 'image/webp'),
+        'PNG': ('png', 'image/png'),
+        'GIF': ('gif', 'image/gif'),
+    }
+    ANIMATED_FORMATS = ('GIF', 'WEBP')
+    SUBSAMPLING = ('4:4:4', '4:2:2', '4:2:0')
+    MODES = {
+        'JPEG': ('RGB', 'L', 'CMYK'),
+        'WEBP': ('RGB', 'RGBA'),
+        'PNG': ('RGB', 'RGBA', 'L', 'LA', 'P', '1'),
+        'GIF': ('RGB', 'RGBA', 'L', 'P', '1'),
+    }
+
+    @property
+    def extension(self) -> str:
+        """The file extension of the format, without the dot."""
+        return self.FORMATS[self.format][0]
+
+    @property
+    def mimetype(self) -> str:
+        """The MIME type of the format."""
+        return self.FORMATS[self.format][1]
+
+    def validate(self) -> 'EncodeOptions':
+        """
+        Check the options and return them with the format upper-cased.
+
+        Returns:
+            EncodeOptions: The validated options.
+
+        Raises:
+            ValueError: If the format, quality or subsampling is not supported.
+
+        """
+        options = self._replace(format=self.format.upper())
+        if options.format not in self.FORMATS:
+            raise ValueError(f"Unsupported output format {self.format!r}, expected one of {tuple(self.FORMATS)}")
+        if options.quality is not None and not 1 <= options.quality <= 100:
+            raise ValueError(f"Quality must be between 1 and 100, got {options.quality}")
+        if options.subsampling is not None and options.subsampling not in self.SUBSAMPLING:
+            raise ValueError(f"Unsupported subsampling {options.subsampling!r}, expected one of {self.SUBSAMPLING}")
+        return options
+
+    def animated(self) -> 'EncodeOptions':
+        """
+        Return the options used when the source image is animated.
+
+        Returns:
+            EncodeOptions: These options if the format can hold an animation,
+                otherwise GIF with the same ``optimize`` setting.
+
+        """
+        if self.format in self.ANIMATED_FORMATS:
+            return self
+        return EncodeOptions('GIF', optimize=self.optimize)
+
+    @classmethod
+    def for_extension(cls, extension: str) -> Union[str, None]:
+        """
+        Return the format written with a file extension.
+
+        Args:
+            extension (str): The extension, without the dot.
+
+        Returns:
+            str | None: The format, or None if no supported format uses the extension.
+
+        """
+        for name, (format_extension, _) in cls.FORMATS.items():
+            if format_extension == extension:
+                return name
+        return None
+
+    def save(self, img: Image.Image, fp: Union[str, IO[bytes]]):
+        """
+        Encode an image to a path or file object.
+
+        Args:
+            img (Image.Image): The image to encode.
+            fp (str | IO[bytes]): The destination path or binary file object.
+
+        """
+        params = {}
+        if self.format in ('PNG', 'GIF'):
+            params['optimize'] = self.optimize
+        else:
+            if self.quality is not None:
+                params['quality'] = self.quality
+            if self.format == 'JPEG':
+                params['progressive'] = self.progressive
+                params['optimize'] = self.optimize
+                if self.subsampling is not None:
+                    params['subsampling'] = self.subsampling
+            elif self.optimize:
+                params['method'] = 6
+        if img.mode not in self.MODES[self.format]:
+            transparent = 'A' in img.getbands() or 'transparency' in img.info
+            img = img.convert('RGBA' if transparent and 'RGBA' in self.MODES[self.format] else 'RGB')
+        img.save(fp, format=self.format, **params)
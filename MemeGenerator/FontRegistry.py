@@ -0,0 +1,101 @@
+"""A process-wide, thread-safe pool of loaded font faces."""
+
+import io
+import threading
+import time
+from PIL import ImageFont
+
+
+class FontRegistry:
+    """
+    Load each font face once and share it across threads.
+
+    Faces are keyed by (path, size). The font file itself is read from disk
+    only once per path, so asking for additional sizes of the same font parses
+    the in-memory copy instead of touching the disk again.
+
+    Attributes:
+        loads (int): The number of faces parsed since the registry was created.
+        file_reads (int): The number of font files read from disk.
+        load_seconds (float): The total time spent reading and parsing fonts.
+        hits (int): The number of lookups answered by an already loaded face.
+
+    Methods:
+        get(self, path: str, size: int) -> ImageFont.FreeTypeFont:
+            Return the face for the given font file and size.
+
+        stats(self) -> dict:
+            Return the load counters and total load time.
+
+        clear(self):
+            Forget every loaded face and font file.
+
+    """
+
+    def __init__(self):
+        """Initialize an empty registry."""
+        self._faces = {}
+        self._files = {}
+        self._lock = threading.Lock()
+        self.loads = 0
+        self.file_reads = 0
+        self.load_seconds = 0.0
+        self.hits = 0
+
+    def get(self, path: str, size: int) -> ImageFont.FreeTypeFont:
+        """
+        Return the face for the given font file and size.
+
+        Args:
+            path (str): The path to the TrueType font file.
+            size (int): The font size in points.
+
+        Returns:
+            ImageFont.FreeTypeFont: The shared font face.
+
+        """
+        key = (path, size)
+        with self._lock:
+            face = self._faces.get(key)
+            if face is not None:
+                self.hits += 1
+                return face
+
+            start = time.perf_counter()
+            data = self._files.get(path)
+            if data is None:
+                with open(path, 'rb') as font_file:
+                    data = font_file.read()
+                self._files[path] = data
+                self.file_reads += 1
+            face = ImageFont.truetype(io.BytesIO(data), size=size)
+            self.load_seconds += time.perf_counter() - start
+            self.loads += 1
+            self._faces[key] = face
+            return face
+
+    def stats(self) -> dict:
+        """
+        Return the load counters and total load time.
+
+        Returns:
+            dict: The loads, file reads, hits, load time and number of faces.
+
+        """
+        with self._lock:
+            return {
+                'loads': self.loads,
+                'file_reads': self.file_reads,
+                'hits': self.hits,
+                'load_seconds': self.load_seconds,
+                'faces': len(self._faces),
+            }
+
+    def clear(self):
+        """Forget every loaded face and font file."""
+        with self._lock:
+            self._faces.clear()
+            self._files.clear()
+
+
+font_registry = FontRegistry()
@@ -0,0 +1,103 @@
+"""A thread-safe histogram of observed values, grouped by label."""
+
+import threading
+from bisect import bisect_left
+from typing import Hashable, Iterable
+
+
+class Histogram:
+    """
+    Count observed values into fixed buckets, separately for each label.
+
+    An instance is a stage hook: pass it as ``MemeGenerator(stage_hook=...)``
+    and every stage duration is counted under the stage name. The label can
+    be any hashable value, such as a (route, status) tuple. Recording a value
+    is a binary search and two additions under a lock, cheap enough to do on
+    every request.
+
+    Bucket bounds are upper bounds, as in Prometheus: a value is counted in
+    the first bucket whose bound is greater than or equal to it, and values
+    above the last bound only in the implicit ``+Inf`` bucket.
+
+    Attributes:
+        DEFAULT_BUCKETS (tuple): Bounds in seconds suited to request and stage latencies.
+        buckets (tuple): The upper bounds of the buckets, in ascending order.
+
+    Methods:
+        __init__(self, buckets: Iterable[float]):
+            Initialize an empty histogram.
+
+        __call__(self, label: Hashable, value: float):
+            Record one observed value.
+
+        stats(self) -> dict:
+            Return the cumulative bucket counts, count and sum per label.
+
+        reset(self):
+            Forget everything recorded so far.
+
+    """
+
+    DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+    def __init__(self, buckets: Iterable[float] = DEFAULT_BUCKETS):
+        """
+        Initialize an empty histogram.
+
+        Args:
+            buckets (Iterable[float]): The upper bounds of the buckets.
+
+        Raises:
+            ValueError: If no bounds are given.
+
+        """
+        self.buckets = tuple(sorted(buckets))
+        if not self.buckets:
+            raise ValueError("A histogram needs at least one bucket")
+        self._lock = threading.Lock()
+        self._series = {}
+
+    def __call__(self, label: Hashable, value: float):
+        """
+        Record one observed value.
+
+        Args:
+            label (Hashable): The series to count the value in, such as a stage name.
+            value (float): The observed value.
+
+        """
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(label)
+            if series is None:
+                series = self._series[label] = [[0] * (len(self.buckets) + 1), 0.0]
+            series[0][index] += 1
+            series[1] += value
+
+    def stats(self) -> dict:
+        """
+        Return the cumulative bucket counts, count and sum per label.
+
+        Returns:
+            dict: Maps each label to its ``buckets`` (a list of (bound, count)
+                pairs, where each count includes the values of the smaller
+                buckets), ``count`` and ``sum``.
+
+        """
+        with self._lock:
+            series = {label: (list(counts), total) for label, (counts, total) in self._series.items()}
+
+        report = {}
+        for label, (counts, total) in series.items():
+            cumulative = []
+            running = 0
+            for bound, count in zip(self.buckets, counts):
+                running += count
+                cumulative.append((bound, running))
+            report[label] = {'buckets': cumulative, 'count': running + counts[-1], 'sum': total}
+        return report
+
+    def reset(self):
+        """Forget everything recorded so far."""
+        with self._lock:
+            self._series.clear()
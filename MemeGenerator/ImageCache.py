@@ -0,0 +1,185 @@
+"""A bounded, in-process LRU cache of decoded and resized base images."""
+
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+from typing import Callable, Hashable, Union
+from PIL import Image
+
+
+class ImageCache:
+    """
+    Cache decoded, already-resized base images in memory.
+
+    Entries are evicted least-recently-used first once the combined pixel
+    memory of the cached images exceeds the configured budget. Callers always
+    receive a copy of the cached base, so drawing on the returned image never
+    alters the cached entry.
+
+    Attributes:
+        DEFAULT_MAX_BYTES (int): The default memory budget for cached pixels.
+        hits (int): The number of lookups answered from the cache.
+        misses (int): The number of lookups that had to load the image.
+        evictions (int): The number of entries dropped to respect the budget.
+
+    Methods:
+        __init__(self, max_bytes: int):
+            Initialize an empty cache with the given memory budget.
+
+        file_key(img_path: str, width: int) -> tuple:
+            Build a cache key for an image file and a target width.
+
+        source_key(source: str | bytes, width: int) -> tuple:
+            Build a cache key for an image file or encoded image bytes.
+
+        get(self, key: Hashable, loader: Callable[[], Image.Image]) -> Image.Image:
+            Return a copy of the cached image, loading it on a miss.
+
+        max_bytes (property) -> int:
+            The memory budget for cached pixels.
+
+        stats(self) -> dict:
+            Return the cache counters and current memory usage.
+
+        clear(self):
+            Drop every cached entry.
+
+    """
+
+    DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+
+    def __init__(self, max_bytes: int = DEFAULT_MAX_BYTES):
+        """
+        Initialize an empty cache with the given memory budget.
+
+        Args:
+            max_bytes (int): The maximum number of bytes of pixel data to keep.
+
+        """
+        self._max_bytes = max_bytes
+        self._entries = OrderedDict()
+        self._current_bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @property
+    def max_bytes(self) -> int:
+        """Return the memory budget for cached pixels."""
+        return self._max_bytes
+
+    @staticmethod
+    def file_key(img_path: str, width: int) -> tuple:
+        """
+        Build a cache key for an image file and a target width.
+
+        The file's modification time and size are part of the key, so an
+        image that is replaced on disk is decoded again instead of served stale.
+
+        Args:
+            img_path (str): The path to the source image.
+            width (int): The width the image is resized to.
+
+        Returns:
+            tuple: A hashable key identifying this version of the resized image.
+
+        """
+        stat = os.stat(img_path)
+        return img_path, stat.st_mtime_ns, stat.st_size, width
+
+    @staticmethod
+    def source_key(source: Union[str, bytes], width: int) -> tuple:
+        """
+        Build a cache key for an image file or encoded image bytes.
+
+        Encoded bytes, such as a downloaded image, are keyed by their SHA-256
+        digest, so the same image fetched twice is only decoded once. Bytes
+        that carry their digest in a ``sha256`` attribute, as those returned
+        by ``RemoteImageCache`` do, are not hashed again.
+
+        Args:
+            source (str | bytes): The path to the image or its encoded bytes.
+            width (int): The width the image is resized to.
+
+        Returns:
+            tuple: A hashable key identifying this version of the resized image.
+
+        """
+        if isinstance(source, bytes):
+            return 'sha256', getattr(source, 'sha256', None) or hashlib.sha256(source).hexdigest(), width
+        return ImageCache.file_key(source, width)
+
+    def get(self, key: Hashable, loader: Callable[[], Image.Image]) -> Image.Image:
+        """
+        Return a copy of the cached image, loading it on a miss.
+
+        Args:
+            key (Hashable): The cache key for the image.
+            loader (Callable[[], Image.Image]): Produces the image when it is not cached.
+
+        Returns:
+            Image.Image: A private copy of the cached image that is safe to draw on.
+
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[0].copy()
+            self.misses += 1
+
+        img = loader()
+        img.load()
+        size = _image_bytes(img)
+
+        with self._lock:
+            if size <= self._max_bytes and key not in self._entries:
+                self._entries[key] = (img, size)
+                self._current_bytes += size
+                while self._current_bytes > self._max_bytes:
+                    _, (_, evicted_size) = self._entries.popitem(last=False)
+                    self._current_bytes -= evicted_size
+                    self.evictions += 1
+
+        return img.copy()
+
+    def stats(self) -> dict:
+        """
+        Return the cache counters and current memory usage.
+
+        Returns:
+            dict: The hits, misses, evictions, entry count and bytes in use.
+
+        """
+        with self._lock:
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'entries': len(self._entries),
+                'bytes': self._current_bytes,
+                'max_bytes': self._max_bytes,
+            }
+
+    def clear(self):
+        """Drop every cached entry."""
+        with self._lock:
+            self._entries.clear()
+            self._current_bytes = 0
+
+
+def _image_bytes(img: Image.Image) -> int:
+    """
+    Estimate the memory held by an image's pixel data.
+
+    Args:
+        img (Image.Image): The image to measure.
+
+    Returns:
+        int: The approximate number of bytes used by the pixel data.
+
+    """
+    return img.width * img.height * len(img.getbands())
@@ -0,0 +1,286 @@
+"""Fetches remote images over a pooled HTTP session with strict limits."""
+
+import socket
+import threading
+import time
+from typing import Mapping, NamedTuple, Union
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection, HTTPSConnection
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+
+
+class ImageFetchError(Exception):
+    """Raised when a remote image cannot be fetched."""
+
+
+class ImageTooLargeError(ImageFetchError):
+    """Raised when a remote image exceeds the configured size limit."""
+
+
+class FetchResult(NamedTuple):
+    """
+    The response to an image request.
+
+    Attributes:
+        status (int): The HTTP status code (200, or 304 for a conditional request).
+        data (bytes): The response body; empty for a 304 response.
+        headers (Mapping): The response headers, looked up case-insensitively.
+    """
+
+    status: int
+    data: bytes
+    headers: Mapping
+
+
+class ImageFetcher:
+    """
+    Download images with connection reuse, timeouts and a size cap.
+
+    The body is streamed and the download is aborted as soon as it exceeds
+    ``max_bytes``, so an oversized origin cannot exhaust a worker's memory.
+    Connecting and every socket read are bounded by the timeouts, which only
+    limit the gaps between bytes, so the whole request is also capped at
+    ``max_seconds``: a watchdog timer, armed before the request is sent, shuts
+    the connection's socket down at that deadline, waking a read that is
+    blocked on an origin sending its headers or body a byte at a time. The
+    bytes are returned in memory and can be decoded directly by Pillow.
+
+    Attributes:
+        DEFAULT_TIMEOUT (tuple): The default (connect, read) timeouts in seconds.
+        DEFAULT_MAX_BYTES (int): The default maximum size of a downloaded image.
+        DEFAULT_MAX_SECONDS (float): The default limit on a whole download.
+        CHUNK_SIZE (int): The number of bytes read from the socket at a time.
+
+    Methods:
+        __init__(self, timeout: tuple, max_bytes: int, max_seconds: float, pool_size: int):
+            Initialize the fetcher and its connection pool.
+
+        fetch(self, url: str, headers: dict = None) -> FetchResult:
+            Download an image, enforcing the timeouts and size limit.
+
+        close(self):
+            Close the pooled connections.
+
+    """
+
+    DEFAULT_TIMEOUT = (3.05, 10)
+    DEFAULT_MAX_BYTES = 10 * 1024 * 1024
+    DEFAULT_MAX_SECONDS = 20.0
+    CHUNK_SIZE = 16 * 1024
+
+    def __init__(self, timeout: tuple = DEFAULT_TIMEOUT, max_bytes: int = DEFAULT_MAX_BYTES,
+                 max_seconds: float = DEFAULT_MAX_SECONDS, pool_size: int = 10):
+        """
+        Initialize the fetcher and its connection pool.
+
+        Args:
+            timeout (tuple): The (connect, read) timeouts in seconds.
+            max_bytes (int): The maximum size of a downloaded image.
+            max_seconds (float): The maximum duration of a whole download.
+            pool_size (int): The number of connections kept per host.
+
+        """
+        self._timeout = timeout
+        self._max_bytes = max_bytes
+        self._max_seconds = max_seconds
+        self._session = requests.Session()
+        adapter = _WatchedAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=0)
+        self._session.mount('http://', adapter)
+        self._session.mount('https://', adapter)
+
+    def fetch(self, url: str, headers: Union[dict, None] = None) -> FetchResult:
+        """
+        Download an image, enforcing the timeouts and size limit.
+
+        Args:
+            url (str): The URL of the image.
+            headers (dict | None): Extra request headers, such as conditional headers.
+
+        Returns:
+            FetchResult: The status, body and headers of the response.
+
+        Raises:
+            ImageTooLargeError: If the image is larger than ``max_bytes``.
+            ImageFetchError: If the request fails, times out or returns an
+                unexpected status.
+
+        """
+        deadline = time.monotonic() + self._max_seconds
+        connect_timeout, read_timeout = self._timeout
+        timeout = (connect_timeout, min(read_timeout, self._max_seconds))
+        watchdog = _Watchdog(self._max_seconds)
+        response = None
+        try:
+            # The watchdog is stopped before the response is closed, so it never
+            # touches a connection that has gone back to the pool.
+            with watchdog:
+                response = self._session.get(url, headers=headers, timeout=timeout, stream=True)
+                if response.status_code == 304:
+                    return FetchResult(304, b'', response.headers)
+                if response.status_code != 200:
+                    raise ImageFetchError(f"Unexpected status {response.status_code} for {url}")
+
+                content_length = response.headers.get('Content-Length')
+                if content_length is not None and content_length.isdigit() \
+                        and int(content_length) > self._max_bytes:
+                    raise ImageTooLargeError(f"Image at {url} is larger than {self._max_bytes} bytes")
+
+                chunks = []
+                received = 0
+                for chunk in response.iter_content(chunk_size=self.CHUNK_SIZE):
+                    received += len(chunk)
+                    if received > self._max_bytes:
+                        raise ImageTooLargeError(f"Image at {url} is larger than {self._max_bytes} bytes")
+                    if time.monotonic() > deadline:
+                        break
+                    chunks.append(chunk)
+        except requests.RequestException as e:
+            if not watchdog.fired:
+                raise ImageFetchError(f"Failed to fetch {url}: {e}") from e
+        finally:
+            if response is not None:
+                response.close()
+        if watchdog.fired or time.monotonic() > deadline:
+            raise ImageFetchError(f"Downloading {url} took longer than {self._max_seconds}s")
+        return FetchResult(200, b''.join(chunks), response.headers)
+
+    def close(self):
+        """Close the pooled connections."""
+        self._session.close()
+
+
+class _Watchdog:
+    """
+    Shut down the socket of the current thread's request once a deadline has passed.
+
+    The watchdog is used as a context manager around the request. While it is
+    active, the connections of ``_WatchedAdapter`` register themselves with it
+    when they connect or send a request, so the timer can reach the socket
+    before the response headers have arrived.
+    """
+
+    _current = threading.local()
+
+    def __init__(self, seconds: float):
+        """
+        Prepare the timer.
+
+        Args:
+            seconds (float): The time until the deadline.
+
+        """
+        self._lock = threading.Lock()
+        self._connection = None
+        self._done = False
+        self.fired = False
+        self._timer = threading.Timer(max(0.0, seconds), self._fire)
+        self._timer.daemon = True
+
+    def __enter__(self) -> '_Watchdog':
+        """Start the timer and watch the connections used by this thread."""
+        _Watchdog._current.watchdog = self
+        self._timer.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        """
+        Stop the timer.
+
+        Once this returns the socket is never touched, so the connection can
+        safely go back to the pool.
+        """
+        self._timer.cancel()
+        with self._lock:
+            self._done = True
+        _Watchdog._current.watchdog = None
+
+    @classmethod
+    def watch(cls, connection: HTTPConnection):
+        """
+        Register a connection with the watchdog of the current thread, if any.
+
+        A connection registered after the deadline is shut down right away.
+
+        Args:
+            connection (HTTPConnection): The connection about to be used.
+
+        """
+        watchdog = getattr(cls._current, 'watchdog', None)
+        if watchdog is None:
+            return
+        with watchdog._lock:
+            if watchdog._done:
+                return
+            watchdog._connection = connection
+            if watchdog.fired:
+                watchdog._shutdown()
+
+    def _fire(self):
+        """Shut the socket down, which wakes a read blocked on it."""
+        with self._lock:
+            if self._done:
+                return
+            self.fired = True
+            self._shutdown()
+
+    def _shutdown(self):
+        """Shut down the registered connection's socket. The lock must be held."""
+        sock = getattr(self._connection, 'sock', None)
+        if sock is not None:
+            try:
+                sock.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+
+
+class _WatchedHTTPConnection(HTTPConnection):
+    """An HTTP connection that registers itself with the thread's watchdog."""
+
+    def connect(self):
+        """Connect, then register with the watchdog."""
+        super().connect()
+        _Watchdog.watch(self)
+
+    def request(self, *args, **kwargs):
+        """Register with the watchdog, then send the request."""
+        _Watchdog.watch(self)
+        super().request(*args, **kwargs)
+
+
+class _WatchedHTTPSConnection(HTTPSConnection):
+    """An HTTPS connection that registers itself with the thread's watchdog."""
+
+    def connect(self):
+        """Connect, then register with the watchdog."""
+        super().connect()
+        _Watchdog.watch(self)
+
+    def request(self, *args, **kwargs):
+        """Register with the watchdog, then send the request."""
+        _Watchdog.watch(self)
+        super().request(*args, **kwargs)
+
+
+class _WatchedHTTPConnectionPool(HTTPConnectionPool):
+    """A connection pool whose connections register with the thread's watchdog."""
+
+    ConnectionCls = _WatchedHTTPConnection
+
+
+class _WatchedHTTPSConnectionPool(HTTPSConnectionPool):
+    """A connection pool whose connections register with the thread's watchdog."""
+
+    ConnectionCls = _WatchedHTTPSConnection
+
+
+class _WatchedAdapter(HTTPAdapter):
+    """An adapter whose connections can be shut down by a ``_Watchdog``."""
+
+    def init_poolmanager(self, *args, **kwargs):
+        """Create the pool manager with watched connection pools."""
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = {
+            'http': _WatchedHTTPConnectionPool,
+            'https': _WatchedHTTPSConnectionPool,
+        }
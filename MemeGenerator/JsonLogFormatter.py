@@ -0,0 +1,52 @@
+"""Formats log records as one JSON object per line."""
+
+import json
+import logging
+
+# Attributes every LogRecord has; anything else on a record came from ``extra``.
+_RECORD_ATTRIBUTES = frozenset(vars(logging.LogRecord('', 0, '', 0, '', (), None))) | {'message', 'asctime'}
+
+
+class JsonLogFormatter(logging.Formatter):
+    """
+    Write each log record as a single line of JSON, for log collectors.
+
+    Every line has the time, level, logger name and message. Fields passed
+    with ``extra``, such as ``logger.error("...", extra={'path': path})``,
+    become keys of their own, so they can be queried without parsing the
+    message. An exception is added as ``exc_info`` with its traceback.
+
+    Attributes:
+        None
+
+    Methods:
+        format(self, record: logging.LogRecord) -> str:
+            Return the record as a line of JSON.
+
+    """
+
+    def format(self, record: logging.LogRecord) -> str:
+        """
+        Return the record as a line of JSON.
+
+        Args:
+            record (logging.LogRecord): The record to format.
+
+        Returns:
+            str: A JSON object without newlines.
+
+        """
+        entry = {
+            'time': self.formatTime(record),
+            'level': record.levelname,
+            'logger': record.name,
+            'message': record.getMessage(),
+        }
+        for key, value in vars(record).items():
+            if key not in _RECORD_ATTRIBUTES and not key.startswith('_'):
+                entry[key] = value
+        if record.exc_info:
+            entry['exc_info'] = self.formatException(record.exc_info)
+        elif record.exc_text:
+            entry['exc_info'] = record.exc_text
+        return json.dumps(entry, default=str)
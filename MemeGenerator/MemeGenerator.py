@@ -1,9 +1,60 @@
 """Generates memes by adding text captions to images."""
 
+import hashlib
+import io
+import json
+import logging
 import os
 import random
-from PIL import Image, ImageDraw, ImageFont
-from typing import Union
+import time
+from collections import deque
+from contextlib import contextmanager, nullcontext
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from PIL import Image
+from typing import Callable, ContextManager, Iterable, Iterator, NamedTuple, Union
+from MemeGenerator.AnimationWriter import AnimationWriter
+from MemeGenerator.CaptionRenderer import CaptionRenderer
+from MemeGenerator.CaptionStyle import CaptionStyle
+from MemeGenerator.EncodeOptions import EncodeOptions
+from MemeGenerator.FontRegistry import FontRegistry, font_registry
+from MemeGenerator.ImageCache import ImageCache
+from MemeGenerator.MemeStore import MemeStore
+from MemeGenerator.OutputCache import OutputCache
+from MemeGenerator.TextLayout import CaptionLayout, TextLayout
+
+logger = logging.getLogger(__name__)
+
+
+class MemeJobResult(NamedTuple):
+    """
+    The outcome of one job rendered by ``MemeGenerator.make_memes``.
+
+    Attributes:
+        index (int): The position of the job in the submitted sequence.
+        job (dict): The job's keyword arguments for ``make_meme``.
+        path (str | None): The path to the generated meme, or None on failure.
+        error (str | None): A description of the failure, or None on success.
+    """
+
+    index: int
+    job: dict
+    path: Union[str, None]
+    error: Union[str, None]
+
+
+class RenderedMeme(NamedTuple):
+    """
+    An encoded meme held in memory, as returned by ``MemeGenerator.render_meme``.
+
+    Attributes:
+        meme_id (str): The content-addressed id of the meme, usable as an ETag.
+        data (bytes): The encoded image.
+        encoding (EncodeOptions): The options the image was encoded with.
+    """
+
+    meme_id: str
+    data: bytes
+    encoding: EncodeOptions
 
 
 class MemeGenerator:
@@ -12,100 +63,799 @@ class MemeGenerator:
 
     This happens by adding text captions to
     existing images. It resizes the image to a specified width, adds a caption
-    with a specified font and random position, and saves the resulting meme
-    image to an output directory.
+    with a specified font and a seeded pseudo-random position, and saves the
+    resulting meme image to an output directory. Output files are named after a
+    hash of their inputs, so repeating a request reuses the existing file.
+
+    Images are resized in one of three modes:
+
+    - ``fast``: JPEG files are decoded directly at 1/2, 1/4 or 1/8 scale
+      (Pillow's draft mode) and the rest of the way with a reducing bilinear
+      resample, so a large photo is never decoded at full resolution.
+    - ``quality``: The full image is decoded and resampled with Lanczos.
+    - ``nearest``: The full image is decoded and resampled with nearest
+      neighbour, as before resize modes existed.
+
+    The output format and encoder settings are given as ``EncodeOptions``,
+    either for the whole generator or per call.
+
+    Captions are wrapped to the image width and drawn at the largest font size
+    between ``MIN_FONT_SIZE`` and ``MAX_FONT_SIZE`` that fits in the top third
+    of the image's height, in the colours and effects of ``caption_style``,
+    which can also be given per call. By default that is white text with a
+    black outline, which stays readable on light and busy photos alike.
+
+    Animated GIF, WebP and PNG sources produce animated memes, as GIF unless
+    the encoding is WebP. The caption is rendered once as a transparent layer
+    and pasted onto each frame, and frames are decoded, resized, captioned and
+    encoded one at a time, so a long animation is never held in memory. Frame
+    durations are kept. Animations bypass the image cache.
+
+    If a stage hook is set, it is called with the name and duration in seconds
+    of each rendering stage: ``open`` and ``resize`` (only when the base image
+    is not cached), ``layout``, ``font``, ``draw``, ``encode`` and ``write``
+    (only for ``make_meme``). For an animation, ``open`` reads the header
+    and ``encode`` covers decoding and captioning the frames as well.
+    A ``StageTimings`` instance aggregates them.
 
     Attributes:
-        DEFAULT_FONT_SIZE (int): The default font size for the caption text.
+        MIN_FONT_SIZE (int): The smallest font size for the caption text.
+        MAX_FONT_SIZE (int): The largest font size for the caption text.
+        CAPTION_MARGIN (int): The minimum distance between the caption and the image edges.
+        RESIZE_MODES (tuple): The supported resize modes.
+        DEFAULT_RESIZE (str): The resize mode used when none is given.
+        resize (str): The resize mode of this generator.
+        encoding (EncodeOptions): The output encoding of this generator.
+        text_layout (TextLayout): The engine that wraps and fits captions.
+        caption_style (CaptionStyle): The colours and effects of captions.
+        caption_renderer (CaptionRenderer): The renderer that paints captions.
+        image_cache (ImageCache): The cache of decoded and resized base images.
+        output_cache (OutputCache): The content-addressed store of rendered memes.
+        fonts (FontRegistry): The pool of loaded font faces, shared process-wide by default.
+        memory_store (MemeStore | None): The in-memory store used by ``render_meme``.
+        stage_hook (Callable[[str, float], None] | None): Receives per-stage timings.
 
     Methods:
-        __init__(self, output_dir: str, font: str):
+        __init__(self, output_dir: str, font: str, image_cache: ImageCache = None,
+                 output_cache: OutputCache = None, fonts: FontRegistry = None,
+                 memory_store: MemeStore = None, resize: str = DEFAULT_RESIZE,
+                 encoding: EncodeOptions = None, text_layout: TextLayout = None,
+                 stage_hook: Callable[[str, float], None] = None,
+                 caption_style: CaptionStyle = None, caption_renderer: CaptionRenderer = None):
             Initialize a MemeGenerator instance.
 
-        make_meme(self, img_path: str, text: str, author: str, width=500) -> str | None:
+        make_meme(self, img_path: str | bytes, text: str, author: str, width=500, seed=None,
+                  resize=None, encoding=None, caption_style=None) -> str | None:
             Generate a meme using an image and caption text.
 
+        render_meme(self, img_path: str | bytes, text: str, author: str, width=500, seed=None,
+                    resize=None, encoding=None, caption_style=None) -> RenderedMeme | None:
+            Generate a meme in memory without writing it to disk.
+
+        make_memes(self, jobs: Iterable[dict], workers=None, ordered=True) -> Iterator[MemeJobResult]:
+            Generate many memes on a pool of worker processes.
+
+        preload(self, img_path: str, width=500, resize=None):
+            Decode and resize a base image into the image cache ahead of time.
+
     """
 
-    DEFAULT_FONT_SIZE = 14
+    MIN_FONT_SIZE = 10
+    MAX_FONT_SIZE = 32
+    CAPTION_MARGIN = 10
+    RESIZE_MODES = ('fast', 'quality', 'nearest')
+    DEFAULT_RESIZE = 'fast'
 
-    def __init__(self, output_dir: str, font: str):
+    def __init__(self, output_dir: str, font: str, image_cache: Union[ImageCache, None] = None,
+                 output_cache: Union[OutputCache, None] = None,
+                 fonts: Union[FontRegistry, None] = None,
+                 memory_store: Union[MemeStore, None] = None, resize: str = DEFAULT_RESIZE,
+                 encoding: Union[EncodeOptions, None] = None,
+                 text_layout: Union[TextLayout, None] = None,
+                 stage_hook: Union[Callable[[str, float], None], None] = None,
+                 caption_style: Union[CaptionStyle, None] = None,
+                 caption_renderer: Union[CaptionRenderer, None] = None):
         """
         Initialize a MemeGenerator instance.
 
         Args:
             output_dir (str): The directory where generated memes will be saved.
             font (str): The path to the font file to be used for captions.
+            image_cache (ImageCache | None): The cache for decoded base images.
+                A private cache with the default memory budget is created if omitted.
+            output_cache (OutputCache | None): The store for rendered memes. A
+                cache over ``output_dir`` with the default limits is created if omitted.
+            fonts (FontRegistry | None): The font pool. The process-wide
+                registry is used if omitted.
+            memory_store (MemeStore | None): The store that keeps memes
+                encoded by ``render_meme``. Nothing is kept if omitted.
+            resize (str): The default resize mode, one of ``RESIZE_MODES``.
+            encoding (EncodeOptions | None): The default output encoding.
+                JPEG with Pillow's default settings is used if omitted.
+            text_layout (TextLayout | None): The caption layout engine. One
+                using ``fonts`` is created if omitted.
+            stage_hook (Callable[[str, float], None] | None): Called with the
+                name and duration of every rendering stage. Batch worker
+                processes started by ``make_memes`` do not call it.
+            caption_style (CaptionStyle | None): The default caption colours
+                and effects. The ``CaptionStyle.DEFAULT_PRESET`` style, white
+                text with a black outline, is used if omitted.
+            caption_renderer (CaptionRenderer | None): The caption painter.
+                One using ``fonts`` is created if omitted.
+
+        Raises:
+            ValueError: If the resize mode, encoding or caption style is not supported.
 
         """
         self._output_dir = output_dir
         self._font_path = font
+        self.image_cache = image_cache if image_cache is not None else ImageCache()
+        self.output_cache = output_cache if output_cache is not None else OutputCache(output_dir)
+        self.fonts = fonts if fonts is not None else font_registry
+        self.memory_store = memory_store
+        self.resize = _check_resize(resize)
+        self.encoding = (encoding or EncodeOptions()).validate()
+        self.text_layout = text_layout if text_layout is not None else TextLayout(self.fonts)
+        self.stage_hook = stage_hook
+        self.caption_style = (caption_style or CaptionStyle.preset(CaptionStyle.DEFAULT_PRESET)).validate()
+        self.caption_renderer = caption_renderer if caption_renderer is not None else CaptionRenderer(self.fonts)
         os.makedirs(output_dir, exist_ok=True)
 
-    def make_meme(self, img_path: str, text: str, author: str, width=500) -> Union[str, None]:
+    def make_meme(self, img_path: Union[str, bytes], text: str, author: str, width=500,
+                  seed=None, resize=None, encoding=None, caption_style=None) -> Union[str, None]:
         """
         Generate a meme using an image and caption text.
 
+        Rendering is deterministic: the caption position is drawn from ``seed``,
+        and the output file is named after a hash of all inputs. A request that
+        matches an existing file returns it without drawing again.
+
         Args:
-            img_path (str): The path to the image to be used for the meme.
+            img_path (str | bytes): The path to the image to be used for the meme,
+                or the encoded image itself (for example a downloaded file).
             text (str): The caption text to be added to the meme.
             author (str): The author's name to be added to the meme.
             width (int): The desired width for the resulting meme image (default is 500).
+            seed (int | None): The seed for the caption position. If None, the
+                seed is derived from the other inputs.
+            resize (str | None): The resize mode, or None for the generator's default.
+            encoding (EncodeOptions | None): The output encoding, or None for the generator's default.
+            caption_style (CaptionStyle | None): The caption style, or None for the generator's default.
 
         Returns:
             str | None: The path to the generated meme image if successful, or None on failure.
 
         """
         try:
-            img = Image.open(img_path)
-            img = _resize_image(img, width)
+            return self._render_meme(img_path, text, author, width, seed, resize, encoding, caption_style)
+        except (FileNotFoundError, IOError) as file_error:
+            logger.error("Rendering a meme failed: %s", file_error,
+                         extra={'image': img_path if isinstance(img_path, str) else '<bytes>'})
+            return None
+
+    def render_meme(self, img_path: Union[str, bytes], text: str, author: str, width=500,
+                    seed=None, resize=None, encoding=None, caption_style=None) -> Union[RenderedMeme, None]:
+        """
+        Generate a meme in memory without writing it to disk.
 
-            draw = ImageDraw.Draw(img)
-            font = ImageFont.truetype(self._font_path, size=self.DEFAULT_FONT_SIZE)
+        The meme is encoded in memory and, if a memory store is configured,
+        kept there under its content-addressed id, so a repeat request returns
+        the stored bytes without drawing again.
 
-            text_x, text_y = _get_random_caption_position(img)
-            caption = f"{text} - {author}"
-            draw.text((text_x, text_y), caption, font=font, fill="#f20f0f")
+        Args:
+            img_path (str | bytes): The path to the image to be used for the meme,
+                or the encoded image itself (for example a downloaded file).
+            text (str): The caption text to be added to the meme.
+            author (str): The author's name to be added to the meme.
+            width (int): The desired width for the resulting meme image (default is 500).
+            seed (int | None): The seed for the caption position. If None, the
+                seed is derived from the other inputs.
+            resize (str | None): The resize mode, or None for the generator's default.
+            encoding (EncodeOptions | None): The output encoding, or None for the generator's default.
+            caption_style (CaptionStyle | None): The caption style, or None for the generator's default.
 
-            result_path = os.path.join(self._output_dir, f'meme_{random.randint(1, 10000)}.jpg')
-            img.save(result_path)
+        Returns:
+            RenderedMeme | None: The meme id and encoded bytes if successful, or None on failure.
 
-            return result_path
+        """
+        try:
+            resize = _check_resize(resize or self.resize)
+            encoding = encoding.validate() if encoding is not None else self.encoding
+            caption_style = caption_style.validate() if caption_style is not None else self.caption_style
+            animated = _is_animated(img_path)
+            if animated:
+                encoding = encoding.animated()
+            image_key = ImageCache.source_key(img_path, width) + (resize,)
+            digest = self._meme_digest(image_key, text, author, width, seed, encoding, caption_style)
+            meme_id = digest[:16]
+
+            if self.memory_store is not None:
+                stored = self.memory_store.get(meme_id)
+                if stored is not None:
+                    return RenderedMeme(meme_id, stored.data, encoding)
+
+            data = self._encode_meme(img_path, text, author, width, seed, resize, image_key, digest,
+                                     encoding, animated, caption_style).getvalue()
+
+            if self.memory_store is not None:
+                self.memory_store.put(meme_id, data, encoding.format)
+            return RenderedMeme(meme_id, data, encoding)
         except (FileNotFoundError, IOError) as file_error:
-            print(f"Error occurred: {file_error}")
+            logger.error("Rendering a meme failed: %s", file_error,
+                         extra={'image': img_path if isinstance(img_path, str) else '<bytes>'})
             return None
 
+    def make_memes(self, jobs: Iterable[dict], workers: Union[int, None] = None,
+                   ordered: bool = True) -> Iterator[MemeJobResult]:
+        """
+        Generate many memes on a pool of worker processes.
+
+        Each job is a dict of keyword arguments for ``make_meme``; its optional
+        ``encoding`` overrides the generator's for that job. A job with an
+        ``error`` message is not rendered but reported as failed in its place,
+        so a caller can keep input it could not turn into a job in the results.
+        Every worker builds its own generator once, so its font and image caches
+        stay warm for the whole batch. Only a bounded number of jobs is in flight at a
+        time, so arbitrarily long job streams run in constant memory.
+
+        Args:
+            jobs (Iterable[dict]): The jobs to render.
+            workers (int | None): The number of worker processes. Defaults to
+                the CPU count; 1 renders in the current process.
+            ordered (bool): Yield results in job order if True, or as soon as
+                each job completes if False.
+
+        Yields:
+            MemeJobResult: One result per job. A failed job carries an error
+                message instead of stopping the batch.
+
+        """
+        workers = workers or os.cpu_count() or 1
+        if workers == 1:
+            for index, job in enumerate(jobs):
+                yield _run_job(self, index, job)
+            return
+
+        max_pending = workers * 4
+        pending = deque()
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_batch_worker,
+                                 initargs=(self._worker_config(),)) as executor:
+            for index, job in enumerate(jobs):
+                pending.append(executor.submit(_run_batch_job, index, job))
+                if len(pending) >= max_pending:
+                    yield from _drain(pending, ordered)
+            while pending:
+                yield from _drain(pending, ordered)
+
+    def preload(self, img_path: str, width=500, resize=None):
+        """
+        Decode and resize a base image into the image cache ahead of time.
+
+        A server that forks worker processes can preload its images in the
+        parent, so the workers share the decoded pixels copy-on-write instead
+        of each decoding its own. Animated images are not cached and are skipped.
+
+        Args:
+            img_path (str): The path to the image.
+            width (int): The width memes will be rendered at (default is 500).
+            resize (str | None): The resize mode, or None for the generator's default.
+
+        Raises:
+            OSError: If the image cannot be read.
+            ValueError: If the resize mode is not supported.
+
+        """
+        resize = _check_resize(resize or self.resize)
+        if _is_animated(img_path):
+            return
+        image_key = ImageCache.source_key(img_path, width) + (resize,)
+        self.image_cache.get(image_key, lambda: _load_resized_image(img_path, width, resize, self._stage))
+
+    def _render_meme(self, img_path: Union[str, bytes], text: str, author: str, width: int, seed,
+                     resize: Union[str, None] = None, encoding: Union[EncodeOptions, None] = None,
+                     caption_style: Union[CaptionStyle, None] = None) -> str:
+        """
+        Render a meme, or return the existing file for identical inputs.
+
+        Args:
+            img_path (str | bytes): The path to the image to be used for the meme,
+                or the encoded image itself (for example a downloaded file).
+            text (str): The caption text to be added to the meme.
+            author (str): The author's name to be added to the meme.
+            width (int): The desired width for the resulting meme image.
+            seed (int | None): The seed for the caption position.
+            resize (str | None): The resize mode, or None for the generator's default.
+            encoding (EncodeOptions | None): The output encoding, or None for the generator's default.
+            caption_style (CaptionStyle | None): The caption style, or None for the generator's default.
+
+        Returns:
+            str: The path to the generated meme image.
+
+        Raises:
+            OSError: If the source image cannot be read or the meme cannot be saved.
+            ValueError: If the resize mode, encoding or caption style is not supported.
+
+        """
+        resize = _check_resize(resize or self.resize)
+        encoding = encoding.validate() if encoding is not None else self.encoding
+        caption_style = caption_style.validate() if caption_style is not None else self.caption_style
+        animated = _is_animated(img_path)
+        if animated:
+            encoding = encoding.animated()
+        image_key = ImageCache.source_key(img_path, width) + (resize,)
+        digest = self._meme_digest(image_key, text, author, width, seed, encoding, caption_style)
+        filename = f'{OutputCache.PREFIX}{digest[:16]}.{encoding.extension}'
+
+        result_path = self.output_cache.lookup(filename)
+        if result_path is not None:
+            return result_path
+
+        buffer = self._encode_meme(img_path, text, author, width, seed, resize, image_key, digest,
+                                   encoding, animated, caption_style)
+        with self._stage('write'):
+            return self.output_cache.store(filename, lambda path: _write_bytes(path, buffer.getbuffer()))
+
+    def _draw_meme(self, img_path: Union[str, bytes], text: str, author: str, width: int, seed,
+                   resize: str, image_key: tuple, digest: str, caption_style: CaptionStyle) -> Image.Image:
+        """
+        Draw the caption onto a copy of the resized base image.
+
+        Args:
+            img_path (str | bytes): The path to the image to be used for the meme,
+                or the encoded image itself (for example a downloaded file).
+            text (str): The caption text to be added to the meme.
+            author (str): The author's name to be added to the meme.
+            width (int): The desired width for the resulting meme image.
+            seed (int | None): The seed for the caption position.
+            resize (str): The resize mode.
+            image_key (tuple): The cache key of the resized base image.
+            digest (str): The hash of the inputs, used as seed when ``seed`` is None.
+            caption_style (CaptionStyle): The caption style.
+
+        Returns:
+            Image.Image: The captioned image.
+
+        """
+        img = self.image_cache.get(image_key, lambda: _load_resized_image(img_path, width, resize, self._stage))
+        layout, position = self._place_caption(img.size, text, author, seed, digest)
+        with self._stage('draw'):
+            img = self.caption_renderer.draw(img, layout, self._font_path, position, caption_style)
+        return img
+
+    def _encode_meme(self, img_path: Union[str, bytes], text: str, author: str, width: int, seed,
+                     resize: str, image_key: tuple, digest: str, encoding: EncodeOptions,
+                     animated: bool, caption_style: CaptionStyle) -> io.BytesIO:
+        """
+        Draw and encode a meme, still or animated.
+
+        Args:
+            img_path (str | bytes): The path to the image to be used for the meme,
+                or the encoded image itself (for example a downloaded file).
+            text (str): The caption text to be added to the meme.
+            author (str): The author's name to be added to the meme.
+            width (int): The desired width for the resulting meme image.
+            seed (int | None): The seed for the caption position.
+            resize (str): The resize mode.
+            image_key (tuple): The cache key of the resized base image.
+            digest (str): The hash of the inputs, used as seed when ``seed`` is None.
+            encoding (EncodeOptions): The output encoding; GIF or WebP if ``animated``.
+            animated (bool): Whether the source image is animated.
+            caption_style (CaptionStyle): The caption style.
+
+        Returns:
+            io.BytesIO: The encoded meme.
+
+        """
+        if animated:
+            return self._encode_animation(img_path, text, author, width, seed, resize, digest, encoding,
+                                          caption_style)
+        img = self._draw_meme(img_path, text, author, width, seed, resize, image_key, digest, caption_style)
+        with self._stage('encode'):
+            buffer = io.BytesIO()
+            encoding.save(img, buffer)
+        return buffer
+
+    def _encode_animation(self, img_path: Union[str, bytes], text: str, author: str, width: int, seed,
+                          resize: str, digest: str, encoding: EncodeOptions,
+                          caption_style: CaptionStyle) -> io.BytesIO:
+        """
+        Caption every frame of an animated image and encode the result.
+
+        The caption is laid out for the resized frame size and rendered once
+        as a layer; the frames are then streamed through the encoder.
+
+        Args:
+            img_path (str | bytes): The path to the animated image, or the encoded image itself.
+            text (str): The caption text to be added to the meme.
+            author (str): The author's name to be added to the meme.
+            width (int): The desired width for the resulting meme image.
+            seed (int | None): The seed for the caption position.
+            resize (str): The resize mode.
+            digest (str): The hash of the inputs, used as seed when ``seed`` is None.
+            encoding (EncodeOptions): The output encoding; GIF or WebP.
+            caption_style (CaptionStyle): The caption style.
+
+        Returns:
+            io.BytesIO: The encoded animation.
+
+        """
+        if isinstance(img_path, bytes):
+            img_path = io.BytesIO(img_path)
+        with self._stage('open'):
+            img = Image.open(img_path)
+        with img:
+            layout, position = self._place_caption(_scaled_size(img, width), text, author, seed, digest)
+            with self._stage('draw'):
+                layer, (offset_x, offset_y) = self.caption_renderer.layer(layout, self._font_path,
+                                                                          caption_style)
+            frames = _caption_frames(img, width, resize, layer, (position[0] + offset_x, position[1] + offset_y))
+            with self._stage('encode'):
+                buffer = io.BytesIO()
+                AnimationWriter(encoding).write(frames, img.n_frames, buffer)
+        return buffer
+
+    def _place_caption(self, size: tuple, text: str, author: str, seed, digest: str) -> tuple:
+        """
+        Lay out the caption for an image size and pick its position.
+
+        Args:
+            size (tuple): The (width, height) of the image.
+            text (str): The caption text.
+            author (str): The caption author.
+            seed (int | None): The seed for the caption position.
+            digest (str): The hash of the inputs, used as seed when ``seed`` is None.
+
+        Returns:
+            tuple: The CaptionLayout and the (x, y) position of the caption.
+
+        """
+        caption = f"{text} - {author}"
+        margin = self.CAPTION_MARGIN
+        with self._stage('layout'):
+            layout = self.text_layout.layout(self._font_path, caption, size[0] - 2 * margin,
+                                             size[1] // 3, self.MIN_FONT_SIZE, self.MAX_FONT_SIZE)
+
+        with self._stage('font'):
+            self.fonts.get(self._font_path, layout.size)
+
+        rng = random.Random(seed if seed is not None else digest)
+        return layout, _get_random_caption_position(size, layout, margin, rng)
+
+    def _stage(self, name: str) -> ContextManager:
+        """
+        Return a context manager that reports the duration of a stage to the hook.
+
+        Args:
+            name (str): The stage name.
+
+        Returns:
+            ContextManager: A timing context, or a no-op one if no hook is set.
+
+        """
+        if self.stage_hook is None:
+            return nullcontext()
+        return _timed_stage(self.stage_hook, name)
+
+    def _worker_config(self) -> tuple:
+        """
+        Return the arguments needed to rebuild this generator in a worker process.
+
+        Returns:
+            tuple: The output directory, font path, cache limits, resize mode, encoding and caption style.
+
+        """
+        return (
+            self._output_dir,
+            self._font_path,
+            self.image_cache.max_bytes,
+            self.output_cache.max_files,
+            self.output_cache.max_bytes,
+            self.resize,
+            self.encoding,
+            self.caption_style,
+        )
+
+    def _meme_digest(self, image_key: tuple, text: str, author: str, width: int, seed,
+                     encoding: EncodeOptions, caption_style: CaptionStyle) -> str:
+        """
+        Hash every input that affects the rendered meme.
+
+        Args:
+            image_key (tuple): The identity of the source image version and resize mode.
+            text (str): The caption text.
+            author (str): The caption author.
+            width (int): The output width.
+            seed (int | None): The caption position seed.
+            encoding (EncodeOptions): The output encoding.
+            caption_style (CaptionStyle): The caption style.
+
+        Returns:
+            str: The hexadecimal SHA-256 digest of the inputs.
+
+        """
+        payload = json.dumps(
+            [list(image_key), text, author, width, seed, self._font_path, self.MIN_FONT_SIZE,
+             self.MAX_FONT_SIZE, list(encoding), list(caption_style)],
+            ensure_ascii=False,
+        )
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+_worker_generator = None
+
+
+def _init_batch_worker(config: tuple):
+    """
+    Build the generator used by a batch worker process.
+
+    Args:
+        config (tuple): The values returned by ``MemeGenerator._worker_config``.
+
+    """
+    global _worker_generator
+    output_dir, font_path, image_cache_bytes, max_files, max_bytes, resize, encoding, caption_style = config
+    _worker_generator = MemeGenerator(
+        output_dir,
+        font_path,
+        image_cache=ImageCache(image_cache_bytes),
+        output_cache=OutputCache(output_dir, max_files=max_files, max_bytes=max_bytes),
+        resize=resize,
+        encoding=encoding,
+        caption_style=caption_style,
+    )
+
+
+def _run_batch_job(index: int, job: dict) -> MemeJobResult:
+    """
+    Render one job with the worker's generator.
+
+    Args:
+        index (int): The position of the job in the batch.
+        job (dict): The keyword arguments for ``make_meme``.
+
+    Returns:
+        MemeJobResult: The outcome of the job.
+
+    """
+    return _run_job(_worker_generator, index, job)
+
+
+def _run_job(generator: MemeGenerator, index: int, job: dict) -> MemeJobResult:
+    """
+    Render one job and capture any failure in the result.
+
+    Args:
+        generator (MemeGenerator): The generator that renders the job.
+        index (int): The position of the job in the batch.
+        job (dict): The keyword arguments for ``make_meme``.
+
+    Returns:
+        MemeJobResult: The outcome of the job.
+
+    """
+    if job.get('error') is not None:
+        return MemeJobResult(index, job, None, job['error'])
+    try:
+        path = generator._render_meme(
+            job['img_path'], job['text'], job['author'], job.get('width', 500), job.get('seed'),
+            job.get('resize'), job.get('encoding'))
+        return MemeJobResult(index, job, path, None)
+    except Exception as e:
+        return MemeJobResult(index, job, None, f"{type(e).__name__}: {e}")
+
 
-def _get_random_caption_position(img: Image.Image) -> tuple:
+def _drain(pending: deque, ordered: bool) -> Iterator[MemeJobResult]:
+    """
+    Wait for finished futures, yield their results and remove them from ``pending``.
+
+    Args:
+        pending (deque): The futures in submission order.
+        ordered (bool): Only yield from the front of the queue if True.
+
+    Yields:
+        MemeJobResult: The results that are ready.
+
+    """
+    if ordered:
+        pending[0].result()
+        while pending and pending[0].done():
+            yield pending.popleft().result()
+        return
+
+    done, _ = wait(pending, return_when=FIRST_COMPLETED)
+    for future in list(pending):
+        if future in done:
+            pending.remove(future)
+            yield future.result()
+
+
+def _get_random_caption_position(size: tuple, layout: CaptionLayout, margin: int,
+                                 rng: random.Random) -> tuple:
     """
     Get a random position for the caption text on the image.
 
+    The position keeps the whole caption inside the image, at least
+    ``margin`` pixels from its edges where the image is large enough.
+
     Args:
-        img (Image.Image): The image to which the caption will be added.
+        size (tuple): The (width, height) of the image the caption is added to.
+        layout (CaptionLayout): The laid out caption.
+        margin (int): The minimum distance from the image edges.
+        rng (random.Random): The seeded generator that picks the position.
 
     Returns:
         tuple: A tuple containing the x and y coordinates for the caption's position.
 
     """
-    max_x = img.width - 350
-    max_y = img.height - 30
-    text_x = random.randint(10, max_x)
-    text_y = random.randint(10, max_y)
+    width, height = size
+    min_x = min(margin, max(0, width - layout.width))
+    min_y = min(margin, max(0, height - layout.height))
+    max_x = max(min_x, width - layout.width - margin)
+    max_y = max(min_y, height - layout.height - margin)
+    text_x = rng.randint(min_x, max_x)
+    text_y = rng.randint(min_y, max_y)
     return text_x, text_y
 
 
-def _resize_image(img: Image.Image, width: int) -> Image.Image:
+def _check_resize(resize: str) -> str:
+    """
+    Validate a resize mode.
+
+    Args:
+        resize (str): The resize mode.
+
+    Returns:
+        str: The resize mode.
+
+    Raises:
+        ValueError: If the resize mode is not supported.
+
+    """
+    if resize not in MemeGenerator.RESIZE_MODES:
+        raise ValueError(f"Unsupported resize mode {resize!r}, expected one of {MemeGenerator.RESIZE_MODES}")
+    return resize
+
+
+@contextmanager
+def _timed_stage(hook: Callable[[str, float], None], name: str):
+    """
+    Time the body of a ``with`` block and report it to a stage hook.
+
+    Args:
+        hook (Callable[[str, float], None]): The stage hook.
+        name (str): The stage name.
+
+    """
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        hook(name, time.perf_counter() - start)
+
+
+def _write_bytes(path: str, data) -> None:
+    """
+    Write encoded bytes to a file.
+
+    Args:
+        path (str): The destination path.
+        data (bytes-like): The file contents.
+
+    """
+    with open(path, 'wb') as output_file:
+        output_file.write(data)
+
+
+def _load_resized_image(img_path: Union[str, bytes], width: int, resize: str = 'nearest',
+                        stage: Callable[[str], ContextManager] = lambda name: nullcontext()) -> Image.Image:
+    """
+    Decode an image and resize it to the specified width.
+
+    Args:
+        img_path (str | bytes): The path to the image file, or the encoded image.
+        width (int): The desired width for the resized image.
+        resize (str): The resize mode, one of ``MemeGenerator.RESIZE_MODES``.
+        stage (Callable[[str], ContextManager]): Returns a timing context for
+            the ``open`` and ``resize`` stages.
+
+    Returns:
+        Image.Image: The decoded and resized image.
+
+    """
+    if isinstance(img_path, bytes):
+        img_path = io.BytesIO(img_path)
+    with stage('open'):
+        img = Image.open(img_path)
+    with img:
+        with stage('resize'):
+            return _resize_image(img, width, resize)
+
+
+def _resize_image(img: Image.Image, width: int, resize: str = 'nearest') -> Image.Image:
     """
     Resize an image to the specified width while maintaining its aspect ratio.
 
+    In ``fast`` mode, an image that has not been loaded yet is decoded at
+    the smallest JPEG scale that is still at least the target size.
+
     Args:
         img (Image.Image): The image to be resized.
         width (int): The desired width for the resized image.
+        resize (str): The resize mode, one of ``MemeGenerator.RESIZE_MODES``.
 
     Returns:
         Image.Image: The resized image.
 
     """
-    ratio = width / float(img.width)
-    height = int(ratio * float(img.height))
+    width, height = _scaled_size(img, width)
+    if resize == 'fast':
+        img.draft(None, (width, height))
+        return img.resize((width, height), Image.BILINEAR, reducing_gap=2.0)
+    if resize == 'quality':
+        return img.resize((width, height), Image.LANCZOS)
     return img.resize((width, height), Image.NEAREST)
+
+
+def _scaled_size(img: Image.Image, width: int) -> tuple:
+    """
+    Return the size of an image scaled to a width, keeping its aspect ratio.
+
+    Args:
+        img (Image.Image): The image.
+        width (int): The target width.
+
+    Returns:
+        tuple: The (width, height) of the scaled image.
+
+    """
+    ratio = width / float(img.width)
+    return width, max(1, int(ratio * float(img.height)))
+
+
+def _is_animated(img_path: Union[str, bytes]) -> bool:
+    """
+    Check whether an image has more than one frame.
+
+    Only GIF, WebP and PNG files can be animated, so other images are
+    recognized by their first bytes without being opened by Pillow.
+
+    Args:
+        img_path (str | bytes): The path to the image file, or the encoded image.
+
+    Returns:
+        bool: True if the image is animated.
+
+    """
+    if isinstance(img_path, bytes):
+        header = img_path[:12]
+    else:
+        with open(img_path, 'rb') as image_file:
+            header = image_file.read(12)
+    if not (header.startswith((b'GIF87a', b'GIF89a', b'\x89PNG')) or header[8:12] == b'WEBP'):
+        return False
+    with Image.open(io.BytesIO(img_path) if isinstance(img_path, bytes) else img_path) as img:
+        return getattr(img, 'is_animated', False)
+
+
+def _caption_frames(img: Image.Image, width: int, resize: str, layer: Image.Image,
+                    origin: tuple) -> Iterator[Image.Image]:
+    """
+    Decode, resize and caption the frames of an animated image one at a time.
+
+    Args:
+        img (Image.Image): The open animated image.
+        width (int): The desired width for the frames.
+        resize (str): The resize mode, one of ``MemeGenerator.RESIZE_MODES``.
+        layer (Image.Image): The RGBA caption layer.
+        origin (tuple): The (x, y) of the layer's top left corner in the resized frame.
+
+    Yields:
+        Image.Image: The captioned RGB frames, with their duration in ``info``.
+
+    """
+    for index in range(img.n_frames):
+        img.seek(index)
+        frame = _resize_image(img.convert('RGB'), width, resize)
+        frame.paste(layer, origin, layer)
+        frame.info = {'duration': img.info.get('duration')}
+        yield frame
@@ -0,0 +1,199 @@
+"""A pool of pre-rendered memes, refilled on a background thread."""
+
+import logging
+import threading
+import time
+from collections import deque
+from typing import Any, Callable, Union
+
+logger = logging.getLogger(__name__)
+
+
+class MemePool:
+    """
+    Keep a buffer of ready-made memes so a request can be answered without rendering.
+
+    A producer thread calls ``produce`` until the pool holds ``size`` memes,
+    then sleeps until one is taken. ``refill_rate`` caps how many memes per
+    second the producer renders, so refilling after a burst of requests does
+    not take all the CPU away from the requests themselves.
+
+    A taken meme is checked with ``is_fresh`` first, if given, so a meme that
+    has since been evicted from its store is skipped instead of served.
+    ``clear`` drops every meme, including one being rendered at that moment,
+    for example after the quotes or images were reloaded.
+
+    Attributes:
+        DEFAULT_SIZE (int): The default number of memes kept ready.
+        DEFAULT_REFILL_RATE (float): The default maximum memes rendered per second.
+        ERROR_BACKOFF (float): The seconds the producer waits after a failed render.
+        size (int): The number of memes kept ready.
+        refill_rate (float): The maximum memes rendered per second, 0 for no limit.
+        hits (int): The number of takes answered from the pool.
+        misses (int): The number of takes that found the pool empty.
+        stale (int): The number of memes skipped because they were no longer fresh.
+        produced (int): The number of memes added to the pool.
+        errors (int): The number of renders that failed.
+
+    Methods:
+        __init__(self, produce: Callable[[], Any], size: int, refill_rate: float,
+                 is_fresh: Callable[[Any], bool] | None):
+            Initialize an empty pool.
+
+        take(self) -> Any | None:
+            Return a ready meme, or None if the pool is empty.
+
+        clear(self):
+            Drop every meme in the pool.
+
+        running(self) -> bool:
+            Whether the producer thread is alive in this process.
+
+        start(self):
+            Start filling the pool on a daemon thread.
+
+        stop(self):
+            Stop the producer and wait for the thread to finish.
+
+        stats(self) -> dict:
+            Return the pool size, fill level and counters.
+
+    """
+
+    DEFAULT_SIZE = 8
+    DEFAULT_REFILL_RATE = 10.0
+    ERROR_BACKOFF = 1.0
+
+    def __init__(self, produce: Callable[[], Any], size: int = DEFAULT_SIZE,
+                 refill_rate: float = DEFAULT_REFILL_RATE,
+                 is_fresh: Union[Callable[[Any], bool], None] = None):
+        """
+        Initialize an empty pool.
+
+        Args:
+            produce (Callable[[], Any]): Renders one meme; returning None
+                counts as a failure.
+            size (int): The number of memes kept ready.
+            refill_rate (float): The maximum memes rendered per second, 0 for no limit.
+            is_fresh (Callable[[Any], bool] | None): Tells whether a pooled
+                meme can still be served.
+
+        """
+        self._produce = produce
+        self._is_fresh = is_fresh
+        self._items = deque()
+        self._condition = threading.Condition()
+        self._stop = threading.Event()
+        self._thread = None
+        self._generation = 0
+        self.size = size
+        self.refill_rate = refill_rate
+        self.hits = 0
+        self.misses = 0
+        self.stale = 0
+        self.produced = 0
+        self.errors = 0
+
+    def take(self) -> Union[Any, None]:
+        """
+        Return a ready meme, or None if the pool is empty.
+
+        Returns:
+            Any | None: The oldest fresh meme in the pool, or None.
+
+        """
+        with self._condition:
+            while self._items:
+                item = self._items.popleft()
+                self._condition.notify()
+                if self._is_fresh is None or self._is_fresh(item):
+                    self.hits += 1
+                    return item
+                self.stale += 1
+            self.misses += 1
+            return None
+
+    def clear(self):
+        """Drop every meme in the pool."""
+        with self._condition:
+            self._items.clear()
+            self._generation += 1
+            self._condition.notify()
+
+    @property
+    def running(self) -> bool:
+        """
+        Whether the producer thread is alive in this process.
+
+        Threads do not survive a fork, so a pool started before forking
+        reports False in the child and can be started again there.
+        """
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self):
+        """Start filling the pool on a daemon thread."""
+        if self.running:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name='MemePool', daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """Stop the producer and wait for the thread to finish."""
+        self._stop.set()
+        with self._condition:
+            self._condition.notify_all()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def stats(self) -> dict:
+        """
+        Return the pool size, fill level and counters.
+
+        Returns:
+            dict: The size, ready memes, refill rate, hits, misses, hit ratio,
+                stale memes, produced memes and errors.
+
+        """
+        with self._condition:
+            takes = self.hits + self.misses
+            return {
+                'size': self.size,
+                'ready': len(self._items),
+                'refill_rate': self.refill_rate,
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_ratio': self.hits / takes if takes else None,
+                'stale': self.stale,
+                'produced': self.produced,
+                'errors': self.errors,
+            }
+
+    def _run(self):
+        """Render memes whenever the pool is below its size, until stopped."""
+        while not self._stop.is_set():
+            with self._condition:
+                while len(self._items) >= self.size and not self._stop.is_set():
+                    self._condition.wait()
+                generation = self._generation
+            if self._stop.is_set():
+                return
+
+            start = time.monotonic()
+            try:
+                item = self._produce()
+            except Exception as e:
+                logger.exception("Rendering a meme for the pool failed: %s", e)
+                item = None
+
+            if item is None:
+                self.errors += 1
+                self._stop.wait(self.ERROR_BACKOFF)
+                continue
+            with self._condition:
+                if generation == self._generation:
+                    self._items.append(item)
+                    self.produced += 1
+            if self.refill_rate > 0:
+                self._stop.wait(max(0.0, 1 / self.refill_rate - (time.monotonic() - start)))
@@ -0,0 +1,144 @@
+"""A bounded, in-memory LRU store of encoded memes."""
+
+import threading
+from collections import OrderedDict
+from typing import NamedTuple, Union
+
+
+class StoredMeme(NamedTuple):
+    """
+    An encoded meme held by a ``MemeStore``.
+
+    Attributes:
+        data (bytes): The encoded image.
+        image_format (str): The format the image is encoded in, e.g. 'JPEG'.
+    """
+
+    data: bytes
+    image_format: str
+
+
+class MemeStore:
+    """
+    Keep encoded memes in memory so they can be served without touching disk.
+
+    Memes are keyed by their content-addressed id and stored with their
+    format, so they are served with the right MIME type. Once the total size of the
+    stored memes exceeds the budget, the least recently used ones are dropped.
+
+    Attributes:
+        DEFAULT_MAX_BYTES (int): The default memory budget for stored memes.
+        hits (int): The number of lookups that found a meme.
+        misses (int): The number of lookups that found nothing.
+        evictions (int): The number of memes dropped to respect the budget.
+
+    Methods:
+        __init__(self, max_bytes: int):
+            Initialize an empty store with the given memory budget.
+
+        get(self, meme_id: str) -> StoredMeme | None:
+            Return the encoded meme and its format, or None if it is not stored.
+
+        __contains__(self, meme_id: str) -> bool:
+            Whether a meme is stored, without counting a lookup or refreshing it.
+
+        put(self, meme_id: str, data: bytes, image_format: str):
+            Store an encoded meme and evict old ones if needed.
+
+        stats(self) -> dict:
+            Return the store counters and current memory usage.
+
+    """
+
+    DEFAULT_MAX_BYTES = 32 * 1024 * 1024
+
+    def __init__(self, max_bytes: int = DEFAULT_MAX_BYTES):
+        """
+        Initialize an empty store with the given memory budget.
+
+        Args:
+            max_bytes (int): The maximum total size of the stored memes.
+
+        """
+        self._max_bytes = max_bytes
+        self._entries = OrderedDict()
+        self._current_bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, meme_id: str) -> Union[StoredMeme, None]:
+        """
+        Return the encoded meme and its format, or None if it is not stored.
+
+        Args:
+            meme_id (str): The content-addressed id of the meme.
+
+        Returns:
+            StoredMeme | None: The encoded meme and its format, or None if it is not stored.
+
+        """
+        with self._lock:
+            stored = self._entries.get(meme_id)
+            if stored is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(meme_id)
+            self.hits += 1
+            return stored
+
+    def __contains__(self, meme_id: str) -> bool:
+        """
+        Whether a meme is stored, without counting a lookup or refreshing it.
+
+        Args:
+            meme_id (str): The content-addressed id of the meme.
+
+        Returns:
+            bool: True if the meme is stored.
+
+        """
+        with self._lock:
+            return meme_id in self._entries
+
+    def put(self, meme_id: str, data: bytes, image_format: str):
+        """
+        Store an encoded meme and evict old ones if needed.
+
+        Args:
+            meme_id (str): The content-addressed id of the meme.
+            data (bytes): The encoded meme.
+            image_format (str): The format the meme is encoded in, e.g. 'JPEG'.
+
+        """
+        if len(data) > self._max_bytes:
+            return
+        with self._lock:
+            previous = self._entries.pop(meme_id, None)
+            if previous is not None:
+                self._current_bytes -= len(previous.data)
+            self._entries[meme_id] = StoredMeme(data, image_format)
+            self._current_bytes += len(data)
+            while self._current_bytes > self._max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self._current_bytes -= len(evicted.data)
+                self.evictions += 1
+
+    def stats(self) -> dict:
+        """
+        Return the store counters and current memory usage.
+
+        Returns:
+            dict: The hits, misses, evictions, entry count and bytes in use.
+
+        """
+        with self._lock:
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'entries': len(self._entries),
+                'bytes': self._current_bytes,
+                'max_bytes': self._max_bytes,
+            }
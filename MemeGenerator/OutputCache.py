@@ -0,0 +1,190 @@
+"""A content-addressed directory of rendered memes with bounded disk usage."""
+
+import os
+import tempfile
+import threading
+from collections import OrderedDict
+from typing import Callable, Union
+
+
+class OutputCache:
+    """
+    Track rendered memes in an output directory and evict the oldest ones.
+
+    Files are named after a content hash of their inputs, so a file that
+    already exists can be returned instead of rendering it again. Once the
+    directory holds more than ``max_files`` memes or more than ``max_bytes``
+    bytes, the least recently used memes are deleted.
+
+    Attributes:
+        DEFAULT_MAX_FILES (int): The default maximum number of files kept.
+        PREFIX (str): The filename prefix of the files managed by the cache.
+        hits (int): The number of lookups that found an existing file.
+        misses (int): The number of lookups that found nothing.
+        evictions (int): The number of files deleted to respect the limits.
+
+    Methods:
+        __init__(self, directory: str, max_files: int, max_bytes: int | None):
+            Initialize the cache and index the files already in the directory.
+
+        lookup(self, filename: str) -> str | None:
+            Return the path of an existing file, or None if it is not cached.
+
+        store(self, filename: str, writer: Callable[[str], None]) -> str:
+            Write a new file atomically and evict old files if needed.
+
+        max_files, max_bytes (properties):
+            The configured eviction limits.
+
+        stats(self) -> dict:
+            Return the cache counters and current disk usage.
+
+    """
+
+    DEFAULT_MAX_FILES = 1000
+    PREFIX = 'meme_'
+
+    def __init__(self, directory: str, max_files: int = DEFAULT_MAX_FILES,
+                 max_bytes: Union[int, None] = None):
+        """
+        Initialize the cache and index the files already in the directory.
+
+        Args:
+            directory (str): The directory that holds the rendered memes.
+            max_files (int): The maximum number of memes to keep.
+            max_bytes (int | None): The maximum total size of the memes, or None for no limit.
+
+        """
+        self._directory = directory
+        self._max_files = max_files
+        self._max_bytes = max_bytes
+        self._files = OrderedDict()
+        self._current_bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+        os.makedirs(directory, exist_ok=True)
+        self._index_existing()
+
+    @property
+    def max_files(self) -> int:
+        """Return the maximum number of memes kept."""
+        return self._max_files
+
+    @property
+    def max_bytes(self) -> Union[int, None]:
+        """Return the maximum total size of the memes, or None for no limit."""
+        return self._max_bytes
+
+    def lookup(self, filename: str) -> Union[str, None]:
+        """
+        Return the path of an existing file, or None if it is not cached.
+
+        Args:
+            filename (str): The content-addressed file name.
+
+        Returns:
+            str | None: The path to the file, or None if it does not exist.
+
+        """
+        path = os.path.join(self._directory, filename)
+        with self._lock:
+            if filename in self._files:
+                if os.path.exists(path):
+                    self._files.move_to_end(filename)
+                    self.hits += 1
+                    return path
+                self._current_bytes -= self._files.pop(filename)
+            elif os.path.exists(path):
+                # Written by another process sharing the directory.
+                self._add(filename, os.path.getsize(path))
+                self.hits += 1
+                return path
+            self.misses += 1
+            return None
+
+    def store(self, filename: str, writer: Callable[[str], None]) -> str:
+        """
+        Write a new file atomically and evict old files if needed.
+
+        The writer receives a temporary path in the output directory; the file
+        is renamed into place once the writer returns, so concurrent readers
+        never see a partially written meme.
+
+        Args:
+            filename (str): The content-addressed file name.
+            writer (Callable[[str], None]): Writes the file to the given path.
+
+        Returns:
+            str: The path to the stored file.
+
+        """
+        path = os.path.join(self._directory, filename)
+        _, extension = os.path.splitext(filename)
+        fd, temp_path = tempfile.mkstemp(suffix=extension, prefix='.tmp_', dir=self._directory)
+        os.close(fd)
+        try:
+            writer(temp_path)
+            os.chmod(temp_path, 0o644)
+            os.replace(temp_path, path)
+        except BaseException:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            raise
+
+        with self._lock:
+            if filename in self._files:
+                self._current_bytes -= self._files.pop(filename)
+            self._add(filename, os.path.getsize(path))
+            self._evict()
+        return path
+
+    def stats(self) -> dict:
+        """
+        Return the cache counters and current disk usage.
+
+        Returns:
+            dict: The hits, misses, evictions, file count and bytes on disk.
+
+        """
+        with self._lock:
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'files': len(self._files),
+                'bytes': self._current_bytes,
+                'max_files': self._max_files,
+                'max_bytes': self._max_bytes,
+            }
+
+    def _index_existing(self):
+        """Index the managed files already on disk, oldest first."""
+        entries = []
+        for entry in os.scandir(self._directory):
+            if entry.is_file() and entry.name.startswith(self.PREFIX):
+                stat = entry.stat()
+                entries.append((stat.st_mtime, entry.name, stat.st_size))
+        for _, name, size in sorted(entries):
+            self._add(name, size)
+        self._evict()
+
+    def _add(self, filename: str, size: int):
+        """Record a file as the most recently used entry."""
+        self._files[filename] = size
+        self._current_bytes += size
+
+    def _evict(self):
+        """Delete the least recently used files until the limits are met."""
+        while self._files and (
+                len(self._files) > self._max_files
+                or (self._max_bytes is not None and self._current_bytes > self._max_bytes)):
+            filename, size = self._files.popitem(last=False)
+            self._current_bytes -= size
+            self.evictions += 1
+            try:
+                os.remove(os.path.join(self._directory, filename))
+            except FileNotFoundError:
+                pass
@@ -0,0 +1,196 @@
+"""Builds a metrics page in the Prometheus text exposition format."""
+
+import math
+from typing import Dict, Iterable, Union
+
+
+class PrometheusWriter:
+    """
+    Collect metric samples and render them as Prometheus text.
+
+    Samples are grouped into families by name, each with one ``# HELP`` and
+    ``# TYPE`` line, in the order the families were first added. Every name
+    is prefixed with the namespace. Nothing here depends on a Prometheus
+    client library: the page is built from the ``stats()`` of the objects
+    being monitored each time it is requested.
+
+    Attributes:
+        CONTENT_TYPE (str): The content type of the rendered page.
+        namespace (str): The prefix of every metric name.
+
+    Methods:
+        __init__(self, namespace: str):
+            Initialize an empty page.
+
+        add(self, name: str, kind: str, help_text: str, value: float | None,
+            labels: Dict[str, str] | None):
+            Add one counter or gauge sample.
+
+        summary(self, name: str, help_text: str, count: int, total: float,
+                labels: Dict[str, str] | None):
+            Add the count and sum of a summary.
+
+        histogram(self, name: str, help_text: str, stats: dict, label_names: Iterable[str]):
+            Add every series of a ``Histogram``.
+
+        render(self) -> str:
+            Return the page as text.
+
+    """
+
+    CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+    def __init__(self, namespace: str = ''):
+        """
+        Initialize an empty page.
+
+        Args:
+            namespace (str): The prefix of every metric name, without the
+                trailing underscore; empty for none.
+
+        """
+        self.namespace = namespace
+        self._families = {}
+
+    def add(self, name: str, kind: str, help_text: str, value: Union[float, None],
+            labels: Union[Dict[str, str], None] = None):
+        """
+        Add one counter or gauge sample.
+
+        Args:
+            name (str): The metric name, without the namespace. Counters
+                should end in ``_total``.
+            kind (str): ``counter`` or ``gauge``.
+            help_text (str): The description of the metric.
+            value (float | None): The sample value; None adds nothing, for
+                values that are not known yet.
+            labels (Dict[str, str] | None): The labels of the sample.
+
+        """
+        lines = self._family(name, kind, help_text)
+        if value is not None:
+            lines.append(self._sample(self._name(name), labels, value))
+
+    def summary(self, name: str, help_text: str, count: int, total: float,
+                labels: Union[Dict[str, str], None] = None):
+        """
+        Add the count and sum of a summary.
+
+        Args:
+            name (str): The metric name, without the namespace.
+            help_text (str): The description of the metric.
+            count (int): The number of observations.
+            total (float): The sum of the observations.
+            labels (Dict[str, str] | None): The labels of the summary.
+
+        """
+        lines = self._family(name, 'summary', help_text)
+        full_name = self._name(name)
+        lines.append(self._sample(full_name + '_count', labels, count))
+        lines.append(self._sample(full_name + '_sum', labels, total))
+
+    def histogram(self, name: str, help_text: str, stats: dict, label_names: Iterable[str]):
+        """
+        Add every series of a ``Histogram``.
+
+        Args:
+            name (str): The metric name, without the namespace.
+            help_text (str): The description of the metric.
+            stats (dict): The result of ``Histogram.stats()``.
+            label_names (Iterable[str]): The label names; a series label that
+                is a tuple gives one value per name, any other label gives
+                the value of the only name.
+
+        """
+        label_names = tuple(label_names)
+        lines = self._family(name, 'histogram', help_text)
+        full_name = self._name(name)
+        for label, series in sorted(stats.items(), key=lambda item: str(item[0])):
+            values = label if isinstance(label, tuple) else (label,)
+            labels = dict(zip(label_names, values))
+            for bound, count in series['buckets']:
+                lines.append(self._sample(full_name + '_bucket', dict(labels, le=_format_value(bound)), count))
+            lines.append(self._sample(full_name + '_bucket', dict(labels, le='+Inf'), series['count']))
+            lines.append(self._sample(full_name + '_count', labels, series['count']))
+            lines.append(self._sample(full_name + '_sum', labels, series['sum']))
+
+    def render(self) -> str:
+        """
+        Return the page as text.
+
+        Returns:
+            str: The families in the text exposition format, ending in a newline.
+
+        """
+        lines = []
+        for full_name, (kind, help_text, samples) in self._families.items():
+            lines.append(f"# HELP {full_name} {_escape(help_text, quote=False)}")
+            lines.append(f"# TYPE {full_name} {kind}")
+            lines.extend(samples)
+        return '\n'.join(lines) + '\n'
+
+    def _name(self, name: str) -> str:
+        """Return the metric name with the namespace."""
+        return f"{self.namespace}_{name}" if self.namespace else name
+
+    def _family(self, name: str, kind: str, help_text: str) -> list:
+        """
+        Return the sample lines of a family, creating it on first use.
+
+        Raises:
+            ValueError: If the family was already added with another type.
+
+        """
+        full_name = self._name(name)
+        family = self._families.get(full_name)
+        if family is None:
+            family = self._families[full_name] = (kind, help_text, [])
+        elif family[0] != kind:
+            raise ValueError(f"{full_name} is a {family[0]}, not a {kind}")
+        return family[2]
+
+    @staticmethod
+    def _sample(full_name: str, labels: Union[Dict[str, str], None], value: float) -> str:
+        """Return one sample line."""
+        if labels:
+            pairs = ','.join(f'{key}="{_escape(str(label))}"' for key, label in labels.items())
+            return f"{full_name}{{{pairs}}} {_format_value(value)}"
+        return f"{full_name} {_format_value(value)}"
+
+
+def _escape(text: str, quote: bool = True) -> str:
+    """
+    Escape a label value or help text.
+
+    Args:
+        text (str): The text to escape.
+        quote (bool): Whether double quotes are escaped too, as in label values.
+
+    Returns:
+        str: The escaped text.
+
+    """
+    text = text.replace('\\', '\\\\').replace('\n', '\\n')
+    return text.replace('"', '\\"') if quote else text
+
+
+def _format_value(value: float) -> str:
+    """
+    Format a sample value or bucket bound.
+
+    Args:
+        value (float): The value; booleans are written as 0 or 1.
+
+    Returns:
+        str: The value as Prometheus expects it, such as ``42``, ``0.25`` or ``+Inf``.
+
+    """
+    if isinstance(value, bool):
+        return str(int(value))
+    if isinstance(value, int):
+        return str(value)
+    if math.isinf(value):
+        return '+Inf' if value > 0 else '-Inf'
+    if math.isnan(value):
+        return 'NaN'
+    return repr(float(value))
@@ -0,0 +1,294 @@
+"""A cache of remote images with TTL and conditional revalidation."""
+
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from typing import Union
+from MemeGenerator.ImageFetcher import ImageFetcher, ImageFetchError
+
+logger = logging.getLogger(__name__)
+
+
+class RemoteImageCache:
+    """
+    Cache downloaded images on disk and revalidate them once they expire.
+
+    The raw bytes of each image are kept on disk next to a small metadata file
+    holding its ``ETag`` and ``Last-Modified`` headers. Within the TTL, the
+    cached bytes are returned without any request. After the TTL, a conditional
+    request (``If-None-Match`` / ``If-Modified-Since``) is sent; a 304 response
+    extends the entry without transferring the image again. The decoded and
+    resized base lives in the ``MemeGenerator`` image cache, which keys the
+    bytes by their digest, so a revalidated image is not decoded again either.
+
+    The most recently used images are also kept in memory, up to
+    ``max_memory_bytes``, together with their digest, so a hit neither reads
+    the file nor hashes the bytes again. If an expired image cannot be
+    revalidated because the origin fails, the cached copy is served for up to
+    ``stale_if_error`` seconds past its expiry.
+
+    Attributes:
+        DEFAULT_TTL (float): The default number of seconds an entry is fresh.
+        DEFAULT_MAX_ENTRIES (int): The default maximum number of cached URLs.
+        DEFAULT_MAX_MEMORY_BYTES (int): The default budget of image bytes kept in memory.
+        DEFAULT_STALE_IF_ERROR (float): The default number of seconds an expired
+            entry is still served while the origin fails.
+        hits (int): The number of requests answered without contacting the origin.
+        revalidations (int): The number of requests answered by a 304 response.
+        misses (int): The number of requests that downloaded the image.
+        stale (int): The number of requests answered with an expired entry because the origin failed.
+        evictions (int): The number of entries dropped to respect the limit.
+
+    Methods:
+        __init__(self, fetcher: ImageFetcher, cache_dir: str, ttl: float, max_entries: int,
+                 max_memory_bytes: int, stale_if_error: float):
+            Initialize the cache and index the entries already on disk.
+
+        get(self, url: str) -> bytes:
+            Return the image at the URL, downloading or revalidating it if needed.
+
+        stats(self) -> dict:
+            Return the cache counters.
+
+    """
+
+    DEFAULT_TTL = 300.0
+    DEFAULT_MAX_ENTRIES = 256
+    DEFAULT_MAX_MEMORY_BYTES = 32 * 1024 * 1024
+    DEFAULT_STALE_IF_ERROR = 24 * 60 * 60.0
+
+    def __init__(self, fetcher: ImageFetcher, cache_dir: str, ttl: float = DEFAULT_TTL,
+                 max_entries: int = DEFAULT_MAX_ENTRIES, max_memory_bytes: int = DEFAULT_MAX_MEMORY_BYTES,
+                 stale_if_error: float = DEFAULT_STALE_IF_ERROR):
+        """
+        Initialize the cache and index the entries already on disk.
+
+        Args:
+            fetcher (ImageFetcher): The fetcher used to download images.
+            cache_dir (str): The directory that holds the cached images.
+            ttl (float): The number of seconds an entry is used without revalidation.
+            max_entries (int): The maximum number of cached URLs.
+            max_memory_bytes (int): The maximum number of image bytes kept in memory.
+            stale_if_error (float): The number of seconds past its expiry an entry
+                is served while the origin fails.
+
+        """
+        self._fetcher = fetcher
+        self._cache_dir = cache_dir
+        self._ttl = ttl
+        self._max_entries = max_entries
+        self._max_memory_bytes = max_memory_bytes
+        self._stale_if_error = stale_if_error
+        self._entries = OrderedDict()
+        self._data = OrderedDict()
+        self._data_bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.revalidations = 0
+        self.misses = 0
+        self.stale = 0
+        self.evictions = 0
+
+        os.makedirs(cache_dir, exist_ok=True)
+        self._index_existing()
+
+    def get(self, url: str) -> bytes:
+        """
+        Return the image at the URL, downloading or revalidating it if needed.
+
+        Args:
+            url (str): The URL of the image.
+
+        Returns:
+            bytes: The encoded image.
+
+        Raises:
+            ImageFetchError: If the image has to be fetched and the request fails,
+                unless an expired copy may still be served.
+
+        """
+        name = hashlib.sha256(url.encode('utf-8')).hexdigest()
+        with self._lock:
+            entry = self._entries.get(name)
+            data = None
+            if entry is not None:
+                self._entries.move_to_end(name)
+                data = self._data.get(name)
+                if data is not None:
+                    self._data.move_to_end(name)
+
+        if entry is not None and data is None:
+            data = self._read_data(name)
+            if data is None:
+                entry = None
+            else:
+                self._remember(name, data)
+
+        if entry is not None and time.time() < entry['expires_at']:
+            with self._lock:
+                self.hits += 1
+            return data
+
+        headers = {}
+        if entry is not None:
+            if entry.get('etag'):
+                headers['If-None-Match'] = entry['etag']
+            if entry.get('last_modified'):
+                headers['If-Modified-Since'] = entry['last_modified']
+
+        try:
+            result = self._fetcher.fetch(url, headers=headers or None)
+        except ImageFetchError as e:
+            if entry is None or time.time() >= entry['expires_at'] + self._stale_if_error:
+                raise
+            with self._lock:
+                self.stale += 1
+            logger.warning("Serving an expired copy of %s: %s", url, e, extra={'image_url': url})
+            return data
+
+        if result.status == 304:
+            if entry is None:
+                raise ImageFetchError(f"Unexpected status 304 for unconditional request to {url}")
+            with self._lock:
+                self.revalidations += 1
+            entry = dict(entry, expires_at=time.time() + self._ttl)
+            if result.headers.get('ETag'):
+                entry['etag'] = result.headers['ETag']
+            self._write_entry(name, entry, None)
+            return data
+
+        with self._lock:
+            self.misses += 1
+        data = _DigestedBytes(result.data)
+        entry = {
+            'url': url,
+            'etag': result.headers.get('ETag'),
+            'last_modified': result.headers.get('Last-Modified'),
+            'expires_at': time.time() + self._ttl,
+        }
+        self._write_entry(name, entry, data)
+        return data
+
+    def stats(self) -> dict:
+        """
+        Return the cache counters.
+
+        Returns:
+            dict: The hits, revalidations, misses, stale answers, evictions,
+                entry count and bytes kept in memory.
+
+        """
+        with self._lock:
+            return {
+                'hits': self.hits,
+                'revalidations': self.revalidations,
+                'misses': self.misses,
+                'stale': self.stale,
+                'evictions': self.evictions,
+                'entries': len(self._entries),
+                'bytes': self._data_bytes,
+            }
+
+    def _index_existing(self):
+        """Load the metadata of the entries already on disk, oldest first."""
+        entries = []
+        for entry in os.scandir(self._cache_dir):
+            if entry.is_file() and entry.name.endswith('.json'):
+                entries.append((entry.stat().st_mtime, entry.name[:-len('.json')]))
+        for _, name in sorted(entries):
+            try:
+                with open(os.path.join(self._cache_dir, f'{name}.json'), 'r', encoding='utf-8') as meta_file:
+                    self._entries[name] = json.load(meta_file)
+            except (OSError, ValueError):
+                self._remove_files(name)
+        self._evict()
+
+    def _read_data(self, name: str) -> Union[bytes, None]:
+        """Return the cached bytes for an entry, or None if they are missing."""
+        try:
+            with open(os.path.join(self._cache_dir, f'{name}.img'), 'rb') as data_file:
+                return _DigestedBytes(data_file.read())
+        except FileNotFoundError:
+            return None
+
+    def _write_entry(self, name: str, entry: dict, data):
+        """Atomically write an entry's metadata and, if given, its bytes."""
+        if data is not None:
+            _write_atomic(os.path.join(self._cache_dir, f'{name}.img'), data)
+        _write_atomic(os.path.join(self._cache_dir, f'{name}.json'), json.dumps(entry).encode('utf-8'))
+        with self._lock:
+            self._entries[name] = entry
+            self._entries.move_to_end(name)
+            if data is not None:
+                self._remember_locked(name, data)
+            self._evict()
+
+    def _remember(self, name: str, data: bytes):
+        """Keep an entry's bytes in memory."""
+        with self._lock:
+            if name in self._entries:
+                self._remember_locked(name, data)
+
+    def _remember_locked(self, name: str, data: bytes):
+        """Keep an entry's bytes in memory and drop the least recently used ones over the budget."""
+        previous = self._data.pop(name, None)
+        if previous is not None:
+            self._data_bytes -= len(previous)
+        self._data[name] = data
+        self._data_bytes += len(data)
+        while self._data_bytes > self._max_memory_bytes:
+            _, dropped = self._data.popitem(last=False)
+            self._data_bytes -= len(dropped)
+
+    def _evict(self):
+        """Drop the least recently used entries until the limit is met."""
+        while len(self._entries) > self._max_entries:
+            name, _ = self._entries.popitem(last=False)
+            dropped = self._data.pop(name, None)
+            if dropped is not None:
+                self._data_bytes -= len(dropped)
+            self._remove_files(name)
+            self.evictions += 1
+
+    def _remove_files(self, name: str):
+        """Delete an entry's files from disk."""
+        for extension in ('.img', '.json'):
+            try:
+                os.remove(os.path.join(self._cache_dir, f'{name}{extension}'))
+            except FileNotFoundError:
+                pass
+
+
+class _DigestedBytes(bytes):
+    """Encoded image bytes with their SHA-256 digest, which ``ImageCache.source_key`` reuses."""
+
+    def __new__(cls, data: bytes):
+        """Copy the bytes and hash them once."""
+        self = super().__new__(cls, data)
+        self.sha256 = hashlib.sha256(data).hexdigest()
+        return self
+
+
+def _write_atomic(path: str, data: bytes):
+    """
+    Write a file so that readers never see it partially written.
+
+    Args:
+        path (str): The destination path.
+        data (bytes): The file contents.
+
+    """
+    fd, temp_path = tempfile.mkstemp(prefix='.tmp_', dir=os.path.dirname(path))
+    try:
+        with os.fdopen(fd, 'wb') as temp_file:
+            temp_file.write(data)
+        os.replace(temp_path, path)
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
@@ -0,0 +1,253 @@
+"""A bounded pool of background render jobs addressed by id."""
+
+import secrets
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Union
+
+
+class QueueFullError(Exception):
+    """Raised when a job is submitted to a render queue that is already full."""
+
+
+class RenderJob:
+    """
+    The state of a job submitted to a ``RenderQueue``.
+
+    Attributes:
+        QUEUED, RUNNING, DONE, FAILED (str): The possible statuses.
+        job_id (str): The id the job is looked up by.
+        status (str): The current status.
+        result: The return value of the job once it is done.
+        error (Exception | None): The exception raised by the job if it failed.
+        submitted_at (float): The monotonic time the job was submitted.
+        started_at (float | None): The monotonic time a worker picked the job up.
+        finished_at (float | None): The monotonic time the job finished.
+
+    Methods:
+        wait(self, timeout: float) -> bool:
+            Wait until the job is finished and return whether it is.
+
+    """
+
+    QUEUED = 'queued'
+    RUNNING = 'running'
+    DONE = 'done'
+    FAILED = 'failed'
+
+    def __init__(self, job_id: str):
+        """
+        Initialize a queued job.
+
+        Args:
+            job_id (str): The id the job is looked up by.
+
+        """
+        self.job_id = job_id
+        self.status = self.QUEUED
+        self.result = None
+        self.error = None
+        self.submitted_at = time.monotonic()
+        self.started_at = None
+        self.finished_at = None
+        self._finished = threading.Event()
+
+    @property
+    def finished(self) -> bool:
+        """Whether the job is done or failed."""
+        return self._finished.is_set()
+
+    def wait(self, timeout: Union[float, None] = None) -> bool:
+        """
+        Wait until the job is finished and return whether it is.
+
+        Args:
+            timeout (float | None): The maximum number of seconds to wait.
+
+        Returns:
+            bool: True if the job is finished.
+
+        """
+        return self._finished.wait(timeout)
+
+
+class RenderQueue:
+    """
+    Run render jobs on a fixed pool of worker threads.
+
+    ``submit`` returns a job id immediately; the job's status and result are
+    looked up with ``get``. At most ``max_pending`` jobs may be queued or
+    running at once: beyond that, ``submit`` raises ``QueueFullError`` instead
+    of letting the backlog and its latency grow without bound. Finished jobs are
+    kept for lookup until ``max_jobs`` newer ones have finished.
+
+    The worker threads are started on the first submission, so a queue created
+    before a fork is safe to use in the child.
+
+    Attributes:
+        DEFAULT_WORKERS (int): The default number of worker threads.
+        DEFAULT_MAX_PENDING (int): The default limit on queued and running jobs.
+        DEFAULT_MAX_JOBS (int): The default number of finished jobs kept.
+        submitted (int): The number of accepted jobs.
+        rejected (int): The number of jobs refused because the queue was full.
+        completed (int): The number of jobs that finished successfully.
+        failed (int): The number of jobs that raised an exception.
+
+    Methods:
+        __init__(self, workers: int, max_pending: int, max_jobs: int):
+            Initialize an empty queue.
+
+        submit(self, fn: Callable, *args, **kwargs) -> str:
+            Queue a call and return the id of its job.
+
+        get(self, job_id: str) -> RenderJob | None:
+            Return a job by id, or None if it is unknown or was dropped.
+
+        stats(self) -> dict:
+            Return the queue depth, counters and wait times.
+
+        shutdown(self):
+            Wait for the running jobs and stop the workers.
+
+    """
+
+    DEFAULT_WORKERS = 4
+    DEFAULT_MAX_PENDING = 64
+    DEFAULT_MAX_JOBS = 1024
+
+    def __init__(self, workers: int = DEFAULT_WORKERS, max_pending: int = DEFAULT_MAX_PENDING,
+                 max_jobs: int = DEFAULT_MAX_JOBS):
+        """
+        Initialize an empty queue.
+
+        Args:
+            workers (int): The number of worker threads.
+            max_pending (int): The maximum number of queued and running jobs.
+            max_jobs (int): The maximum number of finished jobs kept for lookup.
+
+        """
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='RenderQueue')
+        self._workers = workers
+        self._max_pending = max_pending
+        self._max_jobs = max_jobs
+        self._jobs = {}
+        self._finished = OrderedDict()
+        self._lock = threading.Lock()
+        self._queued = 0
+        self._running = 0
+        self._wait_seconds = 0.0
+        self._max_wait_seconds = 0.0
+        self._run_seconds = 0.0
+        self.submitted = 0
+        self.rejected = 0
+        self.completed = 0
+        self.failed = 0
+
+    def submit(self, fn: Callable, *args, **kwargs) -> str:
+        """
+        Queue a call and return the id of its job.
+
+        Args:
+            fn (Callable): The function to run on a worker thread.
+            *args: The positional arguments of the call.
+            **kwargs: The keyword arguments of the call.
+
+        Returns:
+            str: The id of the job.
+
+        Raises:
+            QueueFullError: If ``max_pending`` jobs are already queued or running.
+
+        """
+        with self._lock:
+            if self._queued + self._running >= self._max_pending:
+                self.rejected += 1
+                raise QueueFullError(f"Render queue is full ({self._max_pending} pending jobs)")
+            job = RenderJob(secrets.token_urlsafe(12))
+            self._jobs[job.job_id] = job
+            self._queued += 1
+            self.submitted += 1
+        self._executor.submit(self._run, job, fn, args, kwargs)
+        return job.job_id
+
+    def get(self, job_id: str) -> Union[RenderJob, None]:
+        """
+        Return a job by id, or None if it is unknown or was dropped.
+
+        Args:
+            job_id (str): The id returned by ``submit``.
+
+        Returns:
+            RenderJob | None: The job, or None.
+
+        """
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def stats(self) -> dict:
+        """
+        Return the queue depth, counters and wait times.
+
+        Wait times are measured from submission until a worker picks the job
+        up; run times from then until the job finishes.
+
+        Returns:
+            dict: The depth, running count, counters and wait and run times in seconds.
+
+        """
+        with self._lock:
+            started = self.completed + self.failed + self._running
+            finished = self.completed + self.failed
+            return {
+                'workers': self._workers,
+                'max_pending': self._max_pending,
+                'depth': self._queued,
+                'running': self._running,
+                'submitted': self.submitted,
+                'rejected': self.rejected,
+                'completed': self.completed,
+                'failed': self.failed,
+                'wait_seconds_total': self._wait_seconds,
+                'wait_seconds_avg': self._wait_seconds / started if started else 0.0,
+                'wait_seconds_max': self._max_wait_seconds,
+                'run_seconds_total': self._run_seconds,
+                'run_seconds_avg': self._run_seconds / finished if finished else 0.0,
+            }
+
+    def shutdown(self):
+        """Wait for the running jobs and stop the workers."""
+        self._executor.shutdown(wait=True)
+
+    def _run(self, job: RenderJob, fn: Callable, args: tuple, kwargs: dict):
+        """Run a job on a worker thread and record its outcome."""
+        job.started_at = time.monotonic()
+        waited = job.started_at - job.submitted_at
+        with self._lock:
+            self._queued -= 1
+            self._running += 1
+            self._wait_seconds += waited
+            self._max_wait_seconds = max(self._max_wait_seconds, waited)
+        job.status = RenderJob.RUNNING
+
+        try:
+            job.result = fn(*args, **kwargs)
+            job.status = RenderJob.DONE
+        except Exception as e:
+            job.error = e
+            job.status = RenderJob.FAILED
+        job.finished_at = time.monotonic()
+
+        with self._lock:
+            self._running -= 1
+            self._run_seconds += job.finished_at - job.started_at
+            if job.status == RenderJob.DONE:
+                self.completed += 1
+            else:
+                self.failed += 1
+            self._finished[job.job_id] = None
+            while len(self._finished) > self._max_jobs:
+                dropped, _ = self._finished.popitem(last=False)
+                self._jobs.pop(dropped, None)
+        job._finished.set()
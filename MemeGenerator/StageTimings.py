@@ -0,0 +1,110 @@
+"""Aggregates per-stage render timings reported by MemeGenerator."""
+
+import threading
+
+
+class StageTimings:
+    """
+    Collect the time spent in each stage of rendering a meme.
+
+    An instance is a stage hook: pass it as ``MemeGenerator(stage_hook=...)``
+    and the generator calls it with the name and duration of every stage it
+    runs. The count, total and maximum are kept per stage, and the raw samples
+    of the most recent renders can be kept too for percentile reports.
+
+    Attributes:
+        None
+
+    Methods:
+        __init__(self, keep_samples: int):
+            Initialize empty timings.
+
+        __call__(self, stage: str, seconds: float):
+            Record one run of a stage.
+
+        stats(self) -> dict:
+            Return the count, total, mean and maximum seconds per stage.
+
+        samples(self, stage: str) -> list:
+            Return the kept durations of a stage, oldest first.
+
+        reset(self):
+            Forget everything recorded so far.
+
+    """
+
+    def __init__(self, keep_samples: int = 0):
+        """
+        Initialize empty timings.
+
+        Args:
+            keep_samples (int): The number of recent durations kept per stage
+                for ``samples``; 0 keeps none.
+
+        """
+        self._keep_samples = keep_samples
+        self._lock = threading.Lock()
+        self._stages = {}
+        self._samples = {}
+
+    def __call__(self, stage: str, seconds: float):
+        """
+        Record one run of a stage.
+
+        Args:
+            stage (str): The stage name, such as ``open`` or ``encode``.
+            seconds (float): The duration of the stage.
+
+        """
+        with self._lock:
+            entry = self._stages.get(stage)
+            if entry is None:
+                entry = self._stages[stage] = [0, 0.0, 0.0]
+            entry[0] += 1
+            entry[1] += seconds
+            if seconds > entry[2]:
+                entry[2] = seconds
+            if self._keep_samples:
+                samples = self._samples.setdefault(stage, [])
+                samples.append(seconds)
+                if len(samples) > self._keep_samples:
+                    del samples[:len(samples) - self._keep_samples]
+
+    def stats(self) -> dict:
+        """
+        Return the count, total, mean and maximum seconds per stage.
+
+        Returns:
+            dict: Maps each stage name to its count, total, mean and max seconds.
+
+        """
+        with self._lock:
+            return {
+                stage: {
+                    'count': count,
+                    'total_seconds': total,
+                    'mean_seconds': total / count,
+                    'max_seconds': maximum,
+                }
+                for stage, (count, total, maximum) in self._stages.items()
+            }
+
+    def samples(self, stage: str) -> list:
+        """
+        Return the kept durations of a stage, oldest first.
+
+        Args:
+            stage (str): The stage name.
+
+        Returns:
+            list: The durations in seconds.
+
+        """
+        with self._lock:
+            return list(self._samples.get(stage, ()))
+
+    def reset(self):
+        """Forget everything recorded so far."""
+        with self._lock:
+            self._stages.clear()
+            self._samples.clear()
@@ -0,0 +1,286 @@
+"""Wraps captions and fits their font size to a box."""
+
+import threading
+from typing import Dict, List, NamedTuple, Tuple, Union
+from MemeGenerator.FontRegistry import FontRegistry, font_registry
+
+
+class CaptionLayout(NamedTuple):
+    """
+    A caption broken into lines at a font size that fits its box.
+
+    Attributes:
+        lines (tuple): The lines of text, top to bottom.
+        size (int): The font size in points.
+        line_height (int): The distance between the tops of consecutive lines.
+        width (int): The width of the widest line.
+        height (int): The height of all lines together.
+    """
+
+    lines: Tuple[str, ...]
+    size: int
+    line_height: int
+    width: int
+    height: int
+
+
+class TextLayout:
+    """
+    Wrap captions to a maximum width and pick the largest font size that fits.
+
+    Text is wrapped greedily on spaces; a word wider than the box is split
+    between characters. The font size is found by binary search between the
+    minimum and maximum size. If even the minimum size does not fit, the lines
+    that fit are kept and the last one ends with an ellipsis.
+
+    Measuring text with FreeType is the expensive part of a layout, and a size
+    search measures every word at several sizes. Word widths are therefore
+    memoized per (font, size): laying out another caption with the same words
+    costs dictionary lookups only. Each memo is cleared once it holds
+    ``max_words`` words, which bounds its memory. The memos are plain dicts,
+    whose single operations are atomic, so threads share them without a
+    lock. The counters are tallied per call and added under a lock once it
+    returns, which keeps the lock out of the per-word loop.
+
+    Attributes:
+        DEFAULT_MAX_WORDS (int): The default number of words memoized per (font, size).
+        LINE_SPACING (float): The line height as a multiple of the font's height.
+        ELLIPSIS (str): The text appended to a caption that had to be cut.
+        measured (int): The number of words measured with FreeType.
+        hits (int): The number of word widths answered from the memo.
+
+    Methods:
+        __init__(self, fonts: FontRegistry, max_words: int):
+            Initialize a layout engine with empty memos.
+
+        layout(self, font_path: str, text: str, max_width: int, max_height: int,
+               min_size: int, max_size: int) -> CaptionLayout:
+            Wrap text to the box at the largest font size that fits.
+
+        wrap(self, font_path: str, size: int, text: str, max_width: int) -> List[str]:
+            Break text into lines no wider than max_width.
+
+        text_width(self, font_path: str, size: int, text: str) -> int:
+            Return the width of a line of text.
+
+        stats(self) -> dict:
+            Return the memo counters.
+
+    """
+
+    DEFAULT_MAX_WORDS = 50000
+    LINE_SPACING = 1.2
+    ELLIPSIS = '...'
+
+    def __init__(self, fonts: Union[FontRegistry, None] = None, max_words: int = DEFAULT_MAX_WORDS):
+        """
+        Initialize a layout engine with empty memos.
+
+        Args:
+            fonts (FontRegistry | None): The font pool. The process-wide
+                registry is used if omitted.
+            max_words (int): The number of word widths memoized per (font, size).
+
+        """
+        self._fonts = fonts if fonts is not None else font_registry
+        self._max_words = max_words
+        self._widths = {}
+        self._line_heights = {}
+        self._lock = threading.Lock()
+        self.measured = 0
+        self.hits = 0
+
+    def layout(self, font_path: str, text: str, max_width: int, max_height: int,
+               min_size: int, max_size: int) -> CaptionLayout:
+        """
+        Wrap text to the box at the largest font size that fits.
+
+        Args:
+            font_path (str): The path to the TrueType font file.
+            text (str): The caption text.
+            max_width (int): The width of the box in pixels.
+            max_height (int): The height of the box in pixels.
+            min_size (int): The smallest font size to use.
+            max_size (int): The largest font size to use.
+
+        Returns:
+            CaptionLayout: The lines, font size and dimensions of the caption.
+
+        """
+        tally = [0, 0]
+        max_width = max(1, max_width)
+        best = None
+        low, high = min_size, max(min_size, max_size)
+        while low <= high:
+            size = (low + high) // 2
+            lines = self._wrap(font_path, size, text, max_width, tally)
+            if len(lines) * self._line_height(font_path, size) <= max_height:
+                best = (size, lines)
+                low = size + 1
+            else:
+                high = size - 1
+
+        if best is None:
+            size = min_size
+            lines = self._truncate(font_path, size, self._wrap(font_path, size, text, max_width, tally),
+                                   max_width, max_height, tally)
+        else:
+            size, lines = best
+
+        line_height = self._line_height(font_path, size)
+        width = max((self._text_width(font_path, size, line, tally) for line in lines), default=0)
+        self._count(tally)
+        return CaptionLayout(tuple(lines), size, line_height, width, len(lines) * line_height)
+
+    def wrap(self, font_path: str, size: int, text: str, max_width: int) -> List[str]:
+        """
+        Break text into lines no wider than max_width.
+
+        Args:
+            font_path (str): The path to the TrueType font file.
+            size (int): The font size in points.
+            text (str): The text to wrap.
+            max_width (int): The maximum line width in pixels.
+
+        Returns:
+            List[str]: The lines of text.
+
+        """
+        tally = [0, 0]
+        lines = self._wrap(font_path, size, text, max_width, tally)
+        self._count(tally)
+        return lines
+
+    def text_width(self, font_path: str, size: int, text: str) -> int:
+        """
+        Return the width of a line of text.
+
+        The width is the sum of the memoized word and space widths, so
+        kerning across word boundaries is ignored.
+
+        Args:
+            font_path (str): The path to the TrueType font file.
+            size (int): The font size in points.
+            text (str): The line of text.
+
+        Returns:
+            int: The width in pixels.
+
+        """
+        tally = [0, 0]
+        width = self._text_width(font_path, size, text, tally)
+        self._count(tally)
+        return width
+
+    def stats(self) -> dict:
+        """
+        Return the memo counters.
+
+        Returns:
+            dict: The words measured, memo hits and memoized (font, size) pairs.
+
+        """
+        with self._lock:
+            return {
+                'measured': self.measured,
+                'hits': self.hits,
+                'memos': len(self._widths),
+            }
+
+    def _count(self, tally: List[int]):
+        """Add the memo hits and measured words of one call to the counters."""
+        with self._lock:
+            self.hits += tally[0]
+            self.measured += tally[1]
+
+    def _wrap(self, font_path: str, size: int, text: str, max_width: int, tally: List[int]) -> List[str]:
+        """Break text into lines no wider than max_width, tallying memo hits and misses."""
+        widths = self._memo(font_path, size)
+        space = self._word_width(widths, font_path, size, ' ', tally)
+        lines = []
+        line = []
+        line_width = 0
+        for word in text.split():
+            word_width = self._word_width(widths, font_path, size, word, tally)
+            if word_width > max_width:
+                if line:
+                    lines.append(' '.join(line))
+                pieces = self._split_word(widths, font_path, size, word, max_width, tally)
+                lines.extend(pieces[:-1])
+                line = [pieces[-1]]
+                line_width = self._word_width(widths, font_path, size, pieces[-1], tally)
+            elif line and line_width + space + word_width > max_width:
+                lines.append(' '.join(line))
+                line = [word]
+                line_width = word_width
+            else:
+                line_width += word_width + (space if line else 0)
+                line.append(word)
+        if line:
+            lines.append(' '.join(line))
+        return lines
+
+    def _text_width(self, font_path: str, size: int, text: str, tally: List[int]) -> int:
+        """Return the width of a line of text, tallying memo hits and misses."""
+        widths = self._memo(font_path, size)
+        words = text.split(' ')
+        space = self._word_width(widths, font_path, size, ' ', tally)
+        return (sum(self._word_width(widths, font_path, size, word, tally) for word in words)
+                + space * (len(words) - 1))
+
+    def _memo(self, font_path: str, size: int) -> Dict[str, int]:
+        """Return the word width memo for a font and size."""
+        key = (font_path, size)
+        widths = self._widths.get(key)
+        if widths is None:
+            widths = self._widths[key] = {}
+        return widths
+
+    def _word_width(self, widths: Dict[str, int], font_path: str, size: int, word: str,
+                    tally: List[int]) -> int:
+        """Return the width of a word, measuring it on a memo miss, and tally the lookup."""
+        width = widths.get(word)
+        if width is not None:
+            tally[0] += 1
+            return width
+        if len(widths) >= self._max_words:
+            widths.clear()
+        width = widths[word] = int(round(self._fonts.get(font_path, size).getlength(word)))
+        tally[1] += 1
+        return width
+
+    def _line_height(self, font_path: str, size: int) -> int:
+        """Return the line height of a font and size."""
+        key = (font_path, size)
+        line_height = self._line_heights.get(key)
+        if line_height is None:
+            ascent, descent = self._fonts.get(font_path, size).getmetrics()
+            line_height = self._line_heights[key] = int(round((ascent + descent) * self.LINE_SPACING))
+        return line_height
+
+    def _split_word(self, widths: Dict[str, int], font_path: str, size: int, word: str,
+                    max_width: int, tally: List[int]) -> List[str]:
+        """Split a word that is wider than max_width between characters."""
+        pieces = []
+        piece = ''
+        for char in word:
+            if piece and self._word_width(widths, font_path, size, piece + char, tally) > max_width:
+                pieces.append(piece)
+                piece = char
+            else:
+                piece += char
+        pieces.append(piece)
+        return pieces
+
+    def _truncate(self, font_path: str, size: int, lines: List[str], max_width: int,
+                  max_height: int, tally: List[int]) -> List[str]:
+        """Keep the lines that fit in max_height and end the last one with an ellipsis."""
+        fitting = max(1, max_height // self._line_height(font_path, size))
+        if len(lines) <= fitting:
+            return lines
+        lines = lines[:fitting]
+        last = lines[-1]
+        while last and self._text_width(font_path, size, last + self.ELLIPSIS, tally) > max_width:
+            last = last[:-1].rstrip()
+        lines[-1] = last + self.ELLIPSIS
+        return lines
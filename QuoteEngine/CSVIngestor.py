@@ -1,23 +1,41 @@
 """Aclass for ingesting quotes from CSV files."""
 
-from typing import List
+import csv
+import logging
+from typing import Iterator, List
 from QuoteEngine.QuoteModel import QuoteModel
 from QuoteEngine.IngestorInterface import IngestorInterface
-import pandas as pd
+
+logger = logging.getLogger(__name__)
 
 
 class CSVIngestor(IngestorInterface):
     """
     CSV Ingestor class.
 
+    Rows are streamed with the standard library's ``csv`` module, so memory use
+    stays constant regardless of the file size. Rows without a body or an
+    author, or with extra columns, are skipped and counted.
+
+    Attributes:
+        malformed_rows (int): The number of rows skipped since the process started.
+
     Methods:
         can_ingest(cls, path: str) -> bool:
             Check if the class can ingest the given CSV file.
 
         parse(cls, path: str) -> List[QuoteModel]:
             Parse the given CSV file and return a list of QuoteModel objects.
+
+        cpu_bound(cls) -> bool:
+            Tell whether parsing is limited by the CPU rather than by I/O.
+
+        iter_parse(cls, path: str) -> Iterator[QuoteModel]:
+            Yield QuoteModel objects from the given CSV file one row at a time.
     """
 
+    malformed_rows = 0
+
     @classmethod
     def can_ingest(cls, path: str) -> bool:
         """
@@ -28,6 +46,15 @@ class CSVIngestor(IngestorInterface):
         """
         return path.endswith('.csv')
 
+    @classmethod
+    def cpu_bound(cls) -> bool:
+        """
+        Tell whether parsing is limited by the CPU rather than by I/O.
+
+        :return: True, since parsing the file happens in Python.
+        """
+        return True
+
     @classmethod
     def parse(cls, path: str) -> List[QuoteModel]:
         """
@@ -38,12 +65,35 @@ class CSVIngestor(IngestorInterface):
         """
         quotes = []
         try:
-            df = pd.read_csv(path)
-            for index, row in df.iterrows():
-                body = row['body']
-                author = row['author']
-                quote = QuoteModel(body, author)
-                quotes.append(quote)
+            quotes.extend(cls.iter_parse(path))
         except Exception as e:
-            print(f"Error: {e}")
+            cls._count('errors')
+            logger.error("Failed to parse %s: %s", path, e, extra={'ingestor': cls.__name__, 'path': path})
         return quotes
+
+    @classmethod
+    def iter_parse(cls, path: str) -> Iterator[QuoteModel]:
+        """
+        Yield QuoteModel objects from the given CSV file one row at a time.
+
+        :param path: The path to the CSV file to be parsed.
+        :return: An iterator of QuoteModel objects.
+        :raises ValueError: If the file has no 'body' or 'author' column.
+        """
+        with open(path, 'r', encoding='utf-8-sig', newline='') as file:
+            reader = csv.DictReader(file)
+            if reader.fieldnames is None or 'body' not in reader.fieldnames \
+                    or 'author' not in reader.fieldnames:
+                raise ValueError(f"{path} must have 'body' and 'author' columns")
+            malformed = 0
+            try:
+                for row in reader:
+                    body = row['body']
+                    author = row['author']
+                    if not body or not author or None in row:
+                        malformed += 1
+                        continue
+                    yield QuoteModel(body, author)
+            finally:
+                if malformed:
+                    cls._count('malformed_rows', malformed)
@@ -16,6 +16,9 @@ class DocxIngestor(IngestorInterface):
 
         parse(cls, path: str) -> List[QuoteModel]:
             Parse the given DOCX file and return a list of QuoteModel objects.
+
+        cpu_bound(cls) -> bool:
+            Tell whether parsing is limited by the CPU rather than by I/O.
     """
 
     @classmethod
@@ -28,6 +31,15 @@ class DocxIngestor(IngestorInterface):
         """
         return path.endswith('.docx')
 
+    @classmethod
+    def cpu_bound(cls) -> bool:
+        """
+        Tell whether parsing is limited by the CPU rather than by I/O.
+
+        :return: True, since parsing the file happens in Python.
+        """
+        return True
+
     @classmethod
     def parse(cls, path: str) -> List[QuoteModel]:
         """
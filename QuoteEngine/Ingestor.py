@@ -1,13 +1,19 @@
 """A class for ingesting quotes from various file formats."""
 
-from typing import List
+import glob
+import importlib
+import logging
+import os
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Callable, Dict, Iterable, Iterator, List, Tuple, Type, Union
 from QuoteEngine.QuoteModel import QuoteModel
-from QuoteEngine.CSVIngestor import CSVIngestor
-from QuoteEngine.PDFIngestor import PDFIngestor
-from QuoteEngine.DocxIngestor import DocxIngestor
-from QuoteEngine.TextIngestor import TextIngestor
+from QuoteEngine.QuoteSnapshot import QuoteSnapshot
 from QuoteEngine.IngestorInterface import IngestorInterface
 
+logger = logging.getLogger(__name__)
+
 
 class Ingestor(IngestorInterface):
     """
@@ -16,9 +22,17 @@ class Ingestor(IngestorInterface):
     This class provides a common interface for ingesting quotes from multiple
     file formats, including CSV, PDF, DOCX, and TXT.
 
+    The ingestor for each format is imported the first time a file with that
+    extension is parsed, so heavy libraries such as pandas or python-docx are
+    only loaded by processes that actually read those formats.
+
+    Every file parsed through ``parse``, ``parse_many`` or ``parse_cached`` is
+    timed and counted per ingestor class, along with the files that failed; ``stats`` reports the totals. Files parsed on a process
+    pool are counted in the worker process that parsed them.
+
     Attributes:
-        ingestors (List[IngestorInterface]): A list of ingestor classes to
-            handle specific file formats.
+        ingestors (Dict[str, str]): Maps each supported file extension to the
+            dotted path of the ingestor class that handles it.
 
     Methods:
         can_ingest(cls, path: str) -> bool:
@@ -26,9 +40,36 @@ class Ingestor(IngestorInterface):
 
         parse(cls, path: str) -> List[QuoteModel]:
             Parse a file and extract quotes using the appropriate ingestor.
+
+        iter_parse(cls, path: str) -> Iterator[QuoteModel]:
+            Yield quotes from a file one at a time using the appropriate ingestor.
+
+        ingestor_for(cls, path: str) -> Type[IngestorInterface] | None:
+            Return the ingestor class for a file, importing it on first use.
+
+        parse_many(cls, paths_or_globs: Iterable[str], workers: int = None,
+                   progress: Callable = None) -> List[QuoteModel]:
+            Parse many files concurrently and merge their quotes.
+
+        parse_dir(cls, directory: str, workers: int = None, progress: Callable = None) -> List[QuoteModel]:
+            Parse every supported file under a directory.
+
+        parse_cached(cls, paths: Iterable[str], snapshot_path: str, workers: int = 1) -> List[QuoteModel]:
+            Parse several files, reusing a snapshot for files that did not change.
+
+        stats(cls) -> Dict[str, dict]:
+            Return the files, quotes, errors and parse time per ingestor class.
     """
 
-    ingestors = [CSVIngestor, DocxIngestor, PDFIngestor, TextIngestor]
+    ingestors = {
+        '.csv': 'QuoteEngine.CSVIngestor.CSVIngestor',
+        '.docx': 'QuoteEngine.DocxIngestor.DocxIngestor',
+        '.pdf': 'QuoteEngine.PDFIngestor.PDFIngestor',
+        '.txt': 'QuoteEngine.TextIngestor.TextIngestor',
+    }
+    _resolved = {}
+    _parse_stats = {}
+    _stats_lock = threading.Lock()
 
     @classmethod
     def can_ingest(cls, path: str) -> bool:
@@ -42,10 +83,7 @@ class Ingestor(IngestorInterface):
             bool: True if any of the ingestors can handle the file format;
                   False otherwise.
         """
-        for ingestor in cls.ingestors:
-            if ingestor.can_ingest(path):
-                return True
-        return False
+        return os.path.splitext(path)[1] in cls.ingestors
 
     @classmethod
     def parse(cls, path: str) -> List[QuoteModel]:
@@ -61,7 +99,301 @@ class Ingestor(IngestorInterface):
         Raises:
             Exception: If no supported ingestor is found for the file format.
         """
-        for ingestor in cls.ingestors:
-            if ingestor.can_ingest(path):
-                return ingestor.parse(path)
-        raise Exception("Unsupported file format")
+        ingestor = cls.ingestor_for(path)
+        if ingestor is None:
+            raise Exception("Unsupported file format")
+        start = time.perf_counter()
+        try:
+            quotes = ingestor.parse(path)
+        except Exception:
+            ingestor._count('errors')
+            cls._record_parse(ingestor, 0, time.perf_counter() - start)
+            raise
+        cls._record_parse(ingestor, len(quotes), time.perf_counter() - start)
+        return quotes
+
+    @classmethod
+    def iter_parse(cls, path: str) -> Iterator[QuoteModel]:
+        """
+        Yield quotes from a file one at a time using the appropriate ingestor.
+
+        Formats that support streaming, such as CSV, are read with constant
+        memory; the others are parsed in full and then yielded.
+
+        Args:
+            path (str): The file path of the file to parse.
+
+        Returns:
+            Iterator[QuoteModel]: An iterator of the parsed quotes.
+
+        Raises:
+            Exception: If no supported ingestor is found for the file format.
+        """
+        ingestor = cls.ingestor_for(path)
+        if ingestor is None:
+            raise Exception("Unsupported file format")
+        return ingestor.iter_parse(path)
+
+    @classmethod
+    def ingestor_for(cls, path: str) -> Union[Type[IngestorInterface], None]:
+        """
+        Return the ingestor class for a file, importing it on first use.
+
+        Args:
+            path (str): The file path to look up.
+
+        Returns:
+            Type[IngestorInterface] | None: The ingestor class, or None if the
+                file format is not supported.
+        """
+        extension = os.path.splitext(path)[1]
+        ingestor = cls._resolved.get(extension)
+        if ingestor is None:
+            target = cls.ingestors.get(extension)
+            if target is None:
+                return None
+            module_name, class_name = target.rsplit('.', 1)
+            ingestor = getattr(importlib.import_module(module_name), class_name)
+            cls._resolved[extension] = ingestor
+        return ingestor
+
+    @classmethod
+    def stats(cls) -> Dict[str, dict]:
+        """
+        Return the files, quotes, errors and parse time per ingestor class.
+
+        Only ingestors that have been imported are reported.
+
+        Returns:
+            Dict[str, dict]: Maps each ingestor class name to the files parsed,
+                quotes found, files that failed, and the total and longest
+                parse time in seconds.
+        """
+        with cls._stats_lock:
+            recorded = {name: tuple(entry) for name, entry in cls._parse_stats.items()}
+        report = {}
+        for ingestor in cls._resolved.values():
+            files, quotes, total, longest = recorded.get(ingestor.__name__, (0, 0, 0.0, 0.0))
+            report[ingestor.__name__] = {
+                'files': files,
+                'quotes': quotes,
+                'errors': ingestor.errors,
+                'parse_seconds_total': total,
+                'parse_seconds_max': longest,
+            }
+        return report
+
+    @classmethod
+    def _record_parse(cls, ingestor: Type[IngestorInterface], quotes: int, seconds: float):
+        """
+        Count one parsed file towards the stats of its ingestor.
+
+        Args:
+            ingestor (Type[IngestorInterface]): The ingestor class that parsed the file.
+            quotes (int): The number of quotes found.
+            seconds (float): The parse time.
+        """
+        with cls._stats_lock:
+            entry = cls._parse_stats.get(ingestor.__name__)
+            if entry is None:
+                entry = cls._parse_stats[ingestor.__name__] = [0, 0, 0.0, 0.0]
+            entry[0] += 1
+            entry[1] += quotes
+            entry[2] += seconds
+            if seconds > entry[3]:
+                entry[3] = seconds
+
+    @classmethod
+    def parse_many(cls, paths_or_globs: Iterable[str], workers: Union[int, None] = None,
+                   progress: Union[Callable[[str, int, float], None], None] = None) -> List[QuoteModel]:
+        """
+        Parse many files concurrently and merge their quotes.
+
+        Files whose ingestor is CPU-bound (such as DOCX and CSV) are parsed on
+        a process pool; the others are parsed on a thread pool. Directories are
+        searched recursively and glob patterns are expanded; only supported
+        files found that way are parsed.
+
+        Args:
+            paths_or_globs (Iterable[str]): File paths, directories or glob patterns.
+            workers (int | None): The number of workers per pool. Defaults to
+                the CPU count; 1 parses every file in the calling thread.
+            progress (Callable[[str, int, float], None] | None): Called after
+                each file with its path, number of quotes and parse time in seconds.
+
+        Returns:
+            List[QuoteModel]: The quotes from all files, in the order the files were given.
+
+        Raises:
+            Exception: If an explicitly named file has an unsupported format.
+        """
+        rows = [row or () for _, row in cls._parse_rows(cls._expand(paths_or_globs), workers, progress)]
+        return [QuoteModel(body, author) for file_rows in rows for body, author in file_rows]
+
+    @classmethod
+    def parse_dir(cls, directory: str, workers: Union[int, None] = None,
+                  progress: Union[Callable[[str, int, float], None], None] = None) -> List[QuoteModel]:
+        """
+        Parse every supported file under a directory.
+
+        Args:
+            directory (str): The directory to search recursively.
+            workers (int | None): The number of workers per pool.
+            progress (Callable[[str, int, float], None] | None): Called after each file.
+
+        Returns:
+            List[QuoteModel]: The quotes from all files, ordered by file path.
+        """
+        return cls.parse_many([directory], workers=workers, progress=progress)
+
+    @classmethod
+    def _expand(cls, paths_or_globs: Iterable[str]) -> List[str]:
+        """
+        Turn paths, directories and glob patterns into a list of files.
+
+        Args:
+            paths_or_globs (Iterable[str]): File paths, directories or glob patterns.
+
+        Returns:
+            List[str]: The files to parse, without duplicates.
+        """
+        paths = []
+        for entry in paths_or_globs:
+            if os.path.isdir(entry):
+                for root, dirnames, filenames in os.walk(entry):
+                    dirnames.sort()
+                    paths.extend(sorted(os.path.join(root, name) for name in filenames
+                                        if cls.can_ingest(name)))
+            elif glob.has_magic(entry):
+                paths.extend(path for path in sorted(glob.glob(entry, recursive=True))
+                             if os.path.isfile(path) and cls.can_ingest(path))
+            else:
+                paths.append(entry)
+        return list(dict.fromkeys(paths))
+
+    @classmethod
+    def _parse_rows(cls, paths: List[str], workers: Union[int, None],
+                    progress: Union[Callable[[str, int, float], None], None]) -> List[Tuple[str, tuple]]:
+        """
+        Parse files into (body, author) rows, on pools when there is more than one.
+
+        Args:
+            paths (List[str]): The files to parse.
+            workers (int | None): The number of workers per pool.
+            progress (Callable[[str, int, float], None] | None): Called after each file.
+
+        Returns:
+            List[Tuple[str, tuple]]: Each path with its rows, in the order of
+                ``paths``; the rows are None for a file that failed to parse.
+        """
+        for path in paths:
+            if not cls.can_ingest(path):
+                raise Exception("Unsupported file format")
+
+        workers = workers or os.cpu_count() or 1
+        results = []
+        if workers == 1 or len(paths) <= 1:
+            for path in paths:
+                results.append(_parse_rows_timed(path))
+                if progress is not None:
+                    progress(path, len(results[-1][1] or ()), results[-1][2])
+            return [(path, rows) for path, rows, _ in results]
+
+        with ProcessPoolExecutor(max_workers=workers) as processes, \
+                ThreadPoolExecutor(max_workers=workers) as threads:
+            futures = []
+            for path in paths:
+                executor = processes if cls.ingestor_for(path).cpu_bound() else threads
+                futures.append(executor.submit(_parse_rows_timed, path))
+            for future in futures:
+                path, rows, seconds = future.result()
+                if progress is not None:
+                    progress(path, len(rows or ()), seconds)
+                results.append((path, rows))
+        return results
+
+    @classmethod
+    def parse_cached(cls, paths: Iterable[str], snapshot_path: str,
+                     workers: Union[int, None] = 1) -> List[QuoteModel]:
+        """
+        Parse several files, reusing a snapshot for files that did not change.
+
+        Each source is identified by its absolute path, size and modification
+        time. Sources that match the snapshot are loaded from it; the others
+        are parsed (concurrently, if ``workers`` allows) and the snapshot is
+        rewritten with the new results. A file that fails to parse contributes
+        no quotes and is left out of the snapshot, so it is parsed again next
+        time instead of being remembered as empty.
+
+        Args:
+            paths (Iterable[str]): The file paths to parse.
+            snapshot_path (str): The path of the snapshot file.
+            workers (int | None): The number of workers used to parse changed
+                files, as for ``parse_many``. Defaults to parsing in the calling thread.
+
+        Returns:
+            List[QuoteModel]: The quotes from all files, in the order of ``paths``.
+
+        Raises:
+            Exception: If no supported ingestor is found for a file format.
+        """
+        snapshot = QuoteSnapshot(snapshot_path)
+        cached = snapshot.load()
+        sources = {key: entry for key, entry in cached.items() if os.path.exists(key)}
+        changed = len(sources) != len(cached)
+
+        paths = list(paths)
+        stats = {}
+        stale = []
+        for path in paths:
+            key = os.path.abspath(path)
+            stat = os.stat(path)
+            stats[key] = stat
+            entry = sources.get(key)
+            if entry is None or entry[0] != stat.st_size or entry[1] != stat.st_mtime_ns:
+                stale.append(path)
+
+        for path, rows in cls._parse_rows(stale, workers, None):
+            key = os.path.abspath(path)
+            if rows is None:
+                changed = sources.pop(key, None) is not None or changed
+                continue
+            sources[key] = (stats[key].st_size, stats[key].st_mtime_ns, rows)
+            changed = True
+
+        if changed:
+            snapshot.save(sources)
+        return [QuoteModel(body, author)
+                for path in paths
+                if os.path.abspath(path) in sources
+                for body, author in sources[os.path.abspath(path)][2]]
+
+
+def _parse_rows_timed(path: str) -> Tuple[str, Union[tuple, None], float]:
+    """
+    Parse a file into (body, author) rows and time it.
+
+    Rows are returned as plain tuples, which are cheaper to send back from a
+    worker process than QuoteModel objects. The file is read with the
+    ingestor's ``iter_parse``, which raises on failure instead of returning an
+    empty result, so a failed file can be told apart from an empty one. The
+    failure is logged and counted in the ingestor's ``errors``.
+
+    Args:
+        path (str): The file to parse.
+
+    Returns:
+        Tuple[str, tuple | None, float]: The path, its rows (None if parsing
+            failed) and the parse time in seconds.
+    """
+    ingestor = Ingestor.ingestor_for(path)
+    start = time.perf_counter()
+    try:
+        rows = tuple((quote.body, quote.author) for quote in ingestor.iter_parse(path))
+    except Exception as e:
+        ingestor._count('errors')
+        logger.error("Failed to parse %s: %s", path, e, extra={'ingestor': ingestor.__name__, 'path': path})
+        rows = None
+    seconds = time.perf_counter() - start
+    Ingestor._record_parse(ingestor, len(rows or ()), seconds)
+    return path, rows, seconds
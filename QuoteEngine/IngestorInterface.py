@@ -1,7 +1,8 @@
 """An abstract base class for ingesting different types of quote files."""
 
+import threading
 from abc import ABC, abstractmethod
-from typing import List
+from typing import Iterator, List
 from QuoteEngine.QuoteModel import QuoteModel
 
 
@@ -9,8 +10,12 @@ class IngestorInterface(ABC):
     """
     Abstract base class.
 
+    Ingestors run on thread pools, so their counters are updated through
+    ``_count``, which holds a lock shared by every ingestor class.
+
     Attributes:
-        None
+        errors (int): The number of files of this format that failed to
+            parse since the process started.
 
     Methods:
         can_ingest(cls, path: str) -> bool:
@@ -18,8 +23,17 @@ class IngestorInterface(ABC):
 
         parse(cls, path: str) -> List[QuoteModel]:
             Parse the given file and return a list of QuoteModel objects.
+
+        iter_parse(cls, path: str) -> Iterator[QuoteModel]:
+            Yield QuoteModel objects from the given file.
+
+        cpu_bound(cls) -> bool:
+            Tell whether parsing is limited by the CPU rather than by I/O.
     """
 
+    errors = 0
+    _counter_lock = threading.Lock()
+
     @classmethod
     def can_ingest(cls, path: str) -> bool:
         """
@@ -39,3 +53,39 @@ class IngestorInterface(ABC):
         :return: A list of QuoteModel objects parsed from the file.
         """
         pass
+
+    @classmethod
+    def iter_parse(cls, path: str) -> Iterator[QuoteModel]:
+        """
+        Yield QuoteModel objects from the given file.
+
+        Ingestors that can stream their input override this; the default
+        implementation yields the result of ``parse``.
+
+        :param path: The path to the file to be parsed.
+        :return: An iterator of QuoteModel objects.
+        """
+        yield from cls.parse(path)
+
+    @classmethod
+    def cpu_bound(cls) -> bool:
+        """
+        Tell whether parsing is limited by the CPU rather than by I/O.
+
+        Parallel ingestion runs CPU-bound ingestors on a process pool and the
+        others on a thread pool.
+
+        :return: True if parsing holds the GIL for most of its runtime.
+        """
+        return False
+
+    @classmethod
+    def _count(cls, counter: str, amount: int = 1):
+        """
+        Add to one of the class's counters under the shared lock.
+
+        :param counter: The name of the counter attribute, such as 'errors'.
+        :param amount: The number to add.
+        """
+        with IngestorInterface._counter_lock:
+            setattr(cls, counter, getattr(cls, counter) + amount)
@@ -1,26 +1,50 @@
 """A class for ingesting quotes from PDF files."""
 
-from typing import List
+import logging
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Iterable, Iterator, List
 from QuoteEngine.QuoteModel import QuoteModel
 from QuoteEngine.IngestorInterface import IngestorInterface
 import subprocess
-import tempfile
-import os
 import re
 
+logger = logging.getLogger(__name__)
+
 
 class PDFIngestor(IngestorInterface):
     """
     PDF files ingestor.
 
+    Text is extracted in-process with pypdf when it is installed. Otherwise
+    the ``pdftotext`` tool is run with its output piped straight back, without
+    a temporary file, and a non-zero exit status is reported as an error.
+
+    Attributes:
+        backend (str): 'auto' to prefer pypdf and fall back to pdftotext, or
+            'pypdf' / 'pdftotext' to force one of them.
+
     Methods:
         can_ingest(cls, path: str) -> bool:
             Check if the class can ingest the given PDF file.
 
         parse(cls, path: str) -> List[QuoteModel]:
             Parse the given PDF file and return a list of QuoteModel objects.
+
+        iter_parse(cls, path: str) -> Iterator[QuoteModel]:
+            Yield QuoteModel objects from the given PDF file.
+
+        parse_many(cls, paths: Iterable[str], workers: int = None) -> List[QuoteModel]:
+            Parse several PDF files concurrently.
+
+        extract_text(cls, path: str) -> str:
+            Return the text of the given PDF file.
+
+        cpu_bound(cls) -> bool:
+            Tell whether parsing is limited by the CPU rather than by I/O.
     """
 
+    backend = 'auto'
+
     @classmethod
     def can_ingest(cls, path: str) -> bool:
         """
@@ -37,24 +61,99 @@ class PDFIngestor(IngestorInterface):
         Parse the given PDF file and return a list of QuoteModel objects.
 
         :param path: The path to the PDF file to be parsed.
-        :return: A list of QuoteModel objects parsed from the PDF file.
+        :return: A list of QuoteModel objects parsed from the PDF file; empty if
+            the text could not be extracted, which is logged.
         """
         quotes = []
         try:
-            with tempfile.NamedTemporaryFile(suffix=".txt", delete=False) as temp_file:
-                subprocess.run(["pdftotext", "-layout", path, temp_file.name])
-                temp_file.seek(0)
-                pdf_text = temp_file.read().decode('utf-8')
-
-            lines = pdf_text.strip().split('\n')
-            for line in lines:
-                match = re.match(r'"([^"]*)" - ([^"]*)', line.strip())
-                if match:
-                    body = match.group(1)
-                    author = match.group(2)
-                    quote = QuoteModel(body, author)
-                    quotes.append(quote)
-            os.remove(temp_file.name)
+            quotes.extend(cls.iter_parse(path))
         except Exception as e:
-            print(f"Error: {e}")
+            cls._count('errors')
+            logger.error("Failed to parse %s: %s", path, e, extra={'ingestor': cls.__name__, 'path': path})
         return quotes
+
+    @classmethod
+    def iter_parse(cls, path: str) -> Iterator[QuoteModel]:
+        """
+        Yield QuoteModel objects from the given PDF file.
+
+        :param path: The path to the PDF file to be parsed.
+        :return: An iterator of QuoteModel objects.
+        :raises Exception: If the text cannot be extracted.
+        """
+        pdf_text = cls.extract_text(path)
+
+        lines = pdf_text.strip().split('\n')
+        for line in lines:
+            match = re.match(r'"([^"]*)" - ([^"]*)', line.strip())
+            if match:
+                body = match.group(1)
+                author = match.group(2)
+                yield QuoteModel(body, author)
+
+    @classmethod
+    def parse_many(cls, paths: Iterable[str], workers: int = None) -> List[QuoteModel]:
+        """
+        Parse several PDF files concurrently.
+
+        pdftotext runs outside the interpreter, so its files are parsed on a
+        thread pool; pypdf extraction holds the GIL, so it runs on a process pool.
+
+        :param paths: The paths to the PDF files to be parsed.
+        :param workers: The number of concurrent workers (defaults to the executor's choice).
+        :return: The quotes from all files, in the order of ``paths``.
+        """
+        executor_class = ProcessPoolExecutor if cls.cpu_bound() else ThreadPoolExecutor
+        quotes = []
+        with executor_class(max_workers=workers) as executor:
+            for file_quotes in executor.map(cls.parse, paths):
+                quotes.extend(file_quotes)
+        return quotes
+
+    @classmethod
+    def extract_text(cls, path: str) -> str:
+        """
+        Return the text of the given PDF file.
+
+        :param path: The path to the PDF file.
+        :return: The extracted text, one line of the document per line.
+        :raises RuntimeError: If pdftotext exits with a non-zero status.
+        """
+        if cls._use_pypdf():
+            import pypdf
+
+            reader = pypdf.PdfReader(path)
+            return '\n'.join(page.extract_text() for page in reader.pages)
+
+        result = subprocess.run(["pdftotext", "-layout", path, "-"], capture_output=True)
+        if result.returncode != 0:
+            raise RuntimeError(
+                f"pdftotext failed on {path} with status {result.returncode}: "
+                f"{result.stderr.decode('utf-8', 'replace').strip()}"
+            )
+        return result.stdout.decode('utf-8')
+
+    @classmethod
+    def cpu_bound(cls) -> bool:
+        """
+        Tell whether parsing is limited by the CPU rather than by I/O.
+
+        :return: True when pypdf extracts the text in-process, False when
+            the work happens in a pdftotext subprocess.
+        """
+        return cls._use_pypdf()
+
+    @classmethod
+    def _use_pypdf(cls) -> bool:
+        """
+        Decide whether text is extracted with pypdf.
+
+        :return: True for pypdf, False for the pdftotext subprocess.
+        """
+        if cls.backend != 'auto':
+            return cls.backend == 'pypdf'
+        try:
+            import pypdf  # noqa: F401
+        except ImportError:
+            return False
+        return True
@@ -0,0 +1,236 @@
+"""A compact, deduplicated, array-backed collection of quotes."""
+
+import random
+from array import array
+from typing import Iterable, Iterator, List, Union
+from QuoteEngine.QuoteIndex import QuoteIndex
+from QuoteEngine.QuoteModel import QuoteModel
+
+
+class QuoteCorpus:
+    """
+    Store many quotes in a few flat buffers instead of one object per quote.
+
+    All quote bodies are concatenated into one UTF-8 buffer, with an array of
+    offsets marking where each body starts. Authors are stored once in a table
+    and referenced by index. QuoteModel objects are only created when a quote
+    is accessed. Duplicate quotes are removed when the corpus is built.
+
+    When built with ``index=True``, the corpus also keeps an author index and
+    an inverted word index, so filtered lookups only touch matching quotes.
+
+    Attributes:
+        index (QuoteIndex | None): The author and word indexes, if built.
+
+    Methods:
+        from_quotes(cls, quotes: Iterable[QuoteModel], index: bool = True) -> QuoteCorpus:
+            Build a corpus from quotes, dropping duplicates.
+
+        __len__(self) -> int:
+            Return the number of quotes.
+
+        __getitem__(self, index: int) -> QuoteModel:
+            Return the quote at the given index.
+
+        __iter__(self) -> Iterator[QuoteModel]:
+            Iterate over the quotes in order.
+
+        find(self, author: str = None, contains: str = None) -> List[QuoteModel]:
+            Return the quotes matching every given filter.
+
+        random_choice(self, rng: random.Random = None, author: str = None,
+                      contains: str = None) -> QuoteModel:
+            Return a uniformly random quote, optionally among the matching ones.
+
+        authors(self) -> List[str]:
+            Return the distinct authors in the corpus.
+    """
+
+    def __init__(self, text: bytes, offsets: array, author_ids: array, authors: List[str],
+                 index: Union[QuoteIndex, None] = None):
+        """
+        Initialize a corpus from its buffers.
+
+        Use ``QuoteCorpus.from_quotes`` to build one from quotes.
+
+        Args:
+            text (bytes): The UTF-8 encoded bodies, concatenated.
+            offsets (array): The start of each body in ``text``, plus the end of the last one.
+            author_ids (array): The index into ``authors`` of each quote's author.
+            authors (List[str]): The distinct author names.
+            index (QuoteIndex | None): The author and word indexes, if built.
+        """
+        self._text = text
+        self._offsets = offsets
+        self._author_ids = author_ids
+        self._authors = authors
+        self.index = index
+
+    @classmethod
+    def from_quotes(cls, quotes: Iterable[QuoteModel], index: bool = True) -> 'QuoteCorpus':
+        """
+        Build a corpus from quotes, dropping duplicates.
+
+        The first occurrence of each (body, author) pair is kept, so the order
+        of the remaining quotes matches the input.
+
+        Args:
+            quotes (Iterable[QuoteModel]): The quotes to store.
+            index (bool): Whether to build the author and word indexes.
+
+        Returns:
+            QuoteCorpus: The new corpus.
+        """
+        seen = set()
+        chunks = []
+        offsets = array('Q', [0])
+        author_ids = array('I')
+        authors = []
+        author_index = {}
+        quote_index = QuoteIndex() if index else None
+        position = 0
+
+        for quote in quotes:
+            key = (quote.body, quote.author)
+            if key in seen:
+                continue
+            seen.add(key)
+
+            encoded = quote.body.encode('utf-8')
+            chunks.append(encoded)
+            position += len(encoded)
+            offsets.append(position)
+
+            author_id = author_index.get(quote.author)
+            if author_id is None:
+                author_id = author_index[quote.author] = len(authors)
+                authors.append(quote.author)
+            author_ids.append(author_id)
+
+            if quote_index is not None:
+                quote_index.add(len(author_ids) - 1, quote.body, quote.author)
+
+        return cls(b''.join(chunks), offsets, author_ids, authors, quote_index)
+
+    def __len__(self) -> int:
+        """
+        Return the number of quotes.
+
+        Returns:
+            int: The number of distinct quotes in the corpus.
+        """
+        return len(self._author_ids)
+
+    def __getitem__(self, index: int) -> QuoteModel:
+        """
+        Return the quote at the given index.
+
+        Args:
+            index (int): The position of the quote; negative values count from the end.
+
+        Returns:
+            QuoteModel: The quote.
+
+        Raises:
+            IndexError: If the index is out of range.
+        """
+        count = len(self._author_ids)
+        if index < 0:
+            index += count
+        if not 0 <= index < count:
+            raise IndexError('QuoteCorpus index out of range')
+        body = self._text[self._offsets[index]:self._offsets[index + 1]].decode('utf-8')
+        return QuoteModel(body, self._authors[self._author_ids[index]])
+
+    def __iter__(self) -> Iterator[QuoteModel]:
+        """
+        Iterate over the quotes in order.
+
+        Returns:
+            Iterator[QuoteModel]: An iterator of the quotes.
+        """
+        for index in range(len(self._author_ids)):
+            yield self[index]
+
+    def find(self, author: Union[str, None] = None,
+             contains: Union[str, None] = None) -> List[QuoteModel]:
+        """
+        Return the quotes matching every given filter.
+
+        Args:
+            author (str | None): The author the quotes must be by (case-insensitive).
+            contains (str | None): Words that must all appear in the quotes
+                (whole words, case-insensitive).
+
+        Returns:
+            List[QuoteModel]: The matching quotes in corpus order; every quote if no filter is given.
+        """
+        ids = self._matching_ids(author, contains)
+        if ids is None:
+            return list(self)
+        return [self[quote_id] for quote_id in ids]
+
+    def random_choice(self, rng: random.Random = None, author: Union[str, None] = None,
+                      contains: Union[str, None] = None) -> QuoteModel:
+        """
+        Return a uniformly random quote, optionally among the matching ones.
+
+        Without filters this takes constant time. With filters, candidates are
+        sampled from the index, which usually takes a handful of lookups.
+
+        Args:
+            rng (random.Random | None): The generator to use; the module-level one if omitted.
+            author (str | None): The author the quote must be by (case-insensitive).
+            contains (str | None): Words that must all appear in the quote.
+                Text without any words, such as ``"!"``, filters nothing, as in ``find``.
+
+        Returns:
+            QuoteModel: A random quote.
+
+        Raises:
+            IndexError: If no quote matches.
+        """
+        rng = rng or random
+        if contains and not QuoteIndex.tokenize(contains):
+            contains = None
+        if not author and not contains:
+            if not self._author_ids:
+                raise IndexError('Cannot choose from an empty QuoteCorpus')
+            return self[rng.randrange(len(self._author_ids))]
+
+        if self.index is not None:
+            quote_id = self.index.sample(rng, author=author, contains=contains)
+        else:
+            ids = self._matching_ids(author, contains)
+            quote_id = ids[rng.randrange(len(ids))] if ids else None
+        if quote_id is None:
+            raise IndexError('No quote matches the given filters')
+        return self[quote_id]
+
+    def _matching_ids(self, author: Union[str, None], contains: Union[str, None]):
+        """
+        Return the sorted ids of the matching quotes, or None if no filter is given.
+
+        Falls back to a linear scan when the corpus was built without indexes.
+        """
+        if not author and not contains:
+            return None
+        if self.index is not None:
+            return self.index.candidates(author=author, contains=contains)
+
+        words = set(QuoteIndex.tokenize(contains)) if contains else set()
+        author_key = author.casefold() if author else None
+        return [
+            quote_id for quote_id, quote in enumerate(self)
+            if (author_key is None or quote.author.casefold() == author_key)
+            and words.issubset(QuoteIndex.tokenize(quote.body))
+        ]
+
+    def authors(self) -> List[str]:
+        """
+        Return the distinct authors in the corpus.
+
+        Returns:
+            List[str]: The author names, in order of first appearance.
+        """
+        return list(self._authors)
@@ -0,0 +1,187 @@
+"""Author and word indexes over a quote corpus."""
+
+import random
+import re
+from array import array
+from bisect import bisect_left
+from typing import List, Sequence, Union
+
+_WORD = re.compile(r"\w+")
+
+
+class QuoteIndex:
+    """
+    Map authors and words to the ids of the quotes that contain them.
+
+    Both indexes are posting lists: sorted arrays of quote ids. A query
+    intersects the posting lists of its terms, starting from the shortest one,
+    so its cost depends on the most selective term rather than on the size of
+    the corpus. Authors are matched case-insensitively as a whole; words are
+    matched case-insensitively as whole words.
+
+    Attributes:
+        None
+
+    Methods:
+        add(self, quote_id: int, body: str, author: str):
+            Index a quote. Ids must be added in increasing order.
+
+        candidates(self, author: str = None, contains: str = None) -> Sequence[int] | None:
+            Return the sorted ids of the quotes matching every given filter.
+
+        sample(self, rng: random.Random, author: str = None, contains: str = None) -> int | None:
+            Return the id of a uniformly random quote matching every given filter.
+
+        tokenize(text: str) -> List[str]:
+            Split text into the lowercase words used by the index.
+    """
+
+    def __init__(self):
+        """Initialize empty indexes."""
+        self._authors = {}
+        self._words = {}
+
+    @staticmethod
+    def tokenize(text: str) -> List[str]:
+        """
+        Split text into the lowercase words used by the index.
+
+        Args:
+            text (str): The text to split.
+
+        Returns:
+            List[str]: The distinct words, in order of first appearance.
+        """
+        return list(dict.fromkeys(_WORD.findall(text.lower())))
+
+    def add(self, quote_id: int, body: str, author: str):
+        """
+        Index a quote. Ids must be added in increasing order.
+
+        Args:
+            quote_id (int): The position of the quote in the corpus.
+            body (str): The text of the quote.
+            author (str): The author of the quote.
+        """
+        key = author.casefold()
+        postings = self._authors.get(key)
+        if postings is None:
+            postings = self._authors[key] = array('I')
+        postings.append(quote_id)
+
+        for word in self.tokenize(body):
+            postings = self._words.get(word)
+            if postings is None:
+                postings = self._words[word] = array('I')
+            postings.append(quote_id)
+
+    def candidates(self, author: Union[str, None] = None,
+                   contains: Union[str, None] = None) -> Union[Sequence[int], None]:
+        """
+        Return the sorted ids of the quotes matching every given filter.
+
+        Args:
+            author (str | None): The author the quotes must be by.
+            contains (str | None): Words that must all appear in the quotes.
+
+        Returns:
+            Sequence[int] | None: The matching ids, or None if no filter was given.
+        """
+        postings = self._postings(author, contains)
+        if not postings:
+            return None
+        return _intersect(postings)
+
+    def sample(self, rng: random.Random, author: Union[str, None] = None,
+               contains: Union[str, None] = None, attempts: int = 32) -> Union[int, None]:
+        """
+        Return the id of a uniformly random quote matching every given filter.
+
+        Ids are drawn from the shortest posting list and checked against the
+        others, so the expected cost depends on the ratio between that list
+        and the matches rather than on the number of matches. If no match is
+        found after ``attempts`` draws, the posting lists are intersected.
+
+        Args:
+            rng (random.Random): The generator to draw from.
+            author (str | None): The author the quote must be by.
+            contains (str | None): Words that must all appear in the quote.
+            attempts (int): The number of draws before falling back to an intersection.
+
+        Returns:
+            int | None: A matching quote id, or None if no quote matches.
+
+        Raises:
+            ValueError: If no filter is given.
+        """
+        postings = self._postings(author, contains)
+        if not postings:
+            raise ValueError('sample() needs an author or contains filter')
+        postings.sort(key=len)
+        shortest, others = postings[0], postings[1:]
+        if not shortest:
+            return None
+
+        for _ in range(attempts if others else 1):
+            quote_id = shortest[rng.randrange(len(shortest))]
+            if all(_contains(other, quote_id) for other in others):
+                return quote_id
+
+        matches = _intersect(postings)
+        return matches[rng.randrange(len(matches))] if matches else None
+
+    def _postings(self, author: Union[str, None], contains: Union[str, None]) -> List[Sequence[int]]:
+        """
+        Return the posting list of every filter term.
+
+        Args:
+            author (str | None): The author filter.
+            contains (str | None): The words filter.
+
+        Returns:
+            List[Sequence[int]]: One sorted sequence of ids per term.
+        """
+        postings = []
+        if author:
+            postings.append(self._authors.get(author.casefold(), ()))
+        if contains:
+            for word in self.tokenize(contains):
+                postings.append(self._words.get(word, ()))
+        return postings
+
+
+def _intersect(postings: List[Sequence[int]]) -> Sequence[int]:
+    """
+    Intersect sorted posting lists.
+
+    Each id of the shortest list is looked up in the others by binary search,
+    so the cost is proportional to the shortest list, not the longest.
+
+    Args:
+        postings (List[Sequence[int]]): Sorted sequences of quote ids.
+
+    Returns:
+        Sequence[int]: The sorted ids present in every list.
+    """
+    postings = sorted(postings, key=len)
+    result = postings[0]
+    for other in postings[1:]:
+        if not result:
+            break
+        result = [quote_id for quote_id in result if _contains(other, quote_id)]
+    return result
+
+
+def _contains(postings: Sequence[int], quote_id: int) -> bool:
+    """
+    Check whether a sorted posting list contains an id.
+
+    Args:
+        postings (Sequence[int]): A sorted sequence of quote ids.
+        quote_id (int): The id to look for.
+
+    Returns:
+        bool: True if the id is in the list.
+    """
+    position = bisect_left(postings, quote_id)
+    return position < len(postings) and postings[position] == quote_id
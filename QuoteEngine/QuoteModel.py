@@ -1,10 +1,17 @@
 """This class encapsulates a quote's body."""
 
+import sys
+
 
 class QuoteModel:
     """
     Represents a quote with a body and an author.
 
+    Quotes are compared and hashed by value, so duplicates can be removed with
+    a set. Instances use ``__slots__`` instead of a per-instance ``__dict__``,
+    and author names are interned so every quote by the same author shares one
+    string.
+
     Attributes:
         body (str): The text of the quote.
         author (str): The author of the quote.
@@ -16,8 +23,16 @@ class QuoteModel:
         __str__(self) -> str:
             Return a string representation of the quote in the format:
             "{quote body}", {author}
+
+        __eq__(self, other) -> bool:
+            Compare two quotes by body and author.
+
+        __hash__(self) -> int:
+            Hash the quote by body and author.
     """
 
+    __slots__ = ('body', 'author')
+
     def __init__(self, body: str, author: str):
         """
         Initialize a QuoteModel object with a quote body and author.
@@ -27,7 +42,7 @@ class QuoteModel:
             author (str): The author of the quote.
         """
         self.body = body
-        self.author = author
+        self.author = sys.intern(author) if type(author) is str else author
 
     def __str__(self) -> str:
         """
@@ -37,3 +52,35 @@ class QuoteModel:
             str: A string in the format: "{quote body}", {author}
         """
         return f'"{self.body}", {self.author}'
+
+    def __repr__(self) -> str:
+        """
+        Return a developer-friendly representation of the quote.
+
+        Returns:
+            str: A string in the format: QuoteModel({body!r}, {author!r})
+        """
+        return f'QuoteModel({self.body!r}, {self.author!r})'
+
+    def __eq__(self, other) -> bool:
+        """
+        Compare two quotes by body and author.
+
+        Args:
+            other: The object to compare with.
+
+        Returns:
+            bool: True if both quotes have the same body and author.
+        """
+        if not isinstance(other, QuoteModel):
+            return NotImplemented
+        return self.body == other.body and self.author == other.author
+
+    def __hash__(self) -> int:
+        """
+        Hash the quote by body and author.
+
+        Returns:
+            int: The hash of the (body, author) pair.
+        """
+        return hash((self.body, self.author))
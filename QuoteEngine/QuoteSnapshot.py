@@ -0,0 +1,87 @@
+"""A compact binary snapshot of parsed quote files."""
+
+import importlib.util
+import marshal
+import os
+import tempfile
+from typing import Dict, Tuple
+
+SourceEntry = Tuple[int, int, Tuple[Tuple[str, str], ...]]
+
+
+class QuoteSnapshot:
+    """
+    Persist parsed quotes so later startups can skip parsing.
+
+    The snapshot maps each source file's absolute path to its size, its
+    modification time and the (body, author) pairs parsed from it. It is stored
+    with ``marshal``, which loads tuples of strings far faster than re-parsing
+    CSV, DOCX or PDF files. A snapshot written by another Python version or
+    snapshot format version is ignored.
+
+    Attributes:
+        FORMAT_VERSION (int): The version of the snapshot layout.
+
+    Methods:
+        __init__(self, path: str):
+            Initialize a snapshot stored at the given path.
+
+        load(self) -> Dict[str, SourceEntry]:
+            Return the cached sources, or an empty dict if there is no usable snapshot.
+
+        save(self, sources: Dict[str, SourceEntry]):
+            Atomically replace the snapshot with the given sources.
+
+    """
+
+    FORMAT_VERSION = 2
+
+    def __init__(self, path: str):
+        """
+        Initialize a snapshot stored at the given path.
+
+        :param path: The path of the snapshot file.
+        """
+        self._path = path
+
+    def load(self) -> Dict[str, SourceEntry]:
+        """
+        Return the cached sources, or an empty dict if there is no usable snapshot.
+
+        :return: A dict mapping absolute source paths to (size, mtime_ns, rows).
+        """
+        try:
+            with open(self._path, 'rb') as snapshot_file:
+                if snapshot_file.read(len(_header())) != _header():
+                    return {}
+                return marshal.load(snapshot_file)
+        except (OSError, EOFError, ValueError, TypeError):
+            return {}
+
+    def save(self, sources: Dict[str, SourceEntry]):
+        """
+        Atomically replace the snapshot with the given sources.
+
+        :param sources: A dict mapping absolute source paths to (size, mtime_ns, rows).
+        """
+        directory = os.path.dirname(self._path) or '.'
+        os.makedirs(directory, exist_ok=True)
+        fd, temp_path = tempfile.mkstemp(prefix='.tmp_', dir=directory)
+        try:
+            with os.fdopen(fd, 'wb') as snapshot_file:
+                snapshot_file.write(_header())
+                marshal.dump(sources, snapshot_file)
+            os.replace(temp_path, self._path)
+        except BaseException:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            raise
+
+
+def _header() -> bytes:
+    """
+    Return the bytes that identify a compatible snapshot.
+
+    :return: The format version followed by the interpreter's bytecode magic number.
+    """
+    return b'QSNP' + bytes([QuoteSnapshot.FORMAT_VERSION]) + importlib.util.MAGIC_NUMBER
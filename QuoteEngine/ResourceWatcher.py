@@ -0,0 +1,197 @@
+"""Polls files and directories for changes on a background thread."""
+
+import logging
+import os
+import threading
+import time
+from typing import Callable, Dict, Iterable, List, Tuple, Union
+
+Signature = Union[Tuple[int, int], None]
+
+logger = logging.getLogger(__name__)
+
+
+class ResourceWatcher:
+    """
+    Detect changed files by polling their modification times.
+
+    Polling works the same on every platform and needs no OS-specific
+    notification API. Each watched path is either a file or a directory; for a
+    directory, the files directly inside it are watched, so added and removed
+    files are reported too. When something changes, the callback receives the
+    changed file paths. The counters are updated under a lock, since
+    ``poll`` may be called while the polling thread runs.
+
+    Attributes:
+        DEFAULT_INTERVAL (float): The default number of seconds between polls.
+        reloads (int): The number of times the callback completed.
+        errors (int): The number of times the callback or a poll raised an exception.
+        last_reload_seconds (float | None): The duration of the last callback.
+        last_reload_at (float | None): The Unix time the last callback completed.
+
+    Methods:
+        __init__(self, paths: Iterable[str], callback: Callable[[List[str]], None], interval: float):
+            Initialize the watcher and record the current state of the paths.
+
+        poll(self) -> List[str]:
+            Check the paths once and return the files that changed.
+
+        running(self) -> bool:
+            Whether the polling thread is alive in this process.
+
+        start(self):
+            Start polling on a daemon thread.
+
+        stop(self):
+            Stop polling and wait for the thread to finish.
+
+        stats(self) -> dict:
+            Return the reload counters and timings.
+
+    """
+
+    DEFAULT_INTERVAL = 2.0
+
+    def __init__(self, paths: Iterable[str], callback: Callable[[List[str]], None],
+                 interval: float = DEFAULT_INTERVAL):
+        """
+        Initialize the watcher and record the current state of the paths.
+
+        Args:
+            paths (Iterable[str]): The files and directories to watch.
+            callback (Callable[[List[str]], None]): Called with the changed files.
+            interval (float): The number of seconds between polls.
+
+        """
+        self._paths = list(paths)
+        self._callback = callback
+        self._interval = interval
+        self._stop = threading.Event()
+        self._thread = None
+        self._state = self._scan()
+        self._lock = threading.Lock()
+        self.reloads = 0
+        self.errors = 0
+        self.last_reload_seconds = None
+        self.last_reload_at = None
+
+    def poll(self) -> List[str]:
+        """
+        Check the paths once and return the files that changed.
+
+        If any file changed, the callback is called before returning. An
+        exception raised by the callback is counted and the previous state is
+        kept, so the change is reported again on the next poll.
+
+        Returns:
+            List[str]: The files that were added, modified or removed.
+
+        """
+        state = self._scan()
+        changed = sorted(path for path in set(state) | set(self._state)
+                         if state.get(path) != self._state.get(path))
+        if not changed:
+            return changed
+
+        start = time.perf_counter()
+        try:
+            self._callback(changed)
+        except Exception as e:
+            with self._lock:
+                self.errors += 1
+            logger.exception("Reloading %d changed file(s) failed: %s", len(changed), e,
+                             extra={'changed': changed})
+            return changed
+        self._state = state
+        with self._lock:
+            self.reloads += 1
+            self.last_reload_seconds = time.perf_counter() - start
+            self.last_reload_at = time.time()
+        return changed
+
+    @property
+    def running(self) -> bool:
+        """
+        Whether the polling thread is alive in this process.
+
+        Threads do not survive a fork, so a watcher started before forking
+        reports False in the child and can be started again there.
+        """
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self):
+        """Start polling on a daemon thread."""
+        if self.running:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name='ResourceWatcher', daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """Stop polling and wait for the thread to finish."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def stats(self) -> dict:
+        """
+        Return the reload counters and timings.
+
+        Returns:
+            dict: The reloads, errors, last reload duration and time.
+
+        """
+        with self._lock:
+            return {
+                'reloads': self.reloads,
+                'errors': self.errors,
+                'last_reload_seconds': self.last_reload_seconds,
+                'last_reload_at': self.last_reload_at,
+            }
+
+    def _run(self):
+        """Poll until stopped, counting and logging any error instead of ending the thread."""
+        while not self._stop.wait(self._interval):
+            try:
+                self.poll()
+            except Exception as e:
+                with self._lock:
+                    self.errors += 1
+                logger.exception("Polling for changed files failed: %s", e)
+
+    def _scan(self) -> Dict[str, Signature]:
+        """
+        Record the size and modification time of every watched file.
+
+        A file that cannot be read, for example because it was removed while
+        the directory was listed, is recorded as missing, and the files of a
+        directory that cannot be listed are left out. Either way the file
+        counts as changed, and the next poll picks up its new state.
+
+        Returns:
+            Dict[str, Signature]: Maps each file to (mtime_ns, size), or None if it is missing.
+
+        """
+        state = {}
+        for path in self._paths:
+            if os.path.isdir(path):
+                try:
+                    entries = list(os.scandir(path))
+                except OSError:
+                    continue
+                for entry in entries:
+                    entry_path = os.path.join(path, entry.name)
+                    try:
+                        if entry.is_file():
+                            stat = entry.stat()
+                            state[entry_path] = (stat.st_mtime_ns, stat.st_size)
+                    except OSError:
+                        state[entry_path] = None
+            else:
+                try:
+                    stat = os.stat(path)
+                    state[path] = (stat.st_mtime_ns, stat.st_size)
+                except OSError:
+                    state[path] = None
+        return state
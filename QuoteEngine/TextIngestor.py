@@ -1,8 +1,11 @@
 """A class for ingesting quotes from text files."""
 
+import logging
 from QuoteEngine.QuoteModel import QuoteModel
 from QuoteEngine.IngestorInterface import IngestorInterface
-from typing import List
+from typing import Iterator, List
+
+logger = logging.getLogger(__name__)
 
 
 class TextIngestor(IngestorInterface):
@@ -21,6 +24,9 @@ class TextIngestor(IngestorInterface):
         parse(cls, path: str) -> List[QuoteModel]:
             Parse a text file and extract quotes as a list of QuoteModel objects.
 
+        iter_parse(cls, path: str) -> Iterator[QuoteModel]:
+            Yield quotes from a text file one line at a time.
+
     """
 
     @classmethod
@@ -46,19 +52,36 @@ class TextIngestor(IngestorInterface):
             path (str): The file path of the text file to parse.
 
         Returns:
-            List[QuoteModel]: A list of QuoteModel objects representing the parsed quotes.
+            List[QuoteModel]: A list of QuoteModel objects representing the parsed
+                quotes; empty if the file could not be read, which is logged.
         """
         quotes = []
         try:
-            with open(path, 'r', encoding='utf-8') as file:
-                lines = file.readlines()
-                for line in lines:
-                    parts = line.strip().split(' - ')
-                    if len(parts) == 2:
-                        body, author = parts
-                        quote = QuoteModel(body, author)
-                        quotes.append(quote)
+            quotes.extend(cls.iter_parse(path))
         except Exception as e:
-            print(f"Error: {e}")
+            cls._count('errors')
+            logger.error("Failed to parse %s: %s", path, e, extra={'ingestor': cls.__name__, 'path': path})
 
         return quotes
+
+    @classmethod
+    def iter_parse(cls, path: str) -> Iterator[QuoteModel]:
+        """
+        Yield quotes from a text file one line at a time.
+
+        Args:
+            path (str): The file path of the text file to parse.
+
+        Returns:
+            Iterator[QuoteModel]: An iterator of the parsed quotes.
+
+        Raises:
+            OSError: If the file cannot be read.
+            UnicodeDecodeError: If the file is not UTF-8.
+        """
+        with open(path, 'r', encoding='utf-8') as file:
+            for line in file:
+                parts = line.strip().split(' - ')
+                if len(parts) == 2:
+                    body, author = parts
+                    yield QuoteModel(body, author)
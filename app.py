@@ -18,15 +18,63 @@ Access the web application at http://localhost:5000/ in your web browser.
 
 Follow the instructions on the web page to create custom memes or generate random memes.
 
+By default, generated memes are kept in memory and served from /meme/<id>.<ext>.
+Set MEME_PERSIST=1 to write them to ./static instead. Memes are encoded as WebP
+for clients that accept it and as progressive JPEG otherwise, at quality
+MEME_QUALITY (default 75).
+
+Captions are white with a black outline by default. MEME_CAPTION_STYLE picks
+another default (outline, shadow, box or plain, the red text of earlier
+versions); the ?style= query parameter of / and the style field of the
+/create form choose one per meme.
+
+Quote files and images are polled for changes every MEME_RELOAD_INTERVAL
+seconds (default 2, 0 disables) and reloaded without a restart.
+
+Set MEME_ASYNC=1 to render memes created through POST /create on a bounded
+worker pool (MEME_RENDER_WORKERS, MEME_RENDER_QUEUE_SIZE); the response carries
+a job id to poll at /jobs/<id>.
+
+Random memes for / are served from pools of pre-rendered memes, one per
+encoding, refilled on a background thread: MEME_POOL_SIZE memes each (default
+8, 0 disables) at most MEME_POOL_REFILL_RATE memes per second (default 10, 0
+for no limit). /pool reports their hit ratios.
+
+/metrics reports, in the Prometheus text format, request latency histograms
+per route, the time spent in each rendering stage, the size of rendered memes,
+ingest times and errors per ingestor, cache hit rates, and the reload, render
+queue and pool counters. Each worker process of serve.py reports its own.
+
+Errors are logged to stderr at MEME_LOG_LEVEL (default WARNING); set
+MEME_LOG_FORMAT=json to write one JSON object per line, with structured
+fields such as the failing path as keys of their own. At INFO, every request
+is logged with its route, status and duration.
+
 """
 
+import functools
+import logging
 import random
 import os
-import requests
-from flask import Flask, render_template, abort, request
+import threading
+import time
+from typing import List, NamedTuple
+from flask import Flask, render_template, abort, request, url_for, redirect, jsonify, g
 
 from QuoteEngine.Ingestor import Ingestor
+from QuoteEngine.QuoteCorpus import QuoteCorpus
+from QuoteEngine.ResourceWatcher import ResourceWatcher
 from MemeGenerator.MemeGenerator import MemeGenerator
+from MemeGenerator.CaptionStyle import CaptionStyle
+from MemeGenerator.EncodeOptions import EncodeOptions
+from MemeGenerator.Histogram import Histogram
+from MemeGenerator.JsonLogFormatter import JsonLogFormatter
+from MemeGenerator.MemePool import MemePool
+from MemeGenerator.MemeStore import MemeStore
+from MemeGenerator.PrometheusWriter import PrometheusWriter
+from MemeGenerator.ImageFetcher import ImageFetcher, ImageFetchError
+from MemeGenerator.RemoteImageCache import RemoteImageCache
+from MemeGenerator.RenderQueue import RenderQueue, RenderJob, QueueFullError
 
 app = Flask(__name__)
 
@@ -39,72 +87,510 @@ QUOTE_FILES = [
     './_data/DogQuotes/DogQuotesTXT.txt',
 ]
 IMAGES_PATH = "./_data/photos/dog/"
+QUOTE_SNAPSHOT = "./tmp/quotes.snapshot"
+PERSIST_MEMES = os.environ.get('MEME_PERSIST', '0') == '1'
+REMOTE_CACHE_DIR = "./tmp/remote_images"
+REMOTE_CACHE_TTL = float(os.environ.get('MEME_REMOTE_TTL', RemoteImageCache.DEFAULT_TTL))
+MEME_MAX_AGE = 365 * 24 * 60 * 60
+MEME_QUALITY = int(os.environ.get('MEME_QUALITY', 75))
+JPEG_ENCODING = EncodeOptions('JPEG', quality=MEME_QUALITY, progressive=True, optimize=True)
+WEBP_ENCODING = EncodeOptions('WEBP', quality=MEME_QUALITY)
+CAPTION_STYLE_NAME = os.environ.get('MEME_CAPTION_STYLE', CaptionStyle.DEFAULT_PRESET).lower()
+CAPTION_STYLE = CaptionStyle.preset(CAPTION_STYLE_NAME)
+ASYNC_RENDER = os.environ.get('MEME_ASYNC', '0') == '1'
+RENDER_WORKERS = int(os.environ.get('MEME_RENDER_WORKERS', RenderQueue.DEFAULT_WORKERS))
+RENDER_QUEUE_SIZE = int(os.environ.get('MEME_RENDER_QUEUE_SIZE', RenderQueue.DEFAULT_MAX_PENDING))
+MAX_JOB_WAIT = 30.0
+RELOAD_INTERVAL = float(os.environ.get('MEME_RELOAD_INTERVAL', ResourceWatcher.DEFAULT_INTERVAL))
+POOL_SIZE = int(os.environ.get('MEME_POOL_SIZE', MemePool.DEFAULT_SIZE))
+POOL_REFILL_RATE = float(os.environ.get('MEME_POOL_REFILL_RATE', MemePool.DEFAULT_REFILL_RATE))
+LOG_LEVEL = os.environ.get('MEME_LOG_LEVEL', 'WARNING').upper()
+LOG_FORMAT = os.environ.get('MEME_LOG_FORMAT', 'text')
+OUTPUT_BYTES_BUCKETS = tuple(1024 * 2 ** power for power in range(3, 13))
+
+logger = logging.getLogger(__name__)
+
+
+def configure_logging():
+    """
+    Log to stderr at MEME_LOG_LEVEL, as JSON lines if MEME_LOG_FORMAT=json.
+
+    Nothing changes if logging was already configured, for example by Gunicorn
+    or by an application that imports this module.
+    """
+    handler = logging.StreamHandler()
+    if LOG_FORMAT == 'json':
+        handler.setFormatter(JsonLogFormatter())
+    else:
+        handler.setFormatter(logging.Formatter('%(asctime)s %(levelname)s %(name)s: %(message)s'))
+    logging.basicConfig(level=LOG_LEVEL, handlers=[handler])
+
+
+configure_logging()
+
+request_latency = Histogram()
+render_stages = Histogram()
+output_bytes = Histogram(OUTPUT_BYTES_BUCKETS)
+meme_store = MemeStore()
+meme = MemeGenerator(OUTPUT_DIR, FONT_PATH, memory_store=meme_store, encoding=JPEG_ENCODING,
+                     stage_hook=render_stages, caption_style=CAPTION_STYLE)
+image_fetcher = ImageFetcher()
+remote_images = RemoteImageCache(image_fetcher, REMOTE_CACHE_DIR, ttl=REMOTE_CACHE_TTL)
+render_queue = RenderQueue(workers=RENDER_WORKERS, max_pending=RENDER_QUEUE_SIZE)
+
+
+class Resources(NamedTuple):
+    """The quotes and images memes are drawn from, replaced as a whole on reload."""
+
+    quotes: QuoteCorpus
+    images: List[str]
+
+
+def load_quotes():
+    """Load the quote corpus, parsing only the files changed since the last snapshot."""
+    return QuoteCorpus.from_quotes(Ingestor.parse_cached(QUOTE_FILES, QUOTE_SNAPSHOT))
+
+
+def load_images():
+    """List the image files in the images directory."""
+    images = []
+
+    for filename in sorted(os.listdir(IMAGES_PATH)):
+        image_path = os.path.join(IMAGES_PATH, filename)
+        if os.path.isfile(image_path):
+            images.append(image_path)
 
-meme = MemeGenerator(OUTPUT_DIR, FONT_PATH)
+    return images
 
 
 def setup():
     """Load all resources."""
-    quotes_array = []
+    return Resources(load_quotes(), load_images())
+
+
+resources = setup()
+
+
+def warm_up():
+    """
+    Decode every base image into the image cache and compile the templates.
+
+    serve.py and gunicorn.conf.py call this in the parent process before
+    forking workers, so the workers share the decoded images and compiled
+    templates instead of each building their own.
+    """
+    for img in resources.images:
+        try:
+            meme.preload(img)
+        except (OSError, ValueError) as e:
+            logger.error("Preloading %s failed: %s", img, e, extra={'image': img})
+    for template in app.jinja_env.list_templates():
+        app.jinja_env.get_template(template)
+
+
+def reload_resources(changed):
+    """
+    Rebuild the resources affected by the changed files and swap them in.
+
+    The new corpus and image list are fully built before the module-level
+    ``resources`` is rebound, so a request always sees a complete, consistent
+    pair. Changed images need no extra work: cached images are keyed by their
+    modification time. The meme pools are emptied, since their memes were
+    drawn from the old resources.
+    """
+    global resources
+    quote_paths = {os.path.abspath(path) for path in QUOTE_FILES}
+    current = resources
+    quotes_array = current.quotes
+    if any(os.path.abspath(path) in quote_paths for path in changed):
+        quotes_array = load_quotes()
+    resources = Resources(quotes_array, load_images())
+    for pool in meme_pools.values():
+        pool.clear()
+
+
+watcher = ResourceWatcher(QUOTE_FILES + [IMAGES_PATH], reload_resources, interval=RELOAD_INTERVAL)
+_background_lock = threading.Lock()
+
+
+@app.before_request
+def start_background_threads():
+    """
+    Start watching the resources and filling the meme pools on the first request.
+
+    Starting lazily means the threads are created in the process that serves
+    requests, after any fork. Set MEME_RELOAD_INTERVAL=0 to disable reloading
+    and MEME_POOL_SIZE=0 to disable the pools.
+    """
+    watch = RELOAD_INTERVAL > 0
+    fill = POOL_SIZE > 0
+    if (not watch or watcher.running) and (not fill or all(pool.running for pool in meme_pools.values())):
+        return
+    with _background_lock:
+        if watch:
+            watcher.start()
+        if fill:
+            for pool in meme_pools.values():
+                pool.start()
+
+
+@app.before_request
+def start_request_timer():
+    """Note when handling the request started, for the latency histogram."""
+    g.request_start = time.perf_counter()
+
+
+@app.after_request
+def record_request(response):
+    """
+    Count the request in the latency histogram and log it at INFO.
+
+    Requests are grouped by their URL rule, such as ``/meme/<meme_id>.<extension>``,
+    rather than by path, so the number of series stays bounded.
+    """
+    start = g.get('request_start')
+    if start is None:
+        return response
+    seconds = time.perf_counter() - start
+    route = request.url_rule.rule if request.url_rule is not None else 'unmatched'
+    request_latency((route, request.method, response.status_code), seconds)
+    if logger.isEnabledFor(logging.INFO):
+        logger.info("%s %s %d", request.method, request.path, response.status_code,
+                    extra={'route': route, 'status': response.status_code,
+                           'duration_ms': round(seconds * 1000, 3)})
+    return response
+
+
+def negotiate_encoding():
+    """
+    Return WebP encoding if the client accepts it, otherwise JPEG.
+
+    WebP is only chosen when the Accept header lists ``image/webp`` itself;
+    wildcards such as ``*/*`` are sent by clients that cannot decode it too.
+    """
+    if any(value == 'image/webp' and quality > 0 for value, quality in request.accept_mimetypes):
+        return WEBP_ENCODING
+    return JPEG_ENCODING
+
+
+def requested_style(name):
+    """Return the caption style named in a request, None if none was named, or abort with 400."""
+    if not name:
+        return None
+    try:
+        return CaptionStyle.preset(name)
+    except ValueError:
+        abort(400, f"Unknown caption style, expected one of: {', '.join(CaptionStyle.PRESETS)}")
 
-    for file in QUOTE_FILES:
-        quotes_array.extend(Ingestor.parse(file))
 
-    images = []
+def render(img, body, author, encoding, caption_style=None):
+    """
+    Generate a meme and return where it was stored.
 
-    for filename in os.listdir(IMAGES_PATH):
-        image_path = os.path.join(IMAGES_PATH, filename)
-        if os.path.isfile(image_path):
-            images.append(image_path)
+    Returns the path of the written file if persistence is enabled, otherwise
+    the id and file extension of the meme in the in-memory store, or None if
+    rendering failed. The caption style defaults to MEME_CAPTION_STYLE.
+    """
+    if PERSIST_MEMES:
+        path = meme.make_meme(img, body, author, encoding=encoding, caption_style=caption_style)
+        if path is not None:
+            image_format = EncodeOptions.for_extension(os.path.splitext(path)[1][1:]) or encoding.format
+            output_bytes(image_format, os.path.getsize(path))
+        return path
+
+    rendered = meme.render_meme(img, body, author, encoding=encoding, caption_style=caption_style)
+    if rendered is None:
+        return None
+    output_bytes(rendered.encoding.format, len(rendered.data))
+    return rendered.meme_id, rendered.encoding.extension
+
+
+def meme_url(rendered):
+    """Return the absolute URL a meme returned by render() is served from."""
+    if rendered is None:
+        return None
+    if PERSIST_MEMES:
+        return url_for('static', filename=os.path.basename(rendered))
+    meme_id, extension = rendered
+    return url_for('meme_image', meme_id=meme_id, extension=extension)
+
+
+def create_meme(img, body, author, caption_style=None):
+    """
+    Generate a meme and return the URL it is served from.
 
-    return quotes_array, images
+    Memes are served from the in-memory store unless persistence is enabled,
+    in which case they are written to the output directory. Clients that
+    accept WebP get a WebP meme, others a JPEG.
+    """
+    return meme_url(render(img, body, author, negotiate_encoding(), caption_style))
 
 
-quotes, imgs = setup()
+def render_random(encoding):
+    """Generate a meme from a random image and quote, for the meme pools."""
+    current = resources
+    quote = current.quotes.random_choice()
+    return render(random.choice(current.images), quote.body, quote.author, encoding)
+
+
+def is_servable(rendered):
+    """Whether a meme returned by render() is still stored where its URL points."""
+    if PERSIST_MEMES:
+        return os.path.isfile(rendered)
+    return rendered[0] in meme_store
+
+
+meme_pools = {
+    encoding.format: MemePool(functools.partial(render_random, encoding), size=POOL_SIZE,
+                              refill_rate=POOL_REFILL_RATE, is_fresh=is_servable)
+    for encoding in (WEBP_ENCODING, JPEG_ENCODING)
+}
+
+
+def render_remote(image_url, body, author, encoding, caption_style=None):
+    """Download an image and generate a meme from it on a render worker."""
+    try:
+        rendered = render(remote_images.get(image_url), body, author, encoding, caption_style)
+    except Exception as e:
+        logger.error("Render job for %s failed: %s", image_url, e, extra={'image_url': image_url})
+        raise
+    if rendered is None:
+        raise RuntimeError("Rendering the meme failed")
+    return rendered
 
 
 @app.route('/')
 def meme_rand():
-    """Generate a random meme."""
-    img = random.choice(imgs)
-    quote = random.choice(quotes)
-    path = meme.make_meme(img, quote.body, quote.author)
-    return render_template('meme.html', path=path)
+    """
+    Generate a random meme.
+
+    The quote can be narrowed down with the optional ``author`` and ``q``
+    (words the quote must contain) query parameters, and ``style`` picks the
+    caption style. Without them, the meme comes from the pool for the
+    negotiated encoding when it has one ready.
+    """
+    author = request.args.get('author')
+    contains = request.args.get('q')
+    caption_style = requested_style(request.args.get('style'))
+    path = None
+    if POOL_SIZE > 0 and not author and not contains and caption_style in (None, CAPTION_STYLE):
+        path = meme_url(meme_pools[negotiate_encoding().format].take())
+
+    if path is None:
+        current = resources
+        img = random.choice(current.images)
+        try:
+            quote = current.quotes.random_choice(author=author, contains=contains)
+        except IndexError:
+            abort(404, "No quote matches the given filters")
+        path = create_meme(img, quote.body, quote.author, caption_style)
+    response = app.make_response(render_template('meme.html', path=path))
+    response.vary.add('Accept')
+    return response
+
+
+@app.route('/pool')
+def pool_stats():
+    """Report the size, fill level and hit ratio of each meme pool."""
+    return jsonify({image_format.lower(): pool.stats() for image_format, pool in meme_pools.items()})
+
+
+def collect_metrics():
+    """Return the metrics of this process in the Prometheus text format."""
+    writer = PrometheusWriter('meme')
+    writer.histogram('http_request_duration_seconds', "Time to handle a request, by route, method and status.",
+                     request_latency.stats(), ('route', 'method', 'status'))
+    writer.histogram('render_stage_duration_seconds', "Time spent in each stage of rendering a meme.",
+                     render_stages.stats(), ('stage',))
+    writer.histogram('output_bytes', "Size of the rendered memes, by image format.",
+                     output_bytes.stats(), ('format',))
+
+    for ingestor, stats in Ingestor.stats().items():
+        labels = {'ingestor': ingestor}
+        writer.add('ingest_files_total', 'counter', "Quote files parsed.", stats['files'], labels)
+        writer.add('ingest_quotes_total', 'counter', "Quotes read from the parsed files.", stats['quotes'], labels)
+        writer.add('ingest_errors_total', 'counter', "Quote files that failed to parse.", stats['errors'], labels)
+        writer.summary('ingest_duration_seconds', "Time to parse a quote file.",
+                       stats['files'], stats['parse_seconds_total'], labels)
+        writer.add('ingest_duration_seconds_max', 'gauge', "Longest time to parse a quote file.",
+                   stats['parse_seconds_max'], labels)
+
+    text_layout = meme.text_layout.stats()
+    fonts = meme.fonts.stats()
+    caches = {
+        'image': meme.image_cache.stats(),
+        'output': meme.output_cache.stats(),
+        'meme_store': meme_store.stats(),
+        'remote_image': remote_images.stats(),
+        'caption_mask': meme.caption_renderer.stats(),
+        'text_layout': {'hits': text_layout['hits'], 'misses': text_layout['measured'],
+                        'entries': text_layout['memos']},
+        'font': {'hits': fonts['hits'], 'misses': fonts['loads'], 'entries': fonts['faces']},
+    }
+    for cache, stats in caches.items():
+        labels = {'cache': cache}
+        lookups = stats['hits'] + stats['misses']
+        writer.add('cache_hits_total', 'counter', "Cache lookups answered from the cache.", stats['hits'], labels)
+        writer.add('cache_misses_total', 'counter', "Cache lookups that had to compute or fetch.",
+                   stats['misses'], labels)
+        writer.add('cache_hit_ratio', 'gauge', "Share of cache lookups that hit, since the process started.",
+                   stats['hits'] / lookups if lookups else None, labels)
+        writer.add('cache_evictions_total', 'counter', "Cache entries dropped to stay within budget.",
+                   stats.get('evictions'), labels)
+        writer.add('cache_entries', 'gauge', "Entries held by the cache.",
+                   stats.get('entries', stats.get('files')), labels)
+        writer.add('cache_bytes', 'gauge', "Bytes held by the cache.", stats.get('bytes'), labels)
+
+    current = resources
+    writer.add('quotes', 'gauge', "Quotes memes are drawn from.", len(current.quotes))
+    writer.add('images', 'gauge', "Images memes are drawn from.", len(current.images))
+
+    reloads = watcher.stats()
+    writer.add('reloads_total', 'counter', "Reloads of changed quote files and images.", reloads['reloads'])
+    writer.add('reload_errors_total', 'counter', "Reloads that failed.", reloads['errors'])
+    writer.add('last_reload_duration_seconds', 'gauge', "Time the last reload took.",
+               reloads['last_reload_seconds'])
+    writer.add('last_reload_timestamp_seconds', 'gauge', "Unix time the last reload completed.",
+               reloads['last_reload_at'])
+
+    queue = render_queue.stats()
+    writer.add('render_queue_depth', 'gauge', "Render jobs waiting for a worker.", queue['depth'])
+    writer.add('render_queue_running', 'gauge', "Render jobs being rendered.", queue['running'])
+    for outcome in ('submitted', 'rejected', 'completed', 'failed'):
+        writer.add('render_jobs_total', 'counter', "Render jobs, by outcome.", queue[outcome], {'outcome': outcome})
+    writer.add('render_queue_wait_seconds_total', 'counter', "Time render jobs spent waiting for a worker.",
+               queue['wait_seconds_total'])
+    writer.add('render_queue_run_seconds_total', 'counter', "Time render jobs spent rendering.",
+               queue['run_seconds_total'])
+
+    for image_format, pool in meme_pools.items():
+        stats = pool.stats()
+        labels = {'format': image_format.lower()}
+        writer.add('pool_ready', 'gauge', "Pre-rendered memes ready to serve.", stats['ready'], labels)
+        writer.add('pool_size', 'gauge', "Pre-rendered memes the pool keeps ready.", stats['size'], labels)
+        for outcome, key in (('hit', 'hits'), ('miss', 'misses'), ('stale', 'stale')):
+            writer.add('pool_takes_total', 'counter', "Requests for a pre-rendered meme, by outcome.",
+                       stats[key], dict(labels, outcome=outcome))
+        writer.add('pool_produced_total', 'counter', "Memes rendered into the pool.", stats['produced'], labels)
+        writer.add('pool_errors_total', 'counter', "Renders for the pool that failed.", stats['errors'], labels)
+    return writer.render()
+
+
+@app.route('/metrics')
+def metrics():
+    """Report request, render, ingest, cache, reload, queue and pool metrics for Prometheus."""
+    return app.response_class(collect_metrics(), content_type=PrometheusWriter.CONTENT_TYPE)
+
+
+@app.route('/meme/<meme_id>.<extension>')
+def meme_image(meme_id, extension):
+    """
+    Serve a generated meme from the in-memory store.
+
+    The meme is served under the MIME type of the format it was encoded in,
+    and only under that format's extension; any other extension is a 404.
+    A conditional request is answered with 304 only for a meme that is
+    still stored, so a client cannot revalidate an id the store never had.
+    """
+    image_format = EncodeOptions.for_extension(extension)
+    if image_format is None:
+        abort(404)
+
+    stored = meme_store.get(meme_id)
+    if stored is None or stored.image_format != image_format:
+        abort(404)
+
+    response = app.response_class(stored.data, mimetype=EncodeOptions(stored.image_format).mimetype)
+    response.set_etag(meme_id)
+    response.cache_control.public = True
+    response.cache_control.max_age = MEME_MAX_AGE
+    response.cache_control.immutable = True
+    return response.make_conditional(request)
 
 
 @app.route('/create', methods=['GET'])
 def meme_form():
     """User input for meme information."""
-    return render_template("meme_form.html")
+    return render_template("meme_form.html", styles=CaptionStyle.PRESETS, default_style=CAPTION_STYLE_NAME)
 
 
 @app.route('/create', methods=['POST'])
 def meme_post():
-    """Create a user-defined meme."""
-    image_url = request.form['image_url']
-    response = requests.get(image_url)
+    """
+    Create a user-defined meme.
 
-    if response.status_code != 200:
-        abort(400, "Failed to fetch the image from the provided URL")
+    With MEME_ASYNC=1 the meme is rendered by the render queue: the response
+    is 202 with the job id and the URL to poll, or 429 if the queue is full.
+    """
+    image_url = request.form['image_url']
+    caption_style = requested_style(request.form.get('style'))
 
-    temp_image_path = './temp_image.jpg'
+    if ASYNC_RENDER:
+        return submit_render_job(image_url, request.form['body'], request.form['author'], caption_style)
 
     try:
-        with open(temp_image_path, 'wb') as temp_image_file:
-            temp_image_file.write(response.content)
+        image_data = remote_images.get(image_url)
+    except ImageFetchError as e:
+        logger.warning("Fetching %s failed: %s", image_url, e, extra={'image_url': image_url})
+        abort(400, "Failed to fetch the image from the provided URL")
 
+    try:
         body = request.form['body']
         author = request.form['author']
-        path = meme.make_meme(temp_image_path, body, author)
+        path = create_meme(image_data, body, author, caption_style)
 
-        return render_template('meme.html', path=path)
+        response = app.make_response(render_template('meme.html', path=path))
+        response.vary.add('Accept')
+        return response
     except Exception as e:
-        print(f"Error: {e}")
+        logger.exception("Creating a meme from %s failed: %s", image_url, e, extra={'image_url': image_url})
         abort(500, "An error occurred while processing the image")
 
-    finally:
-        if os.path.exists(temp_image_path):
-            os.remove(temp_image_path)
+
+def submit_render_job(image_url, body, author, caption_style=None):
+    """Queue a render job and return the response pointing at its status."""
+    try:
+        job_id = render_queue.submit(render_remote, image_url, body, author, negotiate_encoding(), caption_style)
+    except QueueFullError as e:
+        logger.warning("Rejected a render job: %s", e, extra={'image_url': image_url})
+        response = jsonify(error="The render queue is full, try again later")
+        response.status_code = 429
+        response.headers['Retry-After'] = '1'
+        return response
+
+    status_url = url_for('job_status', job_id=job_id)
+    response = jsonify(job_id=job_id, status=RenderJob.QUEUED, status_url=status_url)
+    response.status_code = 202
+    response.headers['Location'] = status_url
+    return response
+
+
+@app.route('/jobs/<job_id>')
+def job_status(job_id):
+    """
+    Report the status of a render job.
+
+    A finished job redirects to its meme. Pass ``wait=<seconds>`` (at most
+    30) to long-poll until the job finishes instead of returning at once.
+    """
+    job = render_queue.get(job_id)
+    if job is None:
+        abort(404)
+
+    wait = request.args.get('wait', type=float)
+    if wait and not job.finished:
+        job.wait(min(wait, MAX_JOB_WAIT))
+
+    if job.status == RenderJob.DONE:
+        return redirect(meme_url(job.result), code=303)
+    if job.status == RenderJob.FAILED:
+        response = jsonify(job_id=job_id, status=job.status, error=str(job.error))
+        response.status_code = 400 if isinstance(job.error, ImageFetchError) else 500
+        return response
+
+    response = jsonify(job_id=job_id, status=job.status)
+    response.status_code = 202
+    return response
 
 
 if __name__ == "__main__":
@@ -0,0 +1 @@
+"""Benchmarks for the meme generator, runnable offline from the repository root."""
@@ -0,0 +1,244 @@
+"""
+Render benchmark harness.
+
+Drives the three layers of a meme request offline and reports throughput,
+p50/p95/p99 latency and the process's peak RSS per case as JSON, so runs can
+be saved and compared:
+
+- `make_meme`: `MemeGenerator.make_meme` on synthetic photos of several sizes
+  with captions of several lengths, with a cold and a warm image cache, plus
+  the mean time of each rendering stage.
+- `ingest`: Every `QuoteEngine` ingestor on the bundled quote files.
+- `routes`: The Flask routes through the test client. `POST /create` fetches
+  its image from a local HTTP server, so no network access is needed.
+
+Peak RSS is the high-water mark of the whole process, so it only grows from
+one case to the next. Run from the repository root:
+
+   ```bash
+   python -m bench --iterations 50 --output before.json
+   python -m bench --suite make_meme --sizes 640x480 4000x3000 --words 5 50
+   ```
+"""
+
+import argparse
+import functools
+import http.server
+import json
+import os
+import random
+import resource
+import sys
+import tempfile
+import threading
+import time
+
+from MemeGenerator.ImageCache import ImageCache
+from MemeGenerator.MemeGenerator import MemeGenerator
+from MemeGenerator.StageTimings import StageTimings
+from QuoteEngine.Ingestor import Ingestor
+from bench.layout import make_caption
+from bench.resize import parse_size, write_synthetic_jpeg
+
+FONT_PATH = './font/Arial.ttf'
+QUOTE_DIRECTORIES = ['./_data/DogQuotes', './_data/SimpleLines']
+IMAGES_DIRECTORY = './_data/photos/dog'
+
+
+def peak_rss_kb():
+    """
+    Return the peak resident set size of this process.
+
+    :return: The high-water mark in kilobytes.
+    """
+    try:
+        with open('/proc/self/status') as status:
+            for line in status:
+                if line.startswith('VmHWM:'):
+                    return int(line.split()[1])
+    except OSError:
+        pass
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak // 1024 if sys.platform == 'darwin' else peak
+
+
+def percentile(sorted_samples, fraction):
+    """
+    Return a nearest-rank percentile.
+
+    :param sorted_samples: The samples in ascending order.
+    :param fraction: The percentile as a fraction, e.g. 0.95.
+    :return: The sample at that rank.
+    """
+    rank = max(1, int(round(fraction * len(sorted_samples) + 0.5)))
+    return sorted_samples[min(rank, len(sorted_samples)) - 1]
+
+
+def measure(function, iterations):
+    """
+    Call a function repeatedly and summarize its latency.
+
+    :param function: Called with the iteration number.
+    :param iterations: The number of calls.
+    :return: A dict with the count, throughput, p50/p95/p99 and max in milliseconds, and peak RSS.
+    """
+    samples = []
+    start = time.perf_counter()
+    for iteration in range(iterations):
+        call_start = time.perf_counter()
+        function(iteration)
+        samples.append((time.perf_counter() - call_start) * 1000)
+    elapsed = time.perf_counter() - start
+
+    samples.sort()
+    return {
+        'count': iterations,
+        'ops_per_second': iterations / elapsed if elapsed else None,
+        'p50_ms': percentile(samples, 0.50),
+        'p95_ms': percentile(samples, 0.95),
+        'p99_ms': percentile(samples, 0.99),
+        'max_ms': samples[-1],
+        'peak_rss_kb': peak_rss_kb(),
+    }
+
+
+def bench_make_meme(iterations, sizes, word_counts):
+    """
+    Benchmark make_meme for each image size, caption length and cache state.
+
+    Every call uses a different seed, so the output cache never answers it.
+
+    :param iterations: The number of memes per case.
+    :param sizes: The (width, height) of the synthetic photos.
+    :param word_counts: The caption lengths in words.
+    :return: A dict of results keyed by case name.
+    """
+    rng = random.Random(0)
+    report = {}
+    with tempfile.TemporaryDirectory() as directory:
+        for width, height in sizes:
+            image_path = os.path.join(directory, f'{width}x{height}.jpg')
+            write_synthetic_jpeg(image_path, width, height)
+            for words in word_counts:
+                caption = make_caption(words, rng)
+                for cache in ('cold', 'warm'):
+                    timings = StageTimings()
+                    output_dir = tempfile.mkdtemp(dir=directory)
+                    image_cache = ImageCache(0) if cache == 'cold' else ImageCache()
+                    generator = MemeGenerator(output_dir, FONT_PATH, image_cache=image_cache,
+                                              stage_hook=timings)
+                    result = measure(lambda seed: generator.make_meme(image_path, caption, 'Author', seed=seed),
+                                     iterations)
+                    result['stages_mean_ms'] = {stage: values['mean_seconds'] * 1000
+                                                for stage, values in timings.stats().items()}
+                    report[f'{width}x{height}/{words}_words/{cache}'] = result
+    return report
+
+
+def bench_ingest(iterations):
+    """
+    Benchmark each ingestor on the bundled quote files.
+
+    :param iterations: The number of parses per file.
+    :return: A dict of results keyed by ingestor and file name.
+    """
+    report = {}
+    for directory in QUOTE_DIRECTORIES:
+        for name in sorted(os.listdir(directory)):
+            path = os.path.join(directory, name)
+            ingestor = Ingestor.ingestor_for(path)
+            if ingestor is None:
+                continue
+            result = measure(lambda _: ingestor.parse(path), iterations)
+            result['quotes'] = len(ingestor.parse(path))
+            report[f'{ingestor.__name__}/{name}'] = result
+    return report
+
+
+class _QuietHandler(http.server.SimpleHTTPRequestHandler):
+    """Serve files without logging every request."""
+
+    def log_message(self, format, *args):
+        """Discard the request log."""
+
+
+def bench_routes(iterations):
+    """
+    Benchmark the Flask routes through the test client.
+
+    :param iterations: The number of requests per route.
+    :return: A dict of results keyed by route.
+    """
+    os.environ.setdefault('MEME_RELOAD_INTERVAL', '0')
+    import app as web_app
+
+    handler = functools.partial(_QuietHandler, directory=IMAGES_DIRECTORY)
+    server = http.server.ThreadingHTTPServer(('127.0.0.1', 0), handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    image_url = f'http://127.0.0.1:{server.server_address[1]}/{sorted(os.listdir(IMAGES_DIRECTORY))[0]}'
+
+    client = web_app.app.test_client()
+    rendered = web_app.render(web_app.resources.images[0], 'Benchmark', 'Author', web_app.JPEG_ENCODING)
+    meme_path = web_app.meme_url(rendered) if web_app.PERSIST_MEMES else \
+        f'/meme/{rendered[0]}.{rendered[1]}'
+
+    def post_create(iteration):
+        client.post('/create', data={'image_url': image_url, 'body': f'Quote {iteration}', 'author': 'Author'})
+
+    routes = {
+        'GET /': lambda _: client.get('/'),
+        'GET /?q=dog': lambda _: client.get('/?q=dog'),
+        'GET /meme/<id>': lambda _: client.get(meme_path),
+        'GET /create': lambda _: client.get('/create'),
+        'POST /create': post_create,
+    }
+    try:
+        with web_app.app.app_context():
+            return {route: measure(function, iterations) for route, function in routes.items()}
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def run(suites, iterations, sizes, word_counts):
+    """
+    Run the selected benchmark suites.
+
+    :param suites: The suite names to run.
+    :param iterations: The number of calls per case.
+    :param sizes: The photo sizes for the make_meme suite.
+    :param word_counts: The caption lengths for the make_meme suite.
+    :return: A dict with the environment and the results of each suite.
+    """
+    report = {
+        'python': sys.version.split()[0],
+        'iterations': iterations,
+    }
+    if 'make_meme' in suites:
+        report['make_meme'] = bench_make_meme(iterations, sizes, word_counts)
+    if 'ingest' in suites:
+        report['ingest'] = bench_ingest(iterations)
+    if 'routes' in suites:
+        report['routes'] = bench_routes(iterations)
+    report['peak_rss_kb'] = peak_rss_kb()
+    return report
+
+
+SUITES = ('make_meme', 'ingest', 'routes')
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(prog='python -m bench', description="Benchmark meme rendering end to end.")
+    parser.add_argument("--suite", choices=SUITES, action='append', help="Only run the given suite (repeatable)")
+    parser.add_argument("--iterations", type=int, default=20, help="Calls per case")
+    parser.add_argument("--sizes", type=parse_size, nargs='+', default=[(640, 480), (1600, 1200), (4000, 3000)],
+                        help="Photo sizes for make_meme as WIDTHxHEIGHT")
+    parser.add_argument("--words", type=int, nargs='+', default=[5, 20, 60],
+                        help="Caption lengths in words for make_meme")
+    parser.add_argument("--output", type=str, help="Also write the JSON report to this file")
+    args = parser.parse_args()
+
+    output = json.dumps(run(args.suite or SUITES, args.iterations, args.sizes, args.words), indent=2)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as output_file:
+            output_file.write(output + '\n')
+    print(output)
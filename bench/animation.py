@@ -0,0 +1,185 @@
+"""
+Animated meme benchmark.
+
+Captions a synthetic 200-frame GIF and compares two pipelines for GIF and
+WebP output:
+
+- `streamed`: `MemeGenerator.render_meme`, which renders the caption once and
+  decodes, captions and encodes the frames one at a time.
+- `eager`: Decode and resize every frame into a list, draw the caption on each
+  frame, then save them all with Pillow's `save_all`.
+
+Each case runs in a fresh interpreter, which reports the median milliseconds
+per animation and the growth of its peak RSS, because Pillow's pixel buffers
+are invisible to tracemalloc. Run from the repository root:
+
+   ```bash
+   python -m bench.animation --frames 200 --size 640x480
+   ```
+"""
+
+import argparse
+import io
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+from PIL import Image, ImageDraw, ImageSequence
+
+from MemeGenerator.CaptionStyle import CaptionStyle
+from MemeGenerator.EncodeOptions import EncodeOptions
+from MemeGenerator.MemeGenerator import MemeGenerator, _resize_image
+from bench.resize import parse_size
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+FONT_PATH = './font/Arial.ttf'
+CAPTION = 'When the animation has two hundred frames but the caption is only drawn once'
+STYLE = CaptionStyle(fill='#ffffff', outline_width=2, shadow_offset=(2, 2))
+PIPELINES = ('streamed', 'eager')
+FORMATS = ('GIF', 'WEBP')
+
+CHILD_TEMPLATE = """
+from bench.animation import measure_in_process
+measure_in_process({path!r}, {pipeline!r}, {image_format!r}, {runs})
+"""
+
+
+def write_synthetic_gif(path, frames, width, height):
+    """
+    Write an animated GIF of a ball moving over a noisy background.
+
+    :param path: The path of the file to write.
+    :param frames: The number of frames.
+    :param width: The width in pixels.
+    :param height: The height in pixels.
+    """
+    background = Image.merge('RGB', (Image.linear_gradient('L').resize((width, height)),
+                                     Image.effect_noise((width, height), 16),
+                                     Image.linear_gradient('L').rotate(90).resize((width, height))))
+    radius = height // 8
+
+    def frame_at(index):
+        frame = background.copy()
+        x = (index * 7) % (width - 2 * radius)
+        y = height // 2 - radius + (index * 3) % radius
+        ImageDraw.Draw(frame).ellipse((x, y, x + 2 * radius, y + 2 * radius), fill=(240, 200, 40))
+        return frame
+
+    first = frame_at(0)
+    first.save(path, format='GIF', save_all=True, append_images=(frame_at(i) for i in range(1, frames)),
+               duration=[40 + 10 * (i % 3) for i in range(frames)], loop=0)
+
+
+def render_streamed(data, image_format):
+    """
+    Caption an animation with MemeGenerator.
+
+    :param data: The encoded source animation.
+    :param image_format: The output format, GIF or WEBP.
+    :return: The encoded meme.
+    """
+    with tempfile.TemporaryDirectory() as directory:
+        generator = MemeGenerator(directory, FONT_PATH, caption_style=STYLE)
+        return generator.render_meme(data, CAPTION, 'Author', encoding=EncodeOptions(image_format)).data
+
+
+def render_eager(data, image_format):
+    """
+    Caption an animation by decoding every frame and drawing each caption.
+
+    :param data: The encoded source animation.
+    :param image_format: The output format, GIF or WEBP.
+    :return: The encoded meme.
+    """
+    generator = MemeGenerator(tempfile.gettempdir(), FONT_PATH, caption_style=STYLE)
+    with Image.open(io.BytesIO(data)) as img:
+        frames = []
+        durations = []
+        for frame in ImageSequence.Iterator(img):
+            frames.append(_resize_image(frame.convert('RGB'), 500, generator.resize))
+            durations.append(frame.info.get('duration', 100))
+
+    layout, position = generator._place_caption(frames[0].size, CAPTION, 'Author', 0, '')
+    frames = [generator.caption_renderer.draw(frame, layout, FONT_PATH, position, STYLE) for frame in frames]
+    buffer = io.BytesIO()
+    frames[0].save(buffer, format=image_format, save_all=True, append_images=frames[1:],
+                   duration=durations, loop=0)
+    return buffer.getvalue()
+
+
+def peak_kb():
+    """
+    Return the peak resident set size of this process.
+
+    :return: The high-water mark in kilobytes.
+    """
+    with open('/proc/self/status') as status:
+        for line in status:
+            if line.startswith('VmHWM:'):
+                return int(line.split()[1])
+    return 0
+
+
+def measure_in_process(path, pipeline, image_format, runs):
+    """
+    Time a pipeline and print its results as JSON; run in a fresh interpreter.
+
+    :param path: The path of the source animation.
+    :param pipeline: ``streamed`` or ``eager``.
+    :param image_format: The output format, GIF or WEBP.
+    :param runs: The number of timed runs.
+    """
+    render = render_streamed if pipeline == 'streamed' else render_eager
+    with open(path, 'rb') as image_file:
+        data = image_file.read()
+    before = peak_kb()
+    samples = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        output = render(data, image_format)
+        samples.append((time.perf_counter() - start) * 1000)
+    print(json.dumps({
+        'ms_per_animation': statistics.median(samples),
+        'peak_rss_growth_kb': peak_kb() - before,
+        'output_bytes': len(output),
+    }))
+
+
+def run(frames=200, size=(640, 480), runs=3, formats=FORMATS):
+    """
+    Benchmark each pipeline for each output format.
+
+    :param frames: The number of frames of the source animation.
+    :param size: The (width, height) of the source animation.
+    :param runs: The number of timed runs per case.
+    :param formats: The output formats.
+    :return: A dict of results keyed by format and pipeline.
+    """
+    report = {}
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'source.gif')
+        write_synthetic_gif(path, frames, *size)
+        report['source'] = {'frames': frames, 'size': f'{size[0]}x{size[1]}', 'bytes': os.path.getsize(path)}
+        for image_format in formats:
+            report[image_format] = {}
+            for pipeline in PIPELINES:
+                code = CHILD_TEMPLATE.format(path=path, pipeline=pipeline, image_format=image_format, runs=runs)
+                output = subprocess.run([sys.executable, '-c', code], cwd=REPO_ROOT,
+                                        capture_output=True, text=True, check=True).stdout
+                report[image_format][pipeline] = json.loads(output)
+    return report
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compare streamed and eager animated meme rendering.")
+    parser.add_argument("--frames", type=int, default=200, help="Frames in the source animation")
+    parser.add_argument("--size", type=parse_size, default=(640, 480), help="Source size as WIDTHxHEIGHT")
+    parser.add_argument("--runs", type=int, default=3, help="Timed runs per case")
+    parser.add_argument("--format", type=str.upper, choices=FORMATS, action='append',
+                        help="Only run the given output format (repeatable)")
+    args = parser.parse_args()
+    print(json.dumps(run(args.frames, args.size, args.runs, args.format or FORMATS), indent=2))
@@ -0,0 +1,104 @@
+"""
+Caption effects benchmark.
+
+Measures the time `CaptionRenderer.draw` takes to paint one caption on a
+500-pixel-wide meme in the plain style and with each effect, with a cold
+mask cache (a new caption every time) and a warm one (the caption was drawn
+before). The plain style is the previous `draw.text` path. Run from the
+repository root:
+
+   ```bash
+   python -m bench.caption_effects --words 8 30
+   ```
+"""
+
+import argparse
+import json
+import os
+import random
+import statistics
+import time
+
+from PIL import Image
+
+from MemeGenerator.CaptionRenderer import CaptionRenderer
+from MemeGenerator.CaptionStyle import CaptionStyle
+from MemeGenerator.MemeGenerator import MemeGenerator
+from MemeGenerator.TextLayout import TextLayout
+from bench.layout import make_caption
+
+FONT_PATH = './font/Arial.ttf'
+IMAGES_DIRECTORY = './_data/photos/dog'
+
+STYLES = {
+    'plain': CaptionStyle(),
+    'outline': CaptionStyle(fill='#ffffff', outline_width=2),
+    'shadow': CaptionStyle(fill='#ffffff', shadow_offset=(3, 3)),
+    'box': CaptionStyle(fill='#ffffff', box_opacity=0.4),
+    'outline_shadow_box': CaptionStyle(fill='#ffffff', outline_width=2, shadow_offset=(3, 3), box_opacity=0.4),
+}
+
+
+def time_draw(renderer, base, layout, style, runs, fresh_renderer):
+    """
+    Time painting a caption onto copies of a base image.
+
+    :param renderer: The CaptionRenderer to use.
+    :param base: The image to paint on; each run paints on a copy.
+    :param layout: The laid out caption.
+    :param style: The CaptionStyle.
+    :param runs: The number of timed runs.
+    :param fresh_renderer: Use a new renderer per run, so the mask cache is always cold.
+    :return: The median milliseconds per caption.
+    """
+    samples = []
+    for _ in range(runs):
+        img = base.copy()
+        if fresh_renderer:
+            renderer = CaptionRenderer(renderer._fonts)
+        start = time.perf_counter()
+        renderer.draw(img, layout, FONT_PATH, (MemeGenerator.CAPTION_MARGIN,) * 2, style)
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples)
+
+
+def run(word_counts, runs=20, width=500, styles=None):
+    """
+    Benchmark each caption style for each caption length.
+
+    :param word_counts: The caption lengths in words.
+    :param runs: The number of timed runs per case.
+    :param width: The meme width.
+    :param styles: The style names to run, or None for all.
+    :return: A dict of results keyed by caption length and style.
+    """
+    image_path = os.path.join(IMAGES_DIRECTORY, sorted(os.listdir(IMAGES_DIRECTORY))[0])
+    with Image.open(image_path) as img:
+        base = img.convert('RGB').resize((width, int(img.height * width / img.width)))
+
+    rng = random.Random(0)
+    text_layout = TextLayout()
+    renderer = CaptionRenderer()
+    report = {}
+    for words in word_counts:
+        layout = text_layout.layout(FONT_PATH, make_caption(words, rng), width - 2 * MemeGenerator.CAPTION_MARGIN,
+                                    base.height // 3, MemeGenerator.MIN_FONT_SIZE, MemeGenerator.MAX_FONT_SIZE)
+        report[words] = {}
+        for name in styles or STYLES:
+            style = STYLES[name]
+            report[words][name] = {
+                'ms_cold': time_draw(renderer, base, layout, style, runs, fresh_renderer=True),
+                'ms_warm': time_draw(renderer, base, layout, style, runs, fresh_renderer=False),
+            }
+    return report
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compare caption effect styles.")
+    parser.add_argument("--words", type=int, nargs='+', default=[8, 30], help="Caption lengths in words")
+    parser.add_argument("--runs", type=int, default=20, help="Timed runs per case")
+    parser.add_argument("--width", type=int, default=500, help="Meme width")
+    parser.add_argument("--style", choices=sorted(STYLES), action='append',
+                        help="Only run the given style (repeatable)")
+    args = parser.parse_args()
+    print(json.dumps(run(args.words, args.runs, args.width, args.style), indent=2))
@@ -0,0 +1,124 @@
+"""
+CSV ingestion benchmark.
+
+Compares the streaming `CSVIngestor` with the pandas DataFrame + `iterrows`
+path it replaced, on synthetic quote files of increasing size. Time and peak
+traced memory are measured in separate passes, so tracing does not skew the
+timings. Run from the repository root:
+
+   ```bash
+   python -m bench.csv_ingest --rows 10000 100000 1000000
+   ```
+"""
+
+import argparse
+import csv
+import json
+import os
+import tempfile
+import time
+import tracemalloc
+
+from QuoteEngine.CSVIngestor import CSVIngestor
+from QuoteEngine.QuoteModel import QuoteModel
+
+
+def write_synthetic_csv(path, rows):
+    """
+    Write a quote CSV file with the given number of rows.
+
+    :param path: The path of the file to write.
+    :param rows: The number of quotes to write.
+    """
+    with open(path, 'w', encoding='utf-8', newline='') as file:
+        writer = csv.writer(file)
+        writer.writerow(['body', 'author'])
+        for index in range(rows):
+            writer.writerow([f'Quote number {index}, about treats and walks', f'Author {index % 997}'])
+
+
+def dataframe_parse(path):
+    """
+    Parse a CSV file the way CSVIngestor did before streaming was added.
+
+    :param path: The path to the CSV file.
+    :return: A list of QuoteModel objects.
+    """
+    import pandas as pd
+
+    quotes = []
+    df = pd.read_csv(path)
+    for index, row in df.iterrows():
+        quotes.append(QuoteModel(row['body'], row['author']))
+    return quotes
+
+
+def streaming_count(path):
+    """
+    Consume CSVIngestor.iter_parse without keeping the quotes.
+
+    :param path: The path to the CSV file.
+    :return: The number of quotes read.
+    """
+    return sum(1 for _ in CSVIngestor.iter_parse(path))
+
+
+STRATEGIES = {
+    'dataframe_iterrows': dataframe_parse,
+    'csv_parse_list': CSVIngestor.parse,
+    'csv_iter_parse': streaming_count,
+}
+
+
+def measure(function, path):
+    """
+    Time a parse function and measure its peak traced memory.
+
+    :param function: The parse function to call with the path.
+    :param path: The path to the CSV file.
+    :return: A dict with the seconds and peak traced bytes.
+    """
+    start = time.perf_counter()
+    function(path)
+    seconds = time.perf_counter() - start
+
+    tracemalloc.start()
+    function(path)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {'seconds': seconds, 'peak_bytes': peak}
+
+
+def run(row_counts, strategies=None):
+    """
+    Benchmark each strategy on synthetic files of the given sizes.
+
+    :param row_counts: The numbers of rows to generate.
+    :param strategies: The strategy names to run, or None for all.
+    :return: A dict of results keyed by row count and strategy.
+    """
+    strategies = strategies or list(STRATEGIES)
+    if 'dataframe_iterrows' in strategies:
+        import pandas  # noqa: F401 -- keep the import cost out of the timings
+
+    report = {}
+    with tempfile.TemporaryDirectory() as directory:
+        for rows in row_counts:
+            path = os.path.join(directory, f'quotes_{rows}.csv')
+            write_synthetic_csv(path, rows)
+            report[rows] = {}
+            for name in strategies:
+                result = measure(STRATEGIES[name], path)
+                result['rows_per_second'] = rows / result['seconds'] if result['seconds'] else None
+                report[rows][name] = result
+    return report
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compare CSV ingestion strategies.")
+    parser.add_argument("--rows", type=int, nargs='+', default=[10000, 100000],
+                        help="Row counts of the synthetic files")
+    parser.add_argument("--strategy", choices=sorted(STRATEGIES), action='append',
+                        help="Only run the given strategy (repeatable)")
+    args = parser.parse_args()
+    print(json.dumps(run(args.rows, args.strategy), indent=2))
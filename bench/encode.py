@@ -0,0 +1,112 @@
+"""
+Output encoding benchmark.
+
+Renders a meme from each sample photo once, then encodes it with a range of
+`EncodeOptions` settings and reports the average encoded size and encode time
+per setting. Run from the repository root:
+
+   ```bash
+   python -m bench.encode --runs 5
+   ```
+"""
+
+import argparse
+import io
+import json
+import os
+import statistics
+import tempfile
+import time
+
+from MemeGenerator.EncodeOptions import EncodeOptions
+from MemeGenerator.ImageCache import ImageCache
+from MemeGenerator.MemeGenerator import MemeGenerator
+
+IMAGES_DIRECTORY = './_data/photos/dog/'
+FONT_PATH = './font/Arial.ttf'
+
+SETTINGS = {
+    'jpeg_default': EncodeOptions('JPEG'),
+    'jpeg_q85_optimize': EncodeOptions('JPEG', quality=85, optimize=True),
+    'jpeg_q85_progressive': EncodeOptions('JPEG', quality=85, progressive=True, optimize=True),
+    'jpeg_q85_444': EncodeOptions('JPEG', quality=85, optimize=True, subsampling='4:4:4'),
+    'jpeg_q70_progressive': EncodeOptions('JPEG', quality=70, progressive=True, optimize=True),
+    'webp_q85': EncodeOptions('WEBP', quality=85),
+    'webp_q75': EncodeOptions('WEBP', quality=75),
+    'webp_q75_method6': EncodeOptions('WEBP', quality=75, optimize=True),
+    'png_optimize': EncodeOptions('PNG', optimize=True),
+}
+
+
+def render_samples(images_directory, width):
+    """
+    Draw a captioned meme from every sample photo.
+
+    :param images_directory: The directory of sample photos.
+    :param width: The meme width.
+    :return: A list of captioned images.
+    """
+    with tempfile.TemporaryDirectory() as directory:
+        generator = MemeGenerator(directory, FONT_PATH)
+        images = []
+        for name in sorted(os.listdir(images_directory)):
+            path = os.path.join(images_directory, name)
+            key = ImageCache.source_key(path, width) + (generator.resize,)
+            digest = generator._meme_digest(key, 'Benchmark caption', 'Author', width, 0, generator.encoding,
+                                            generator.caption_style)
+            images.append(generator._draw_meme(path, 'Benchmark caption', 'Author', width, 0,
+                                               generator.resize, key, digest, generator.caption_style))
+        return images
+
+
+def measure(images, options, runs):
+    """
+    Encode every image with the given options.
+
+    :param images: The images to encode.
+    :param options: The EncodeOptions to use.
+    :param runs: The number of timed encodes per image.
+    :return: A dict with the average bytes and median milliseconds per image.
+    """
+    sizes = []
+    times = []
+    for img in images:
+        samples = []
+        for _ in range(runs):
+            buffer = io.BytesIO()
+            start = time.perf_counter()
+            options.save(img, buffer)
+            samples.append((time.perf_counter() - start) * 1000)
+        sizes.append(buffer.tell())
+        times.append(statistics.median(samples))
+    return {'bytes_avg': statistics.mean(sizes), 'ms_per_image': statistics.mean(times)}
+
+
+def run(runs=5, width=500, settings=None, images_directory=IMAGES_DIRECTORY):
+    """
+    Benchmark each encoding setting over the sample photos.
+
+    :param runs: The number of timed encodes per image and setting.
+    :param width: The meme width.
+    :param settings: The setting names to run, or None for all.
+    :param images_directory: The directory of sample photos.
+    :return: A dict of results keyed by setting, with bytes relative to the JPEG default.
+    """
+    images = render_samples(images_directory, width)
+    settings = settings or list(SETTINGS)
+    report = {name: measure(images, SETTINGS[name], runs) for name in settings}
+    baseline = measure(images, SETTINGS['jpeg_default'], 1)['bytes_avg']
+    for result in report.values():
+        result['bytes_vs_jpeg_default'] = result['bytes_avg'] / baseline
+    return {'images': len(images), 'width': width, 'settings': report}
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compare output encoding settings.")
+    parser.add_argument("--runs", type=int, default=5, help="Timed encodes per image and setting")
+    parser.add_argument("--width", type=int, default=500, help="Meme width")
+    parser.add_argument("--setting", choices=sorted(SETTINGS), action='append',
+                        help="Only run the given setting (repeatable)")
+    parser.add_argument("--images", default=IMAGES_DIRECTORY, help="Directory of sample photos")
+    args = parser.parse_args()
+    print(json.dumps(run(args.runs, args.width, args.setting, args.images), indent=2))
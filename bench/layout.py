@@ -0,0 +1,112 @@
+"""
+Caption layout benchmark.
+
+Measures the cost of wrapping a caption to the meme width and searching for
+the font size that fits, for captions of increasing length. Each length is
+laid out with the word-width memo disabled, with a cold memo (first layout of
+a fresh `TextLayout`) and with a warm memo (the vocabulary has been seen
+before, as it is after a few memes). Run from the repository root:
+
+   ```bash
+   python -m bench.layout --words 5 20 50 100 200
+   ```
+"""
+
+import argparse
+import json
+import random
+import statistics
+import time
+
+from MemeGenerator.FontRegistry import FontRegistry
+from MemeGenerator.MemeGenerator import MemeGenerator
+from MemeGenerator.TextLayout import TextLayout
+
+FONT_PATH = './font/Arial.ttf'
+VOCABULARY = (
+    'dog dogs treat treats walk walks ball fetch bark loyal friend love happy tail wag sleep '
+    'couch park bone paws nose fur puppy good best always never every day life heart home'
+).split()
+
+
+def make_caption(words, rng):
+    """
+    Build a caption of the given number of words.
+
+    :param words: The number of words.
+    :param rng: The random generator that picks the words.
+    :return: The caption text.
+    """
+    return ' '.join(rng.choice(VOCABULARY) for _ in range(words)) + ' - Author'
+
+
+def time_layout(text_layout, caption, box, runs):
+    """
+    Time laying out one caption.
+
+    :param text_layout: The TextLayout to use.
+    :param caption: The caption text.
+    :param box: The (width, height) of the caption box.
+    :param runs: The number of timed layouts.
+    :return: The median microseconds per layout.
+    """
+    samples = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        text_layout.layout(FONT_PATH, caption, box[0], box[1],
+                           MemeGenerator.MIN_FONT_SIZE, MemeGenerator.MAX_FONT_SIZE)
+        samples.append((time.perf_counter() - start) * 1e6)
+    return statistics.median(samples)
+
+
+def run(word_counts, runs=20, width=500, seed=0):
+    """
+    Benchmark caption layout for each caption length.
+
+    :param word_counts: The caption lengths in words.
+    :param runs: The number of timed layouts per case.
+    :param width: The meme width; the box follows MemeGenerator's margins and height limit.
+    :param seed: The seed of the caption generator.
+    :return: A dict of results keyed by caption length.
+    """
+    rng = random.Random(seed)
+    box = (width - 2 * MemeGenerator.CAPTION_MARGIN, width // 3)
+    fonts = FontRegistry()
+    for size in range(MemeGenerator.MIN_FONT_SIZE, MemeGenerator.MAX_FONT_SIZE + 1):
+        fonts.get(FONT_PATH, size)
+
+    report = {}
+    for words in word_counts:
+        caption = make_caption(words, rng)
+
+        unmemoized = time_layout(TextLayout(fonts, max_words=0), caption, box, runs)
+
+        cold_samples = []
+        for _ in range(runs):
+            cold_samples.append(time_layout(TextLayout(fonts), caption, box, 1))
+
+        warm_layout = TextLayout(fonts)
+        warm_layout.layout(FONT_PATH, make_caption(words, rng), box[0], box[1],
+                           MemeGenerator.MIN_FONT_SIZE, MemeGenerator.MAX_FONT_SIZE)
+        warm = time_layout(warm_layout, caption, box, runs)
+
+        result = warm_layout.layout(FONT_PATH, caption, box[0], box[1],
+                                    MemeGenerator.MIN_FONT_SIZE, MemeGenerator.MAX_FONT_SIZE)
+        report[words] = {
+            'font_size': result.size,
+            'lines': len(result.lines),
+            'us_unmemoized': unmemoized,
+            'us_cold': statistics.median(cold_samples),
+            'us_warm': warm,
+        }
+    return report
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Measure caption layout cost.")
+    parser.add_argument("--words", type=int, nargs='+', default=[5, 20, 50, 100, 200],
+                        help="Caption lengths in words")
+    parser.add_argument("--runs", type=int, default=20, help="Timed layouts per case")
+    parser.add_argument("--width", type=int, default=500, help="Meme width")
+    args = parser.parse_args()
+    print(json.dumps(run(args.words, args.runs, args.width), indent=2))
@@ -0,0 +1,221 @@
+"""
+Local load test of the web server modes.
+
+Starts the application under each server in turn, drives it from several
+client processes for a fixed time, and reports requests per second, latency
+percentiles, and the resident (RSS) and proportional (PSS) memory of every
+server process as JSON:
+
+- `dev`: The single-process Flask development server, as run by `python app.py`.
+- `prefork`: `serve.py`, with the application loaded once and forked into
+  `--workers` processes.
+
+PSS divides each shared page between the processes that map it, so the sum of
+PSS across a server's processes is its real memory use; RSS counts shared
+pages in full for every process. Linux only. Run from the repository root:
+
+   ```bash
+   python -m bench.load --workers 4 --clients 16 --duration 10
+   python -m bench.load --server prefork --path / --path /create
+   ```
+"""
+
+import argparse
+import http.client
+import json
+import os
+import socket
+import subprocess
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from bench.__main__ import percentile
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SERVERS = ('dev', 'prefork')
+DEV_SERVER = """
+import logging
+import app
+logging.getLogger('werkzeug').setLevel(logging.ERROR)
+app.app.run(port={port})
+"""
+
+
+def free_port():
+    """
+    Return a TCP port that is free on localhost.
+
+    :return: The port number.
+    """
+    with socket.socket() as probe:
+        probe.bind(('127.0.0.1', 0))
+        return probe.getsockname()[1]
+
+
+def start_server(server, port, workers):
+    """
+    Start a server in a subprocess and wait until it answers.
+
+    :param server: ``dev`` or ``prefork``.
+    :param port: The port to listen on.
+    :param workers: The number of worker processes for ``prefork``.
+    :return: The server's Popen object.
+    """
+    if server == 'dev':
+        command = [sys.executable, '-c', DEV_SERVER.format(port=port)]
+    else:
+        command = [sys.executable, 'serve.py', '--port', str(port), '--workers', str(workers), '--quiet']
+    process = subprocess.Popen(command, cwd=REPO_ROOT, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+
+    deadline = time.monotonic() + 60
+    while time.monotonic() < deadline:
+        try:
+            connection = http.client.HTTPConnection('127.0.0.1', port, timeout=5)
+            connection.request('GET', '/pool')
+            connection.getresponse().read()
+            connection.close()
+            return process
+        except OSError:
+            if process.poll() is not None:
+                break
+            time.sleep(0.2)
+    process.kill()
+    raise RuntimeError(f"The {server} server did not start")
+
+
+def drive(port, paths, duration):
+    """
+    Send requests in a loop for a fixed time; run in a client process.
+
+    :param port: The server port.
+    :param paths: The paths to request, in rotation.
+    :param duration: The number of seconds to run.
+    :return: The latencies in milliseconds and the number of failed requests.
+    """
+    latencies = []
+    errors = 0
+    connection = None
+    deadline = time.monotonic() + duration
+    index = 0
+    while time.monotonic() < deadline:
+        path = paths[index % len(paths)]
+        index += 1
+        start = time.perf_counter()
+        try:
+            if connection is None:
+                connection = http.client.HTTPConnection('127.0.0.1', port, timeout=30)
+            connection.request('GET', path, headers={'Accept': 'text/html,image/webp,*/*'})
+            response = connection.getresponse()
+            response.read()
+            if response.status >= 400:
+                errors += 1
+                continue
+            if response.getheader('Connection', '').lower() == 'close':
+                connection.close()
+                connection = None
+        except (OSError, http.client.HTTPException):
+            errors += 1
+            if connection is not None:
+                connection.close()
+            connection = None
+            continue
+        latencies.append((time.perf_counter() - start) * 1000)
+    return latencies, errors
+
+
+def process_memory(pid):
+    """
+    Read the RSS and PSS of a process.
+
+    :param pid: The process id.
+    :return: A dict with ``rss_kb`` and ``pss_kb``.
+    """
+    memory = {}
+    with open(f'/proc/{pid}/smaps_rollup') as rollup:
+        for line in rollup:
+            name, _, value = line.partition(':')
+            if name in ('Rss', 'Pss'):
+                memory[f'{name.lower()}_kb'] = int(value.split()[0])
+    return memory
+
+
+def server_processes(pid):
+    """
+    Return a server process and its worker processes.
+
+    :param pid: The server's process id.
+    :return: A list of (role, pid) pairs.
+    """
+    with open(f'/proc/{pid}/task/{pid}/children') as children:
+        workers = [int(child) for child in children.read().split()]
+    if not workers:
+        return [('server', pid)]
+    return [('parent', pid)] + [('worker', child) for child in workers]
+
+
+def run_server(server, workers, clients, duration, warmup, paths):
+    """
+    Load test one server mode.
+
+    :param server: ``dev`` or ``prefork``.
+    :param workers: The number of worker processes for ``prefork``.
+    :param clients: The number of concurrent client processes.
+    :param duration: The number of seconds to measure.
+    :param warmup: The number of seconds to run before measuring.
+    :param paths: The paths to request.
+    :return: A dict with throughput, latency and memory per process.
+    """
+    port = free_port()
+    process = start_server(server, port, workers)
+    try:
+        with ProcessPoolExecutor(max_workers=clients) as executor:
+            if warmup:
+                list(executor.map(drive, [port] * clients, [paths] * clients, [warmup] * clients))
+            results = list(executor.map(drive, [port] * clients, [paths] * clients, [duration] * clients))
+
+        latencies = sorted(latency for samples, _ in results for latency in samples)
+        processes = [dict(role=role, pid=pid, **process_memory(pid)) for role, pid in server_processes(process.pid)]
+        return {
+            'requests': len(latencies),
+            'errors': sum(errors for _, errors in results),
+            'requests_per_second': len(latencies) / duration,
+            'p50_ms': percentile(latencies, 0.50) if latencies else None,
+            'p99_ms': percentile(latencies, 0.99) if latencies else None,
+            'total_pss_kb': sum(entry['pss_kb'] for entry in processes),
+            'processes': processes,
+        }
+    finally:
+        process.terminate()
+        process.wait()
+
+
+def run(servers, workers, clients, duration, warmup, paths):
+    """
+    Load test each server mode.
+
+    :param servers: The server modes to run.
+    :param workers: The number of worker processes for ``prefork``.
+    :param clients: The number of concurrent client processes.
+    :param duration: The number of seconds to measure each server.
+    :param warmup: The number of seconds to run before measuring.
+    :param paths: The paths to request.
+    :return: A dict of results keyed by server mode.
+    """
+    report = {'workers': workers, 'clients': clients, 'duration': duration, 'paths': paths}
+    for server in servers:
+        report[server] = run_server(server, workers, clients, duration, warmup, paths)
+    return report
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Load test the development and prefork servers.")
+    parser.add_argument("--server", choices=SERVERS, action='append', help="Only run the given server (repeatable)")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="Worker processes for prefork")
+    parser.add_argument("--clients", type=int, default=16, help="Concurrent client processes")
+    parser.add_argument("--duration", type=float, default=10, help="Seconds to measure each server")
+    parser.add_argument("--warmup", type=float, default=2, help="Seconds to run before measuring")
+    parser.add_argument("--path", action='append', help="Path to request (repeatable, default /)")
+    args = parser.parse_args()
+    print(json.dumps(run(args.server or SERVERS, args.workers, args.clients, args.duration, args.warmup,
+                         args.path or ['/']), indent=2))
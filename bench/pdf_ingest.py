@@ -0,0 +1,163 @@
+"""
+PDF ingestion benchmark.
+
+Generates a directory of small quote PDFs and compares the ways of extracting
+their text: the former `pdftotext` run through a temporary file, `pdftotext`
+piped to stdout, in-process pypdf, and `PDFIngestor.parse_many` running files
+concurrently. Strategies whose dependency is missing are reported as skipped.
+Run from the repository root:
+
+   ```bash
+   python -m bench.pdf_ingest --files 300 --workers 8
+   ```
+"""
+
+import argparse
+import json
+import os
+import shutil
+import subprocess
+import tempfile
+import time
+
+from QuoteEngine.PDFIngestor import PDFIngestor
+
+
+def write_quote_pdf(path, lines):
+    """
+    Write a single-page PDF with one line of text per entry.
+
+    :param path: The path of the file to write.
+    :param lines: The lines of text to place on the page.
+    """
+    commands = ['BT', '/F1 12 Tf', '14 TL', '72 720 Td']
+    for line in lines:
+        escaped = line.replace('\\', '\\\\').replace('(', '\\(').replace(')', '\\)')
+        commands.append(f'({escaped}) Tj T*')
+    commands.append('ET')
+    stream = '\n'.join(commands).encode('latin-1')
+
+    objects = [
+        b'<< /Type /Catalog /Pages 2 0 R >>',
+        b'<< /Type /Pages /Kids [3 0 R] /Count 1 >>',
+        b'<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] '
+        b'/Resources << /Font << /F1 4 0 R >> >> /Contents 5 0 R >>',
+        b'<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>',
+        b'<< /Length %d >>\nstream\n' % len(stream) + stream + b'\nendstream',
+    ]
+    output = bytearray(b'%PDF-1.4\n')
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(len(output))
+        output += b'%d 0 obj\n' % number + body + b'\nendobj\n'
+    xref_offset = len(output)
+    output += b'xref\n0 %d\n0000000000 65535 f \n' % (len(objects) + 1)
+    for offset in offsets:
+        output += b'%010d 00000 n \n' % offset
+    output += b'trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n' % (len(objects) + 1, xref_offset)
+    with open(path, 'wb') as file:
+        file.write(output)
+
+
+def pdftotext_tempfile(path):
+    """
+    Extract text the way PDFIngestor did before: via a temporary file.
+
+    :param path: The path to the PDF file.
+    :return: The extracted text.
+    """
+    with tempfile.NamedTemporaryFile(suffix=".txt", delete=False) as temp_file:
+        subprocess.run(["pdftotext", "-layout", path, temp_file.name])
+        temp_file.seek(0)
+        text = temp_file.read().decode('utf-8')
+    os.remove(temp_file.name)
+    return text
+
+
+def with_backend(backend, function):
+    """
+    Wrap a function so it runs with the given PDFIngestor backend.
+
+    :param backend: The backend name to force.
+    :param function: The function to call with the list of paths.
+    :return: The wrapped function.
+    """
+    def wrapped(paths):
+        previous = PDFIngestor.backend
+        PDFIngestor.backend = backend
+        try:
+            return function(paths)
+        finally:
+            PDFIngestor.backend = previous
+    return wrapped
+
+
+def has_pypdf():
+    """Return True if pypdf can be imported."""
+    try:
+        import pypdf  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def strategies(workers):
+    """
+    Return the strategies to compare, with the reason any of them is unavailable.
+
+    :param workers: The number of concurrent workers for parse_many.
+    :return: A dict mapping names to (function or None, skip reason or None).
+    """
+    has_pdftotext = shutil.which('pdftotext') is not None
+    no_pdftotext = None if has_pdftotext else 'pdftotext is not installed'
+    no_pypdf = None if has_pypdf() else 'pypdf is not installed'
+    return {
+        'pdftotext_tempfile_serial': (
+            lambda paths: [pdftotext_tempfile(path) for path in paths], no_pdftotext),
+        'pdftotext_pipe_serial': (
+            with_backend('pdftotext', lambda paths: [PDFIngestor.extract_text(path) for path in paths]),
+            no_pdftotext),
+        'pdftotext_pipe_parse_many': (
+            with_backend('pdftotext', lambda paths: PDFIngestor.parse_many(paths, workers)), no_pdftotext),
+        'pypdf_serial': (
+            with_backend('pypdf', lambda paths: [PDFIngestor.extract_text(path) for path in paths]), no_pypdf),
+        'pypdf_parse_many': (
+            with_backend('pypdf', lambda paths: PDFIngestor.parse_many(paths, workers)), no_pypdf),
+    }
+
+
+def run(file_count, lines_per_file, workers):
+    """
+    Benchmark every available strategy on a generated directory of PDFs.
+
+    :param file_count: The number of PDF files to generate.
+    :param lines_per_file: The number of quotes per file.
+    :param workers: The number of concurrent workers for parse_many.
+    :return: A dict of results keyed by strategy.
+    """
+    report = {}
+    with tempfile.TemporaryDirectory() as directory:
+        paths = []
+        for index in range(file_count):
+            path = os.path.join(directory, f'quotes_{index}.pdf')
+            write_quote_pdf(path, [f'"Quote {index}.{line}" - Author {line}' for line in range(lines_per_file)])
+            paths.append(path)
+
+        for name, (function, skip_reason) in strategies(workers).items():
+            if skip_reason:
+                report[name] = {'skipped': skip_reason}
+                continue
+            start = time.perf_counter()
+            function(paths)
+            seconds = time.perf_counter() - start
+            report[name] = {'seconds': seconds, 'files_per_second': file_count / seconds}
+    return report
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compare PDF text extraction strategies.")
+    parser.add_argument("--files", type=int, default=300, help="Number of PDF files to generate")
+    parser.add_argument("--lines", type=int, default=20, help="Quotes per PDF file")
+    parser.add_argument("--workers", type=int, default=os.cpu_count(), help="Workers for parse_many")
+    args = parser.parse_args()
+    print(json.dumps(run(args.files, args.lines, args.workers), indent=2))
@@ -0,0 +1,122 @@
+"""
+Quote index benchmark.
+
+Builds a `QuoteCorpus` from a synthetic corpus (one million quotes by default)
+and compares indexed `find` / `random_choice` with a linear scan over a list of
+QuoteModel objects, for filters of different selectivity. Run from the
+repository root:
+
+   ```bash
+   python -m bench.quote_index --quotes 1000000
+   ```
+"""
+
+import argparse
+import json
+import random
+import resource
+import time
+
+from QuoteEngine.QuoteCorpus import QuoteCorpus
+from QuoteEngine.QuoteIndex import QuoteIndex
+from QuoteEngine.QuoteModel import QuoteModel
+
+WORDS = ['treat', 'walk', 'ball', 'bark', 'nap', 'squirrel', 'mailman', 'bone', 'couch', 'belly',
+         'rub', 'park', 'leash', 'fetch', 'stick', 'puddle', 'sock', 'shoe', 'cat', 'bath']
+
+QUERIES = {
+    'rare_author': {'author': 'Author 7'},
+    'common_word': {'contains': 'treat'},
+    'author_and_word': {'author': 'Author 7', 'contains': 'walk'},
+    'two_words': {'contains': 'squirrel bath'},
+}
+
+
+def synthetic_quotes(count, author_count, seed=0):
+    """
+    Generate quotes with a skewed author distribution and random words.
+
+    :param count: The number of quotes.
+    :param author_count: The number of distinct authors.
+    :param seed: The random seed.
+    :return: A list of QuoteModel objects.
+    """
+    rng = random.Random(seed)
+    quotes = []
+    for _ in range(count):
+        words = ' '.join(rng.choice(WORDS) for _ in range(8))
+        author = f'Author {int(rng.paretovariate(1.2)) % author_count}'
+        quotes.append(QuoteModel(words, author))
+    return quotes
+
+
+def linear_find(quotes, author=None, contains=None):
+    """
+    Filter quotes with a full scan, as a request handler would without an index.
+
+    :param quotes: The list of QuoteModel objects.
+    :param author: The author the quotes must be by.
+    :param contains: Words that must all appear in the quotes.
+    :return: The matching quotes.
+    """
+    words = set(QuoteIndex.tokenize(contains)) if contains else set()
+    author_key = author.casefold() if author else None
+    return [quote for quote in quotes
+            if (author_key is None or quote.author.casefold() == author_key)
+            and words.issubset(QuoteIndex.tokenize(quote.body))]
+
+
+def timed(function, repeat):
+    """
+    Return the mean duration of a function in milliseconds.
+
+    :param function: The function to call without arguments.
+    :param repeat: The number of calls.
+    :return: The mean milliseconds per call.
+    """
+    start = time.perf_counter()
+    for _ in range(repeat):
+        function()
+    return (time.perf_counter() - start) * 1000 / repeat
+
+
+def run(count, author_count, repeat):
+    """
+    Build the corpus and time each query with and without the index.
+
+    :param count: The number of quotes.
+    :param author_count: The number of distinct authors.
+    :param repeat: The number of calls per indexed measurement.
+    :return: A dict with the build cost and per-query timings.
+    """
+    quotes = synthetic_quotes(count, author_count)
+    rss_before = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    start = time.perf_counter()
+    corpus = QuoteCorpus.from_quotes(quotes)
+    build_seconds = time.perf_counter() - start
+    rss_after = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+    report = {
+        'quotes': len(corpus),
+        'build_seconds': build_seconds,
+        'build_peak_rss_growth_kb': rss_after - rss_before,
+        'unfiltered_random_choice_ms': timed(corpus.random_choice, repeat),
+        'queries': {},
+    }
+    for name, query in QUERIES.items():
+        report['queries'][name] = {
+            'matches': len(corpus.find(**query)),
+            'indexed_find_ms': timed(lambda: corpus.find(**query), repeat),
+            'indexed_random_choice_ms': timed(lambda: corpus.random_choice(**query), repeat),
+            'linear_find_ms': timed(lambda: linear_find(quotes, **query), 1),
+        }
+    return report
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the quote author and word indexes.")
+    parser.add_argument("--quotes", type=int, default=1000000, help="Number of synthetic quotes")
+    parser.add_argument("--authors", type=int, default=5000, help="Number of distinct authors")
+    parser.add_argument("--repeat", type=int, default=20, help="Calls per indexed measurement")
+    args = parser.parse_args()
+    print(json.dumps(run(args.quotes, args.authors, args.repeat), indent=2))
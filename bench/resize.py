@@ -0,0 +1,155 @@
+"""
+Resize benchmark.
+
+Measures the time and memory to decode and resize a JPEG to the meme width in
+each `MemeGenerator` resize mode, on synthetic photos of increasing
+resolution. Time is the median over several runs in this process. Peak memory
+is measured in a fresh interpreter per case, as the growth of its peak RSS
+during one decode and resize, because Pillow's pixel buffers are invisible to
+tracemalloc. Run from the repository root:
+
+   ```bash
+   python -m bench.resize --sizes 1024x768 4000x3000 8000x6000
+   ```
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+from PIL import Image
+
+from MemeGenerator.MemeGenerator import MemeGenerator, _load_resized_image
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# ru_maxrss survives exec on Linux, so a child forked from a large parent would
+# report the parent's peak; VmHWM belongs to the child's own address space.
+CHILD_TEMPLATE = """
+import resource
+from MemeGenerator.MemeGenerator import _load_resized_image
+
+def peak_kb():
+    try:
+        with open('/proc/self/status') as status:
+            for line in status:
+                if line.startswith('VmHWM:'):
+                    return int(line.split()[1])
+    except OSError:
+        pass
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+with open({path!r}, 'rb') as image_file:
+    data = image_file.read()
+before = peak_kb()
+_load_resized_image(data, {width}, {mode!r})
+print(peak_kb() - before)
+"""
+
+
+def write_synthetic_jpeg(path, width, height):
+    """
+    Write a photo-like JPEG of the given size.
+
+    A smooth gradient is overlaid with noise, so the file compresses like a
+    photograph rather than a flat colour.
+
+    :param path: The path of the file to write.
+    :param width: The width in pixels.
+    :param height: The height in pixels.
+    """
+    gradient = Image.linear_gradient('L').resize((width, height))
+    noise = Image.effect_noise((width, height), 48)
+    img = Image.merge('RGB', (gradient, noise, gradient.transpose(Image.FLIP_LEFT_RIGHT)))
+    img.save(path, format='JPEG', quality=90)
+
+
+def time_mode(data, width, mode, runs):
+    """
+    Time decoding and resizing an encoded image.
+
+    :param data: The encoded image.
+    :param width: The target width.
+    :param mode: The resize mode.
+    :param runs: The number of timed runs.
+    :return: The median milliseconds per image.
+    """
+    samples = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        _load_resized_image(data, width, mode)
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples)
+
+
+def peak_memory_kb(path, width, mode):
+    """
+    Measure the peak RSS growth of one decode and resize in a fresh interpreter.
+
+    :param path: The path of the image file.
+    :param width: The target width.
+    :param mode: The resize mode.
+    :return: The growth of the peak RSS in kilobytes.
+    """
+    code = CHILD_TEMPLATE.format(path=path, width=width, mode=mode)
+    output = subprocess.run([sys.executable, '-c', code], cwd=REPO_ROOT,
+                            capture_output=True, text=True, check=True).stdout
+    return int(output.strip())
+
+
+def run(sizes, width=500, runs=5, modes=None):
+    """
+    Benchmark each resize mode on synthetic photos of the given sizes.
+
+    :param sizes: The (width, height) of the source images.
+    :param width: The target width.
+    :param runs: The number of timed runs per case.
+    :param modes: The resize modes to run, or None for all.
+    :return: A dict of results keyed by source size and mode.
+    """
+    modes = modes or list(MemeGenerator.RESIZE_MODES)
+    report = {}
+    with tempfile.TemporaryDirectory() as directory:
+        for source_width, source_height in sizes:
+            label = f'{source_width}x{source_height}'
+            path = os.path.join(directory, f'{label}.jpg')
+            write_synthetic_jpeg(path, source_width, source_height)
+            with open(path, 'rb') as image_file:
+                data = image_file.read()
+
+            report[label] = {'file_bytes': len(data)}
+            for mode in modes:
+                report[label][mode] = {
+                    'ms_per_image': time_mode(data, width, mode, runs),
+                    'peak_rss_growth_kb': peak_memory_kb(path, width, mode),
+                }
+    return report
+
+
+def parse_size(value):
+    """
+    Parse a WIDTHxHEIGHT command-line value.
+
+    :param value: The value to parse.
+    :return: A (width, height) tuple.
+    """
+    width, _, height = value.lower().partition('x')
+    return int(width), int(height)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compare image resize modes.")
+    parser.add_argument("--sizes", type=parse_size, nargs='+',
+                        default=[(640, 480), (1024, 768), (2048, 1536), (4000, 3000), (8000, 6000)],
+                        help="Source resolutions as WIDTHxHEIGHT")
+    parser.add_argument("--width", type=int, default=500, help="Target width")
+    parser.add_argument("--runs", type=int, default=5, help="Timed runs per case")
+    parser.add_argument("--mode", choices=MemeGenerator.RESIZE_MODES, action='append',
+                        help="Only run the given mode (repeatable)")
+    args = parser.parse_args()
+    print(json.dumps(run(args.sizes, args.width, args.runs, args.mode), indent=2))
@@ -0,0 +1,97 @@
+"""
+Startup benchmark.
+
+Measures the cold-start cost of `meme.py` and `app.py` in fresh interpreters:
+wall time to import (and, for `meme.py`, to pick a quote) and the peak RSS of
+the process. Each target is measured twice: as is, with ingestors imported
+lazily, and with every ingestor module imported up front, the way
+`QuoteEngine.Ingestor` used to. Run from the repository root:
+
+   ```bash
+   python -m bench.startup --runs 5
+   ```
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+EAGER_PRELUDE = (
+    "import QuoteEngine.CSVIngestor, QuoteEngine.DocxIngestor, "
+    "QuoteEngine.PDFIngestor, QuoteEngine.TextIngestor\n"
+)
+
+TARGETS = {
+    'meme.py': "import meme\nmeme.get_random_quote(meme.QUOTE_FILES)\n",
+    'app.py': "import app\n",
+}
+
+CHILD_TEMPLATE = """
+import json, resource, sys, time
+start = time.perf_counter()
+{prelude}{target}
+elapsed = time.perf_counter() - start
+print(json.dumps({{
+    'seconds': elapsed,
+    'max_rss_kb': resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+    'modules': len(sys.modules),
+}}))
+"""
+
+
+def measure(target, prelude, runs):
+    """
+    Run a startup script in fresh interpreters and summarize the results.
+
+    :param target: The code that imports the entry point.
+    :param prelude: Code executed before the target inside the timed region.
+    :param runs: The number of interpreters to start.
+    :return: A dict with the median seconds, median peak RSS and module count.
+    """
+    code = CHILD_TEMPLATE.format(prelude=prelude, target=target)
+    samples = []
+    for _ in range(runs):
+        output = subprocess.run(
+            [sys.executable, '-c', code],
+            cwd=REPO_ROOT, check=True, capture_output=True, text=True,
+        ).stdout
+        samples.append(json.loads(output.strip().splitlines()[-1]))
+    return {
+        'seconds': statistics.median(sample['seconds'] for sample in samples),
+        'max_rss_kb': statistics.median(sample['max_rss_kb'] for sample in samples),
+        'modules': samples[-1]['modules'],
+    }
+
+
+def run(runs=5):
+    """
+    Measure every target with lazy and eager ingestor imports.
+
+    :param runs: The number of interpreters to start per measurement.
+    :return: A dict with the results and savings per target.
+    """
+    report = {}
+    for name, target in TARGETS.items():
+        # Warm the quote snapshot so both variants start from the same state.
+        measure(target, '', 1)
+        lazy = measure(target, '', runs)
+        eager = measure(target, EAGER_PRELUDE, runs)
+        report[name] = {
+            'lazy': lazy,
+            'eager': eager,
+            'seconds_saved': eager['seconds'] - lazy['seconds'],
+            'rss_kb_saved': eager['max_rss_kb'] - lazy['max_rss_kb'],
+        }
+    return report
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Measure meme.py and app.py startup cost.")
+    parser.add_argument("--runs", type=int, default=5, help="Interpreters started per measurement")
+    args = parser.parse_args()
+    print(json.dumps(run(args.runs), indent=2))
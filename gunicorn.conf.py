@@ -0,0 +1,51 @@
+"""
+Gunicorn settings for the Meme Generator.
+
+Run with `gunicorn -c gunicorn.conf.py app:app`. Like serve.py, the
+application is loaded and its base images decoded once in the master process
+and shared copy-on-write by the forked workers, and with more than one worker
+memes are written to `./static` so any worker can serve them.
+
+Settings are read from the environment:
+
+- `MEME_BIND`: The address to listen on (default `127.0.0.1:8000`).
+- `MEME_WORKERS`: The number of worker processes (default: the CPU count).
+- `MEME_THREADS`: The threads per worker for the default `gthread` workers (default 8).
+- `MEME_WORKER_CLASS`: The worker type. Set it to `gevent` (after
+  `pip install gevent`) to serve the I/O-bound `POST /create` downloads on
+  green threads.
+
+Render jobs of `MEME_ASYNC=1` are kept by the worker that accepted them, so
+Gunicorn refuses to start that mode with more than one worker.
+
+Every worker evicts old memes from `./static` with its own output cache, so
+the directory holds up to `MEME_WORKERS` times the cache limit, and a meme one
+worker still serves may be deleted by another and rendered again on its next
+request.
+"""
+
+import gc
+import os
+
+bind = os.environ.get('MEME_BIND', '127.0.0.1:8000')
+workers = int(os.environ.get('MEME_WORKERS', os.cpu_count() or 1))
+worker_class = os.environ.get('MEME_WORKER_CLASS', 'gthread')
+threads = int(os.environ.get('MEME_THREADS', 8))
+preload_app = True
+
+if workers > 1:
+    os.environ.setdefault('MEME_PERSIST', '1')
+
+
+def on_starting(server):
+    """Refuse to run MEME_ASYNC=1 render jobs on more than one worker."""
+    if server.cfg.workers > 1 and os.environ.get('MEME_ASYNC', '0') == '1':
+        raise RuntimeError("MEME_ASYNC=1 keeps render jobs in the worker that accepted them; "
+                           "set MEME_WORKERS=1")
+
+
+def when_ready(server):
+    """Decode the base images and freeze the loaded objects before the workers are forked."""
+    import app
+    app.warm_up()
+    gc.freeze()
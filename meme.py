@@ -8,10 +8,25 @@ Usage:
    - `--path` (optional): Path to a specific image file.
    - `--body` (optional): Quote body to add to the image.
    - `--author` (optional): Quote author to add to the image.
+   - `--resize` (optional): Resize mode, `fast` (default), `quality` or `nearest`.
+   - `--format`, `--quality`, `--progressive`, `--optimize`, `--subsampling`
+     (optional): Output encoding, e.g. `--format webp --quality 80`.
+   - `--style` (optional): Caption style, `outline` (default), `shadow`, `box` or `plain`.
 
 2. The script will generate a meme using the provided image, quote body, and author (if provided), or it will use random images and quotes from predefined sources.
 
-3. The generated meme will be saved in the './tmp' directory with a random filename.
+3. The generated meme will be saved in the './tmp' directory under a filename derived
+   from a hash of its inputs, so generating the same meme again returns the existing file.
+
+4. To render many memes at once, pass a JSON Lines file with one job per line
+   (keys `image`, `body`, `author` and optional `width`, `seed`, `resize`, `format`
+   and `quality`; missing images and quotes are picked at random) and the number of
+   worker processes:
+   ```bash
+   python meme.py --batch jobs.jsonl --workers 8
+   ```
+   One JSON result per job is printed as it finishes; a malformed line is reported
+   as a failed job. `--max-files` (default 1000) bounds the memes kept in './tmp'.
 
 Example:
    To generate a meme with a specific image and custom text:
@@ -24,12 +39,27 @@ Example:
 """
 
 import os
+import json
 import random
 import argparse
 from QuoteEngine.Ingestor import Ingestor
 from MemeGenerator.MemeGenerator import MemeGenerator
+from MemeGenerator.CaptionStyle import CaptionStyle
+from MemeGenerator.EncodeOptions import EncodeOptions
+from MemeGenerator.OutputCache import OutputCache
 from QuoteEngine import QuoteModel
 
+IMAGES_DIRECTORY = "./_data/photos/dog/"
+QUOTE_FILES = [
+    './_data/DogQuotes/DogQuotesTXT.txt',
+    './_data/DogQuotes/DogQuotesDOCX.docx',
+    './_data/DogQuotes/DogQuotesPDF.pdf',
+    './_data/DogQuotes/DogQuotesCSV.csv'
+]
+FONT_PATH = "font/Arial.ttf"
+OUTPUT_DIR = './tmp'
+QUOTE_SNAPSHOT = './tmp/quotes.snapshot'
+
 
 def get_random_image(images_directory):
     """
@@ -49,10 +79,7 @@ def get_random_quote(quote_files):
     :param quote_files: List of quote file paths.
     :return: A random quote.
     """
-    quotes = []
-    for file in quote_files:
-        quotes.extend(Ingestor.parse(file))
-
+    quotes = Ingestor.parse_cached(quote_files, QUOTE_SNAPSHOT)
     return random.choice(quotes)
 
 
@@ -60,7 +87,8 @@ def generate_meme(options):
     """
     Generate a meme based on the specified options.
 
-    :param options: A dictionary containing options for image, body, and author.
+    :param options: A dictionary containing options for image, body, author, resize mode, encoding
+        and caption style.
     :return: Path to the created meme image, or None if an error occurs.
     """
     img = options.get('image', None)
@@ -68,39 +96,153 @@ def generate_meme(options):
     author = options.get('author', None)
 
     if img is None:
-        images_directory = "./_data/photos/dog/"
-        img = get_random_image(images_directory)
+        img = get_random_image(IMAGES_DIRECTORY)
 
     if body is None:
-        quote_files = [
-            './_data/DogQuotes/DogQuotesTXT.txt',
-            './_data/DogQuotes/DogQuotesDOCX.docx',
-            './_data/DogQuotes/DogQuotesPDF.pdf',
-            './_data/DogQuotes/DogQuotesCSV.csv'
-        ]
-        quote = get_random_quote(quote_files)
+        quote = get_random_quote(QUOTE_FILES)
     else:
         if author is None:
             raise Exception('Author Required if Body is Used')
         quote = QuoteModel.QuoteModel(body, author)
 
-    font_path = "font/Arial.ttf"
-    meme = MemeGenerator('./tmp', font_path)
+    meme = MemeGenerator(OUTPUT_DIR, FONT_PATH, resize=options.get('resize') or MemeGenerator.DEFAULT_RESIZE,
+                         encoding=options.get('encoding'), caption_style=options.get('caption_style'))
     generate_path = meme.make_meme(img, quote.body, quote.author)
     return generate_path
 
 
+def read_batch_jobs(batch_path):
+    """
+    Yield one meme job per non-blank line of a JSON Lines job file.
+
+    Lines are read as the jobs are consumed, so the file is never held in
+    memory. A line that is not a valid job yields a job with an ``error``
+    message instead, which ``make_memes`` reports as a failed result.
+
+    :param batch_path: Path to the job file.
+    :return: An iterator of job dicts for MemeGenerator.make_memes.
+    """
+    images = None
+    quotes = None
+    with open(batch_path, 'r', encoding='utf-8') as batch_file:
+        for line_number, line in enumerate(batch_file, 1):
+            if not line.strip():
+                continue
+            try:
+                entry = json.loads(line)
+                if not isinstance(entry, dict):
+                    raise ValueError("a job must be a JSON object")
+
+                img = entry.get('image')
+                if img is None:
+                    images = images or [os.path.join(IMAGES_DIRECTORY, name) for name in os.listdir(IMAGES_DIRECTORY)]
+                    img = random.choice(images)
+
+                body = entry.get('body')
+                author = entry.get('author')
+                if body is None:
+                    if quotes is None:
+                        quotes = Ingestor.parse_cached(QUOTE_FILES, QUOTE_SNAPSHOT)
+                    quote = random.choice(quotes)
+                    body, author = quote.body, quote.author
+                elif not isinstance(body, str) or not isinstance(author, str) or not author.strip():
+                    raise ValueError("body and author must be text, and an author is required with a body")
+
+                job = {'img_path': img, 'text': body, 'author': author, 'width': entry.get('width', 500)}
+                if 'seed' in entry:
+                    job['seed'] = entry['seed']
+                if 'resize' in entry:
+                    job['resize'] = entry['resize']
+                if 'format' in entry:
+                    job['encoding'] = _job_encoding(entry)
+            except ValueError as e:
+                job = {'error': f"line {line_number}: {type(e).__name__}: {e}"}
+            yield job
+
+
+def _job_encoding(entry):
+    """
+    Return the EncodeOptions of a batch job that sets its own format.
+
+    :param entry: The decoded job with a `format` and optional `quality`.
+    :return: The validated EncodeOptions.
+    :raises ValueError: If the format or quality is not supported.
+    """
+    image_format = entry['format']
+    quality = entry.get('quality')
+    if not isinstance(image_format, str):
+        raise ValueError(f"format must be text, got {image_format!r}")
+    if quality is not None and (not isinstance(quality, int) or isinstance(quality, bool)):
+        raise ValueError(f"quality must be a whole number, got {quality!r}")
+    return EncodeOptions(image_format, quality).validate()
+
+
+def generate_batch(batch_path, workers=None, ordered=True, resize=MemeGenerator.DEFAULT_RESIZE, encoding=None,
+                   caption_style=None, max_files=OutputCache.DEFAULT_MAX_FILES):
+    """
+    Generate one meme per line of a JSON Lines job file.
+
+    :param batch_path: Path to the job file.
+    :param workers: Number of worker processes (defaults to the CPU count).
+    :param ordered: Yield results in job order if True, or as they complete.
+    :param resize: The resize mode of jobs that do not set their own.
+    :param encoding: The EncodeOptions of jobs that do not set their own format, or None for JPEG defaults.
+    :param caption_style: The CaptionStyle of every meme, or None for the outlined default.
+    :param max_files: The number of memes kept in the output directory; a larger
+        batch evicts its earliest memes.
+    :return: An iterator of MemeJobResult objects.
+    """
+    output_cache = OutputCache(OUTPUT_DIR, max_files=max_files)
+    meme = MemeGenerator(OUTPUT_DIR, FONT_PATH, output_cache=output_cache, resize=resize,
+                         encoding=encoding, caption_style=caption_style)
+    return meme.make_memes(read_batch_jobs(batch_path), workers=workers, ordered=ordered)
+
+
 if __name__ == "__main__":
     parser = argparse.ArgumentParser(description="Generate a meme.")
     parser.add_argument("--image", type=str, help="Path to an image file")
     parser.add_argument("--body", type=str, help="Quote body to add to the image")
     parser.add_argument("--author", type=str, help="Quote author to add to the image")
+    parser.add_argument("--batch", type=str, help="Path to a JSON Lines file of meme jobs")
+    parser.add_argument("--workers", type=int, help="Number of worker processes for --batch")
+    parser.add_argument("--max-files", type=int, default=OutputCache.DEFAULT_MAX_FILES,
+                        help="Number of memes kept in the output directory for --batch")
+    parser.add_argument("--unordered", action="store_true",
+                        help="Print --batch results as they complete instead of in job order")
+    parser.add_argument("--resize", choices=MemeGenerator.RESIZE_MODES, default=MemeGenerator.DEFAULT_RESIZE,
+                        help="How images are resized: fast, quality or nearest")
+    parser.add_argument("--format", type=str.upper, choices=list(EncodeOptions.FORMATS), default='JPEG',
+                        help="Output format: jpeg, webp, png or gif")
+    parser.add_argument("--quality", type=int, help="Lossy output quality from 1 to 100")
+    parser.add_argument("--progressive", action="store_true", help="Write progressive JPEGs")
+    parser.add_argument("--optimize", action="store_true", help="Spend more encoding time for smaller files")
+    parser.add_argument("--subsampling", choices=EncodeOptions.SUBSAMPLING, help="JPEG chroma subsampling")
+    parser.add_argument("--style", type=str.lower, choices=CaptionStyle.PRESETS, default=CaptionStyle.DEFAULT_PRESET,
+                        help="Caption style: outline, shadow, box or plain")
     args = parser.parse_args()
+    try:
+        encoding = EncodeOptions(args.format, args.quality, args.progressive, args.optimize,
+                                 args.subsampling).validate()
+    except ValueError as e:
+        parser.error(str(e))
+
+    if args.batch:
+        failures = 0
+        for result in generate_batch(args.batch, args.workers, ordered=not args.unordered,
+                                     resize=args.resize, encoding=encoding,
+                                     caption_style=CaptionStyle.preset(args.style), max_files=args.max_files):
+            failures += result.error is not None
+            print(json.dumps({'index': result.index, 'path': result.path, 'error': result.error}), flush=True)
+        print(f"Batch finished with {failures} failed job(s).")
+        raise SystemExit(1 if failures else 0)
 
     options = {
         'image': args.image,
         'body': args.body,
-        'author': args.author
+        'author': args.author,
+        'resize': args.resize,
+        'encoding': encoding,
+        'caption_style': CaptionStyle.preset(args.style),
     }
 
     generated_path = generate_meme(options)
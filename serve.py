@@ -0,0 +1,169 @@
+"""
+Meme Generator Production Server.
+
+Serves the Flask application from several worker processes that share one
+listening socket, instead of the single-process development server started by
+`python app.py`.
+
+The parent process imports the application, which loads the quote corpus, and
+decodes every base image into the image cache. It then calls `gc.freeze()` and
+forks the workers. They share that memory copy-on-write instead of each loading
+its own, and the garbage collector in a worker never touches the frozen objects.
+Without that, a collection would write to them and so copy their pages. A
+worker that dies is replaced; one that keeps crashing right after it starts is
+replaced after a delay that doubles with every crash, up to 30 seconds.
+
+Each worker handles requests on threads, so a slow image download for
+`POST /create` does not hold up other requests. Render jobs of `MEME_ASYNC=1`
+are kept by the worker that accepted them, so that mode needs `--workers 1`.
+
+The in-memory meme store is per process, and the browser may fetch a meme
+from a different worker than the one that rendered it. So with more than one
+worker, memes are written to `./static` (`MEME_PERSIST=1`) unless
+`MEME_PERSIST` is set. Every worker evicts old memes from it with its own
+output cache, so the directory holds up to `--workers` times the cache limit,
+and a meme one worker still serves may be deleted by another and rendered
+again on its next request.
+
+Usage:
+   ```bash
+   python serve.py --workers 4 --port 8000
+   ```
+   With Gunicorn installed, `gunicorn -c gunicorn.conf.py app:app` runs the
+   same setup.
+"""
+
+import argparse
+import gc
+import logging
+import os
+import signal
+import socket
+import threading
+import time
+
+from werkzeug.serving import make_server
+
+logger = logging.getLogger('serve')
+
+RESPAWN_DELAY = 0.5
+MAX_RESPAWN_DELAY = 30
+MIN_UPTIME = 5
+
+
+def check_workers(workers):
+    """
+    Check that the application settings work with the number of workers.
+
+    :param workers: The number of worker processes.
+    :raises ValueError: If MEME_ASYNC=1 is combined with more than one worker.
+    """
+    if workers > 1 and os.environ.get('MEME_ASYNC', '0') == '1':
+        raise ValueError("MEME_ASYNC=1 keeps render jobs in the worker that accepted them; use --workers 1")
+
+
+def respawn_delay(uptime, previous):
+    """
+    Return how long to wait before replacing a worker that exited.
+
+    A worker that exits within MIN_UPTIME seconds of starting is most likely
+    failing on every start, so each such crash doubles the delay, up to
+    MAX_RESPAWN_DELAY. A worker that ran longer is replaced at once.
+
+    :param uptime: The seconds the worker ran for.
+    :param previous: The delay before the previous replacement.
+    :return: The delay in seconds.
+    """
+    if uptime >= MIN_UPTIME:
+        return 0
+    return min(max(previous * 2, RESPAWN_DELAY), MAX_RESPAWN_DELAY)
+
+
+def start_worker(listener, host, port):
+    """
+    Fork a worker process that serves requests from the shared socket.
+
+    :param listener: The bound, listening socket.
+    :param host: The host the socket is bound to.
+    :param port: The port the socket is bound to.
+    :return: The worker's process id, in the parent.
+    """
+    pid = os.fork()
+    if pid:
+        return pid
+
+    import app as web_app
+
+    signal.signal(signal.SIGINT, signal.SIG_DFL)
+    server = make_server(host, port, web_app.app, threaded=True, fd=listener.fileno())
+    # serve_forever() only returns once shutdown() is called from another thread.
+    signal.signal(signal.SIGTERM, lambda signum, frame: threading.Thread(target=server.shutdown).start())
+    try:
+        server.serve_forever()
+    finally:
+        os._exit(0)
+
+
+def serve(host, port, workers):
+    """
+    Load the application once, then fork the workers and supervise them.
+
+    :param host: The host to listen on.
+    :param port: The port to listen on.
+    :param workers: The number of worker processes.
+    """
+    listener = socket.create_server((host, port), backlog=1024)
+
+    import app as web_app
+    web_app.warm_up()
+    gc.freeze()
+
+    children = {start_worker(listener, host, port): time.monotonic() for _ in range(workers)}
+    print(f"Serving on http://{host}:{port}/ with {workers} worker(s)", flush=True)
+
+    stopping = False
+    delay = 0
+
+    def stop(signum, frame):
+        nonlocal stopping
+        stopping = True
+        for child in children:
+            os.kill(child, signal.SIGTERM)
+
+    signal.signal(signal.SIGINT, stop)
+    signal.signal(signal.SIGTERM, stop)
+
+    while children:
+        try:
+            pid, status = os.wait()
+        except ChildProcessError:
+            break
+        started = children.pop(pid, None)
+        if started is None or stopping:
+            continue
+        delay = respawn_delay(time.monotonic() - started, delay)
+        logger.error("Worker %d exited with status %d, starting a new one in %.1f s", pid, status, delay,
+                     extra={'pid': pid, 'status': status, 'delay': delay})
+        time.sleep(delay)
+        if not stopping:
+            children[start_worker(listener, host, port)] = time.monotonic()
+    listener.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Serve the meme generator with several worker processes.")
+    parser.add_argument("--host", type=str, default='127.0.0.1', help="Host to listen on")
+    parser.add_argument("--port", type=int, default=8000, help="Port to listen on")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="Number of worker processes")
+    parser.add_argument("--quiet", action="store_true", help="Do not log every request")
+    args = parser.parse_args()
+
+    if args.workers > 1:
+        os.environ.setdefault('MEME_PERSIST', '1')
+    try:
+        check_workers(args.workers)
+    except ValueError as e:
+        parser.error(str(e))
+    if args.quiet:
+        logging.getLogger('werkzeug').setLevel(logging.ERROR)
+    serve(args.host, args.port, args.workers)
@@ -0,0 +1,28 @@
+"""Shared fixtures for the test suite."""
+
+import os
+
+import pytest
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+@pytest.fixture
+def web_app(monkeypatch):
+    """
+    Import the Flask application from the repository root.
+
+    The application reads its settings when it is first imported, so the
+    meme pools and the resource watcher are disabled here for every test.
+    """
+    monkeypatch.chdir(REPO_ROOT)
+    monkeypatch.setenv('MEME_POOL_SIZE', '0')
+    monkeypatch.setenv('MEME_RELOAD_INTERVAL', '0')
+    import app
+    return app
+
+
+@pytest.fixture
+def client(web_app):
+    """Return a test client for the Flask application."""
+    return web_app.app.test_client()
@@ -0,0 +1,54 @@
+"""Tests for streaming animation frames with AnimationWriter."""
+
+import io
+import weakref
+
+import pytest
+from PIL import Image
+
+from MemeGenerator.AnimationWriter import AnimationWriter
+from MemeGenerator.EncodeOptions import EncodeOptions
+
+FRAME_COUNT = 30
+
+
+def make_frames(alive, peak):
+    """Yield distinct frames and record the most that were alive at once."""
+    for index in range(FRAME_COUNT):
+        frame = Image.new('RGB', (64, 48), (index * 8, 255 - index * 8, 40))
+        frame.info['duration'] = 40 + index
+        alive.append(weakref.ref(frame))
+        peak[0] = max(peak[0], sum(ref() is not None for ref in alive))
+        yield frame
+        del frame
+
+
+@pytest.mark.parametrize('image_format', EncodeOptions.ANIMATED_FORMATS)
+def test_frames_are_encoded_one_at_a_time(image_format):
+    alive = []
+    peak = [0]
+    output = io.BytesIO()
+
+    written = AnimationWriter(EncodeOptions(image_format)).write(make_frames(alive, peak), FRAME_COUNT, output)
+
+    assert written == FRAME_COUNT
+    assert peak[0] <= 3
+    output.seek(0)
+    with Image.open(output) as animation:
+        assert animation.format == image_format
+        assert animation.n_frames == FRAME_COUNT
+
+
+def test_webp_keeps_each_frame_duration():
+    output = io.BytesIO()
+
+    AnimationWriter(EncodeOptions('WEBP')).write(make_frames([], [0]), FRAME_COUNT, output)
+
+    output.seek(0)
+    with Image.open(output) as animation:
+        durations = []
+        for index in range(animation.n_frames):
+            animation.seek(index)
+            animation.load()
+            durations.append(animation.info['duration'])
+    assert durations == [40 + index for index in range(FRAME_COUNT)]
@@ -0,0 +1,71 @@
+"""Tests for rendering a JSON Lines batch with meme.py."""
+
+import json
+import os
+
+import pytest
+
+from conftest import REPO_ROOT
+
+IMAGE = os.path.join(REPO_ROOT, '_data', 'photos', 'dog', 'xander_1.jpg')
+
+
+@pytest.fixture
+def meme_script(monkeypatch, tmp_path):
+    monkeypatch.chdir(REPO_ROOT)
+    import meme
+    monkeypatch.setattr(meme, 'OUTPUT_DIR', str(tmp_path / 'out'))
+    return meme
+
+
+def write_batch(tmp_path, lines):
+    path = tmp_path / 'jobs.jsonl'
+    path.write_text('\n'.join(lines) + '\n', encoding='utf-8')
+    return str(path)
+
+
+def test_bad_lines_fail_their_own_job_only(meme_script, tmp_path):
+    batch = write_batch(tmp_path, [
+        json.dumps({'image': IMAGE, 'body': 'Good dog', 'author': 'Xander', 'seed': 1}),
+        '{"image": ',
+        json.dumps({'image': IMAGE, 'body': 'No author'}),
+        '',
+        json.dumps(['not', 'a', 'job']),
+        json.dumps({'image': IMAGE, 'body': 'Bad format', 'author': 'Xander', 'format': 'bmp'}),
+        json.dumps({'image': IMAGE, 'body': 'Last one', 'author': 'Xander', 'seed': 2}),
+    ])
+
+    results = list(meme_script.generate_batch(batch, workers=1))
+
+    assert [result.index for result in results] == [0, 1, 2, 3, 4, 5]
+    assert [result.error is None for result in results] == [True, False, False, False, False, True]
+    assert results[1].error.startswith('line 2: JSONDecodeError')
+    assert 'author is required' in results[2].error
+    assert results[3].error.startswith('line 5: ')
+    assert 'Unsupported output format' in results[4].error
+    assert all(os.path.exists(result.path) for result in results if result.error is None)
+
+
+def test_jobs_can_set_their_own_format(meme_script, tmp_path):
+    batch = write_batch(tmp_path, [
+        json.dumps({'image': IMAGE, 'body': 'Default', 'author': 'Xander'}),
+        json.dumps({'image': IMAGE, 'body': 'Lossless', 'author': 'Xander', 'format': 'png'}),
+        json.dumps({'image': IMAGE, 'body': 'Small', 'author': 'Xander', 'format': 'webp', 'quality': 40}),
+    ])
+
+    paths = [result.path for result in meme_script.generate_batch(batch, workers=1)]
+
+    assert [os.path.splitext(path)[1] for path in paths] == ['.jpg', '.png', '.webp']
+
+
+def test_jobs_are_read_as_they_are_consumed(meme_script, tmp_path):
+    batch = write_batch(tmp_path, [
+        json.dumps({'image': IMAGE, 'body': 'First', 'author': 'Xander'}),
+        '{"image": ',
+    ])
+
+    jobs = meme_script.read_batch_jobs(batch)
+
+    assert next(jobs)['text'] == 'First'
+    assert 'error' in next(jobs)
+    assert next(jobs, None) is None
@@ -0,0 +1,56 @@
+import os
+import subprocess
+import sys
+
+import pytest
+
+from MemeGenerator.CaptionStyle import CaptionStyle
+from conftest import REPO_ROOT
+
+
+def test_default_preset_is_outlined():
+    style = CaptionStyle.preset(CaptionStyle.DEFAULT_PRESET)
+
+    assert style.outline_width > 0
+    assert style.fill == '#ffffff'
+
+
+def test_preset_names_are_case_insensitive():
+    assert CaptionStyle.preset('Shadow') == CaptionStyle.preset('shadow')
+
+
+def test_unknown_preset_is_rejected():
+    with pytest.raises(ValueError):
+        CaptionStyle.preset('comic-sans')
+
+
+def test_generator_defaults_to_outlined_captions(web_app):
+    assert web_app.meme.caption_style == CaptionStyle.preset('outline')
+
+
+@pytest.mark.parametrize('style', CaptionStyle.PRESETS)
+def test_random_meme_in_each_style(client, style):
+    response = client.get(f'/?style={style}')
+
+    assert response.status_code == 200
+
+
+def test_unknown_style_is_a_bad_request(client):
+    response = client.get('/?style=bogus')
+
+    assert response.status_code == 400
+
+
+def test_form_offers_the_styles(client):
+    page = client.get('/create').get_data(as_text=True)
+
+    for style in CaptionStyle.PRESETS:
+        assert f'value="{style}"' in page
+
+
+@pytest.mark.parametrize('module', ['app', 'meme'])
+def test_numpy_is_not_imported_at_startup(module):
+    env = dict(os.environ, MEME_POOL_SIZE='0', MEME_RELOAD_INTERVAL='0')
+    code = f"import sys, {module}; sys.exit('numpy' in sys.modules)"
+
+    assert subprocess.run([sys.executable, '-c', code], cwd=REPO_ROOT, env=env).returncode == 0
@@ -0,0 +1,45 @@
+"""Tests for encoding memes with EncodeOptions."""
+
+import io
+import os
+
+import pytest
+from PIL import Image
+
+from MemeGenerator.CaptionStyle import CaptionStyle
+from MemeGenerator.EncodeOptions import EncodeOptions
+from MemeGenerator.MemeGenerator import MemeGenerator
+from conftest import REPO_ROOT
+
+FONT = os.path.join(REPO_ROOT, 'font', 'Arial.ttf')
+
+
+@pytest.fixture
+def cmyk_source(tmp_path):
+    path = tmp_path / 'cmyk.jpg'
+    Image.new('CMYK', (320, 240), (20, 200, 40, 0)).save(path, format='JPEG')
+    return str(path)
+
+
+@pytest.mark.parametrize('image_format', list(EncodeOptions.FORMATS))
+def test_cmyk_source_is_saved_in_every_format(tmp_path, cmyk_source, image_format):
+    # The plain style draws on the source in its own mode; the other styles convert it to RGB.
+    generator = MemeGenerator(str(tmp_path / 'out'), FONT, encoding=EncodeOptions(image_format),
+                              caption_style=CaptionStyle.preset('plain'))
+
+    path = generator.make_meme(cmyk_source, 'Ink dog', 'Xander')
+
+    assert path is not None
+    with Image.open(path) as meme:
+        assert meme.format == image_format
+
+
+@pytest.mark.parametrize('image_format', ['PNG', 'WEBP'])
+def test_transparency_is_kept_where_the_format_can_store_it(image_format):
+    output = io.BytesIO()
+
+    EncodeOptions(image_format).save(Image.new('LA', (8, 8), (128, 0)), output)
+
+    output.seek(0)
+    with Image.open(output) as saved:
+        assert 'A' in saved.getbands()
@@ -0,0 +1,37 @@
+"""Tests for the shared FontRegistry."""
+
+import os
+import threading
+
+from MemeGenerator.FontRegistry import FontRegistry
+from conftest import REPO_ROOT
+
+FONT = os.path.join(REPO_ROOT, 'font', 'Arial.ttf')
+
+
+def test_each_face_and_file_is_loaded_once():
+    registry = FontRegistry()
+
+    first = registry.get(FONT, 20)
+
+    assert registry.get(FONT, 20) is first
+    registry.get(FONT, 30)
+    stats = registry.stats()
+    assert (stats['loads'], stats['file_reads'], stats['hits'], stats['faces']) == (2, 1, 1, 2)
+
+
+def test_counters_add_up_under_concurrent_lookups():
+    registry = FontRegistry()
+    registry.get(FONT, 20)
+
+    def lookup():
+        for _ in range(1000):
+            registry.get(FONT, 20)
+
+    threads = [threading.Thread(target=lookup) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert registry.stats()['hits'] == 8000
@@ -0,0 +1,135 @@
+"""Tests for ImageFetcher against a local stand-in origin."""
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from MemeGenerator.ImageFetcher import ImageFetcher, ImageFetchError, ImageTooLargeError
+
+BODY = b'x' * 1000
+
+
+class _Origin(BaseHTTPRequestHandler):
+    """Serve a few misbehaving image endpoints."""
+
+    protocol_version = 'HTTP/1.1'
+
+    def handle(self):
+        try:
+            super().handle()
+        except OSError:
+            # The fetcher hung up, as it should for the misbehaving endpoints.
+            pass
+
+    def do_GET(self):
+        if self.path == '/image':
+            self._headers(len(BODY))
+            self.wfile.write(BODY)
+        elif self.path == '/drip':
+            # A byte every 0.2 s never trips a read timeout.
+            self._headers(1000)
+            for _ in range(1000):
+                self.wfile.write(b'x')
+                self.wfile.flush()
+                time.sleep(0.2)
+        elif self.path == '/large':
+            self._headers(1000000)
+            self.wfile.write(b'x' * 1000000)
+        elif self.path == '/large-undeclared':
+            self.send_response(200)
+            self.send_header('Connection', 'close')
+            self.end_headers()
+            self.wfile.write(b'x' * 1000000)
+        elif self.path == '/slow':
+            time.sleep(0.5)
+            self._headers(len(BODY))
+            self.wfile.write(BODY)
+        elif self.path == '/slow-headers':
+            # The headers arrive a byte every 0.2 s, before any body is read.
+            self.wfile.write(b'HTTP/1.1 200 OK\r\n')
+            for byte in b'X-Padding: ' + b'x' * 1000:
+                self.wfile.write(bytes([byte]))
+                self.wfile.flush()
+                time.sleep(0.2)
+        else:
+            self._headers(0, status=404)
+
+    def _headers(self, length, status=200):
+        self.send_response(status)
+        self.send_header('Content-Length', str(length))
+        self.end_headers()
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture(scope='module')
+def origin():
+    server = ThreadingHTTPServer(('127.0.0.1', 0), _Origin)
+    server.daemon_threads = True
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f'http://127.0.0.1:{server.server_address[1]}'
+    server.shutdown()
+    server.server_close()
+
+
+def test_fetch_returns_the_body(origin):
+    result = ImageFetcher().fetch(origin + '/image')
+
+    assert result.status == 200
+    assert result.data == BODY
+
+
+def test_trickling_origin_is_cut_off_at_max_seconds(origin):
+    fetcher = ImageFetcher(timeout=(1, 5), max_seconds=1.0)
+
+    start = time.monotonic()
+    with pytest.raises(ImageFetchError, match='took longer'):
+        fetcher.fetch(origin + '/drip')
+    assert time.monotonic() - start < 2.0
+
+
+def test_trickling_headers_are_cut_off_at_max_seconds(origin):
+    fetcher = ImageFetcher(timeout=(1, 5), max_seconds=1.0)
+
+    start = time.monotonic()
+    with pytest.raises(ImageFetchError, match='took longer'):
+        fetcher.fetch(origin + '/slow-headers')
+    assert time.monotonic() - start < 2.0
+
+    assert fetcher.fetch(origin + '/image').data == BODY
+
+
+def test_fetcher_still_works_after_a_deadline(origin):
+    fetcher = ImageFetcher(max_seconds=0.5)
+    with pytest.raises(ImageFetchError):
+        fetcher.fetch(origin + '/drip')
+
+    assert fetcher.fetch(origin + '/image').data == BODY
+
+
+@pytest.mark.parametrize('path', ['/large', '/large-undeclared'])
+def test_oversized_image_is_rejected(origin, path):
+    with pytest.raises(ImageTooLargeError):
+        ImageFetcher(max_bytes=100000).fetch(origin + path)
+
+
+def test_unexpected_status_is_an_error(origin):
+    with pytest.raises(ImageFetchError, match='404'):
+        ImageFetcher().fetch(origin + '/missing')
+
+
+def test_concurrent_fetches_run_in_parallel(origin):
+    fetcher = ImageFetcher(pool_size=8)
+
+    start = time.monotonic()
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        results = list(executor.map(lambda _: fetcher.fetch(origin + '/slow'), range(8)))
+    elapsed = time.monotonic() - start
+
+    assert all(result.data == BODY for result in results)
+    assert elapsed < 8 * 0.5 / 2
@@ -0,0 +1,93 @@
+"""Tests for parsing quote files through Ingestor."""
+
+import os
+import shutil
+import sys
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from QuoteEngine.CSVIngestor import CSVIngestor
+from QuoteEngine.Ingestor import Ingestor
+from QuoteEngine.PDFIngestor import PDFIngestor
+from QuoteEngine.QuoteModel import QuoteModel
+from QuoteEngine.TextIngestor import TextIngestor
+
+PDF_SOURCE = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                          '_data', 'DogQuotes', 'DogQuotesPDF.pdf')
+
+
+@pytest.fixture
+def text_file(tmp_path):
+    path = tmp_path / 'quotes.txt'
+    path.write_text("Chase the mailman - Skittle\nTreat yourself - Rex\n", encoding='utf-8')
+    return str(path)
+
+
+def test_parse_cached_reuses_the_snapshot(tmp_path, text_file):
+    snapshot = str(tmp_path / 'quotes.snapshot')
+    expected = [QuoteModel("Chase the mailman", "Skittle"), QuoteModel("Treat yourself", "Rex")]
+
+    assert Ingestor.parse_cached([text_file], snapshot) == expected
+    assert Ingestor.parse_cached([text_file], snapshot) == expected
+
+
+def test_failed_parse_is_not_snapshotted(tmp_path, text_file):
+    snapshot = str(tmp_path / 'quotes.snapshot')
+    broken = tmp_path / 'broken.txt'
+    broken.write_bytes(b"\xff\xfe not UTF-8 - Nobody\n")
+    errors = TextIngestor.errors
+
+    assert Ingestor.parse_cached([str(broken), text_file], snapshot) == Ingestor.parse(text_file)
+    assert TextIngestor.errors == errors + 1
+
+    # The file was not remembered as empty, so it is parsed again.
+    Ingestor.parse_cached([str(broken), text_file], snapshot)
+    assert TextIngestor.errors == errors + 2
+
+
+def test_pdf_recovers_after_its_backend_is_fixed(tmp_path, monkeypatch):
+    pytest.importorskip('pypdf')
+    source = tmp_path / 'quotes.pdf'
+    shutil.copyfile(PDF_SOURCE, source)
+    snapshot = str(tmp_path / 'quotes.snapshot')
+
+    monkeypatch.setattr(PDFIngestor, 'extract_text', classmethod(lambda cls, path: 1 / 0))
+    assert Ingestor.parse_cached([str(source)], snapshot) == []
+    assert PDFIngestor.parse(str(source)) == []
+
+    monkeypatch.undo()
+    assert len(Ingestor.parse_cached([str(source)], snapshot)) == len(PDFIngestor.parse(str(source))) > 0
+
+
+def test_parse_many_skips_failed_files(tmp_path, text_file):
+    broken = tmp_path / 'broken.txt'
+    broken.write_bytes(b"\xff\xfe\n")
+
+    assert Ingestor.parse_many([str(broken), text_file], workers=1) == Ingestor.parse(text_file)
+
+
+def test_counters_are_exact_under_threads(tmp_path, monkeypatch):
+    monkeypatch.setattr(CSVIngestor, 'malformed_rows', 0)
+    monkeypatch.setattr(TextIngestor, 'errors', 0)
+    malformed = tmp_path / 'malformed.csv'
+    malformed.write_text("body,author\n" + "No author,\n" * 50 + "Sit - Rex,Rex\n", encoding='utf-8')
+    broken = tmp_path / 'broken.txt'
+    broken.write_bytes(b"\xff\xfe\n")
+
+    def work(_):
+        for _ in range(20):
+            CSVIngestor.parse(str(malformed))
+            TextIngestor.parse(str(broken))
+
+    # Switch threads as often as possible so that unlocked updates get lost.
+    interval = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)
+    try:
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            list(pool.map(work, range(8)))
+    finally:
+        sys.setswitchinterval(interval)
+
+    assert CSVIngestor.malformed_rows == 8 * 20 * 50
+    assert TextIngestor.errors == 8 * 20
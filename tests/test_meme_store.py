@@ -0,0 +1,93 @@
+"""Tests for serving memes from the in-memory MemeStore."""
+
+import re
+
+import pytest
+
+from MemeGenerator.MemeStore import MemeStore
+
+
+def test_store_keeps_the_format_with_the_bytes():
+    store = MemeStore()
+    store.put('abc', b'webp bytes', 'WEBP')
+
+    stored = store.get('abc')
+
+    assert stored.data == b'webp bytes'
+    assert stored.image_format == 'WEBP'
+
+
+def test_replacing_a_meme_keeps_the_byte_count_right():
+    store = MemeStore(max_bytes=100)
+    store.put('abc', b'x' * 60, 'JPEG')
+    store.put('abc', b'x' * 30, 'JPEG')
+    store.put('def', b'x' * 60, 'JPEG')
+
+    assert store.stats()['bytes'] == 90
+    assert store.stats()['evictions'] == 0
+
+
+def meme_path(client, accept):
+    page = client.get('/', headers={'Accept': accept}).get_data(as_text=True)
+    return re.search(r'/meme/[0-9a-f]+\.\w+', page).group(0)
+
+
+def test_meme_is_served_with_its_own_mime_type(client):
+    path = meme_path(client, 'image/webp,*/*')
+
+    response = client.get(path)
+
+    assert path.endswith('.webp')
+    assert response.status_code == 200
+    assert response.mimetype == 'image/webp'
+    assert response.data[8:12] == b'WEBP'
+
+
+def test_meme_under_another_extension_is_not_found(client):
+    path = meme_path(client, 'text/html')
+
+    assert path.endswith('.jpg')
+    assert client.get(path[:-len('.jpg')] + '.png').status_code == 404
+    assert client.get(path[:-len('.jpg')] + '.webp').status_code == 404
+
+
+def test_revalidation_only_succeeds_for_a_stored_meme(client):
+    path = meme_path(client, 'text/html')
+    meme_id = path[len('/meme/'):-len('.jpg')]
+    unknown = '0' * len(meme_id)
+    headers = {'If-None-Match': f'"{meme_id}", "{unknown}"'}
+
+    assert client.get(path, headers=headers).status_code == 304
+    assert client.get(f'/meme/{meme_id}.png', headers=headers).status_code == 404
+    assert client.get(f'/meme/{unknown}.jpg', headers=headers).status_code == 404
+
+
+@pytest.mark.parametrize('accept, extension', [
+    ('*/*', '.jpg'),
+    ('text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8', '.jpg'),
+    ('image/webp;q=0,*/*', '.jpg'),
+    ('image/avif,image/webp,image/apng,*/*;q=0.8', '.webp'),
+])
+def test_webp_is_only_served_when_listed(client, accept, extension):
+    assert meme_path(client, accept).endswith(extension)
+
+
+def test_membership_checks_are_not_counted_as_lookups():
+    store = MemeStore()
+    store.put('abc', b'jpeg bytes', 'JPEG')
+
+    assert 'abc' in store
+    assert 'def' not in store
+    stats = store.stats()
+    assert (stats['hits'], stats['misses']) == (0, 0)
+
+
+def test_pool_freshness_checks_leave_the_store_counters_alone(web_app, client):
+    path = meme_path(client, 'text/html')
+    meme_id = path.rsplit('/', 1)[1].split('.')[0]
+    before = web_app.meme_store.stats()
+
+    assert web_app.is_servable((meme_id, 'jpg'))
+    assert not web_app.is_servable(('0' * 16, 'jpg'))
+    after = web_app.meme_store.stats()
+    assert (after['hits'], after['misses']) == (before['hits'], before['misses'])
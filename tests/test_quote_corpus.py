@@ -0,0 +1,48 @@
+"""Tests for filtered quote lookups in QuoteCorpus and the / route."""
+
+import random
+
+import pytest
+
+from QuoteEngine.QuoteCorpus import QuoteCorpus
+from QuoteEngine.QuoteModel import QuoteModel
+
+QUOTES = [
+    QuoteModel("Chase the mailman", "Skittle"),
+    QuoteModel("Bark like no one is listening", "Rex"),
+    QuoteModel("Treat yourself", "Skittle"),
+]
+
+
+@pytest.mark.parametrize('index', [True, False])
+@pytest.mark.parametrize('contains', ['!', '...', ' - '])
+def test_punctuation_only_filter_matches_every_quote(index, contains):
+    corpus = QuoteCorpus.from_quotes(QUOTES, index=index)
+
+    assert corpus.find(contains=contains) == QUOTES
+    assert corpus.random_choice(random.Random(0), contains=contains) in QUOTES
+
+
+@pytest.mark.parametrize('index', [True, False])
+def test_punctuation_only_filter_keeps_the_author_filter(index):
+    corpus = QuoteCorpus.from_quotes(QUOTES, index=index)
+
+    for seed in range(10):
+        assert corpus.random_choice(random.Random(seed), author='rex', contains='?!').author == 'Rex'
+
+
+@pytest.mark.parametrize('index', [True, False])
+def test_unmatched_filter_raises_index_error(index):
+    corpus = QuoteCorpus.from_quotes(QUOTES, index=index)
+
+    with pytest.raises(IndexError):
+        corpus.random_choice(random.Random(0), contains='squirrel')
+
+
+@pytest.mark.parametrize('query', ['!', '...'])
+def test_random_meme_with_punctuation_only_query(client, query):
+    assert client.get('/', query_string={'q': query}).status_code == 200
+
+
+def test_random_meme_with_unmatched_query(client):
+    assert client.get('/', query_string={'q': 'xylophone'}).status_code == 404
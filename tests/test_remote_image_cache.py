@@ -0,0 +1,122 @@
+"""Tests for RemoteImageCache with a scripted fetcher."""
+
+import hashlib
+import threading
+
+import pytest
+
+from MemeGenerator import RemoteImageCache as remote_image_cache
+from MemeGenerator.ImageCache import ImageCache
+from MemeGenerator.ImageFetcher import FetchResult, ImageFetchError
+from MemeGenerator.RemoteImageCache import RemoteImageCache
+
+URL = 'http://images.example/dog.jpg'
+IMAGE = b'jpeg bytes' * 100
+
+
+class ScriptedFetcher:
+    """Answer each fetch with the next scripted response or exception."""
+
+    def __init__(self, *responses):
+        self.responses = list(responses)
+        self.requests = []
+
+    def fetch(self, url, headers=None):
+        self.requests.append(headers)
+        response = self.responses.pop(0)
+        if isinstance(response, Exception):
+            raise response
+        return response
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def time(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(remote_image_cache.time, 'time', clock.time)
+    return clock
+
+
+def test_hits_are_served_from_memory(tmp_path, monkeypatch):
+    fetcher = ScriptedFetcher(FetchResult(200, IMAGE, {'ETag': '"v1"'}))
+    cache = RemoteImageCache(fetcher, str(tmp_path))
+    first = cache.get(URL)
+    monkeypatch.setattr(cache, '_read_data', lambda name: pytest.fail("a hit read the file"))
+
+    second = cache.get(URL)
+
+    assert second is first
+    assert ImageCache.source_key(second, 500) == ('sha256', hashlib.sha256(IMAGE).hexdigest(), 500)
+    assert cache.stats()['hits'] == 1
+
+
+def test_hits_after_a_restart_read_the_file_once(tmp_path):
+    RemoteImageCache(ScriptedFetcher(FetchResult(200, IMAGE, {})), str(tmp_path)).get(URL)
+    cache = RemoteImageCache(ScriptedFetcher(), str(tmp_path))
+
+    assert cache.get(URL) == IMAGE
+    assert cache.get(URL) is cache.get(URL)
+    assert cache.stats()['bytes'] == len(IMAGE)
+
+
+def test_memory_budget_drops_the_least_recently_used_bytes(tmp_path):
+    fetcher = ScriptedFetcher(FetchResult(200, IMAGE, {}), FetchResult(200, IMAGE + b'2', {}))
+    cache = RemoteImageCache(fetcher, str(tmp_path), max_memory_bytes=len(IMAGE) + 10)
+
+    cache.get(URL)
+    cache.get(URL + '?2')
+
+    assert cache.stats()['bytes'] == len(IMAGE) + 1
+    assert cache.get(URL) == IMAGE
+
+
+def test_expired_entry_is_served_while_the_origin_fails(tmp_path, clock):
+    fetcher = ScriptedFetcher(FetchResult(200, IMAGE, {'ETag': '"v1"'}), ImageFetchError("origin down"))
+    cache = RemoteImageCache(fetcher, str(tmp_path), ttl=60)
+    cache.get(URL)
+    clock.now += 61
+
+    assert cache.get(URL) == IMAGE
+    assert fetcher.requests[-1] == {'If-None-Match': '"v1"'}
+    assert cache.stats()['stale'] == 1
+
+
+def test_stale_copy_is_not_served_forever(tmp_path, clock):
+    fetcher = ScriptedFetcher(FetchResult(200, IMAGE, {}), ImageFetchError("origin down"))
+    cache = RemoteImageCache(fetcher, str(tmp_path), ttl=60, stale_if_error=600)
+    cache.get(URL)
+    clock.now += 661
+
+    with pytest.raises(ImageFetchError):
+        cache.get(URL)
+
+
+def test_unknown_url_still_raises_when_the_origin_fails(tmp_path):
+    cache = RemoteImageCache(ScriptedFetcher(ImageFetchError("origin down")), str(tmp_path))
+
+    with pytest.raises(ImageFetchError):
+        cache.get(URL)
+
+
+def test_counters_add_up_under_concurrent_hits(tmp_path):
+    cache = RemoteImageCache(ScriptedFetcher(FetchResult(200, IMAGE, {})), str(tmp_path))
+    cache.get(URL)
+
+    def hit():
+        for _ in range(500):
+            cache.get(URL)
+
+    threads = [threading.Thread(target=hit) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert cache.stats()['hits'] == 4000
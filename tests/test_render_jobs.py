@@ -0,0 +1,85 @@
+"""Tests for rendering /create memes on the render queue (MEME_ASYNC=1)."""
+
+import os
+import threading
+
+import pytest
+
+from MemeGenerator.RenderQueue import RenderQueue
+from conftest import REPO_ROOT
+
+IMAGE_URL = 'http://images.example/dog.jpg'
+
+with open(os.path.join(REPO_ROOT, '_data', 'photos', 'dog', 'xander_1.jpg'), 'rb') as image_file:
+    IMAGE = image_file.read()
+
+
+class HeldImages:
+    """Stand in for the remote image cache, holding every download until released."""
+
+    def __init__(self):
+        self.release = threading.Event()
+
+    def get(self, url):
+        self.release.wait(10)
+        return IMAGE
+
+
+@pytest.fixture
+def async_app(web_app, monkeypatch):
+    queue = RenderQueue(workers=1, max_pending=2)
+    images = HeldImages()
+    monkeypatch.setattr(web_app, 'ASYNC_RENDER', True)
+    monkeypatch.setattr(web_app, 'render_queue', queue)
+    monkeypatch.setattr(web_app, 'remote_images', images)
+    yield web_app, images
+    images.release.set()
+    queue.shutdown()
+
+
+def submit(client, body='Queued dog'):
+    return client.post('/create', data={'image_url': IMAGE_URL, 'body': body, 'author': 'Xander'})
+
+
+def test_full_queue_answers_429(async_app, client):
+    assert submit(client, 'first').status_code == 202
+    assert submit(client, 'second').status_code == 202
+
+    response = submit(client, 'third')
+
+    assert response.status_code == 429
+    assert response.headers['Retry-After'] == '1'
+
+
+def test_job_reports_its_status_until_it_is_done(async_app, client):
+    _, images = async_app
+    status_url = submit(client).get_json()['status_url']
+
+    pending = client.get(status_url)
+    assert pending.status_code == 202
+    assert pending.get_json()['status'] in ('queued', 'running')
+
+    images.release.set()
+    done = client.get(status_url + '?wait=10')
+    assert done.status_code == 303
+
+
+def test_unknown_job_is_not_found(async_app, client):
+    assert client.get('/jobs/nope').status_code == 404
+
+
+@pytest.mark.parametrize('persist', [False, True])
+def test_finished_job_redirects_to_a_servable_meme(async_app, client, monkeypatch, persist):
+    web_app, images = async_app
+    monkeypatch.setattr(web_app, 'PERSIST_MEMES', persist)
+    images.release.set()
+    status_url = submit(client).get_json()['status_url']
+
+    response = client.get(status_url + '?wait=10')
+    location = response.headers['Location']
+
+    assert response.status_code == 303
+    assert location.startswith('/static/' if persist else '/meme/')
+    image = client.get(location)
+    assert image.status_code == 200
+    assert image.mimetype == 'image/jpeg'
@@ -0,0 +1,66 @@
+"""Tests for ResourceWatcher when files cannot be read."""
+
+import os
+
+from QuoteEngine.ResourceWatcher import ResourceWatcher
+
+
+class VanishingEntry:
+    """A directory entry whose file is removed before it can be stat'ed."""
+
+    def __init__(self, name):
+        self.name = name
+
+    def is_file(self):
+        return True
+
+    def stat(self):
+        raise FileNotFoundError(self.name)
+
+
+def watch(paths):
+    reported = []
+    return ResourceWatcher(paths, reported.append), reported
+
+
+def test_file_removed_while_listing_counts_as_changed(tmp_path, monkeypatch):
+    (tmp_path / 'quotes.txt').write_text('a - b')
+    watcher, reported = watch([str(tmp_path)])
+    monkeypatch.setattr(os, 'scandir', lambda path: iter([VanishingEntry('quotes.txt')]))
+
+    changed = watcher.poll()
+
+    assert changed == [os.path.join(str(tmp_path), 'quotes.txt')]
+    assert reported == [changed]
+
+
+def test_unlistable_directory_counts_as_changed(tmp_path, monkeypatch):
+    (tmp_path / 'dog.jpg').write_bytes(b'jpg')
+    watcher, reported = watch([str(tmp_path)])
+
+    def refuse(path):
+        raise PermissionError(path)
+
+    monkeypatch.setattr(os, 'scandir', refuse)
+    assert watcher.poll() == [os.path.join(str(tmp_path), 'dog.jpg')]
+
+    monkeypatch.undo()
+    assert watcher.poll() == [os.path.join(str(tmp_path), 'dog.jpg')]
+    assert len(reported) == 2
+
+
+def test_unreadable_file_counts_as_changed(tmp_path, monkeypatch):
+    path = tmp_path / 'quotes.csv'
+    path.write_text('body,author')
+    watcher, _ = watch([str(path)])
+    real_stat = os.stat
+
+    def refuse(target, *args, **kwargs):
+        if os.fspath(target) == str(path):
+            raise PermissionError(target)
+        return real_stat(target, *args, **kwargs)
+
+    monkeypatch.setattr(os, 'stat', refuse)
+
+    assert watcher.poll() == [str(path)]
+    assert watcher.poll() == []
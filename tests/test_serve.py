@@ -0,0 +1,61 @@
+"""Tests for the worker checks of serve.py and gunicorn.conf.py."""
+
+import importlib.util
+import os
+from types import SimpleNamespace
+
+import pytest
+
+import serve
+from conftest import REPO_ROOT
+
+
+def load_gunicorn_conf():
+    spec = importlib.util.spec_from_file_location('gunicorn_conf', os.path.join(REPO_ROOT, 'gunicorn.conf.py'))
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def test_serve_refuses_async_jobs_on_several_workers(monkeypatch):
+    monkeypatch.setenv('MEME_ASYNC', '1')
+
+    with pytest.raises(ValueError, match='MEME_ASYNC'):
+        serve.check_workers(2)
+    serve.check_workers(1)
+
+
+def test_serve_allows_several_workers_without_async_jobs(monkeypatch):
+    monkeypatch.delenv('MEME_ASYNC', raising=False)
+
+    serve.check_workers(4)
+
+
+@pytest.mark.parametrize('workers, refused', [(1, False), (2, True)])
+def test_gunicorn_refuses_async_jobs_on_several_workers(monkeypatch, workers, refused):
+    monkeypatch.setenv('MEME_ASYNC', '1')
+    monkeypatch.setenv('MEME_PERSIST', '0')
+    conf = load_gunicorn_conf()
+    server = SimpleNamespace(cfg=SimpleNamespace(workers=workers))
+
+    if refused:
+        with pytest.raises(RuntimeError, match='MEME_ASYNC'):
+            conf.on_starting(server)
+    else:
+        conf.on_starting(server)
+
+
+def test_respawn_delay_grows_while_workers_crash_on_start():
+    delays = []
+    delay = 0
+    for _ in range(10):
+        delay = serve.respawn_delay(0.1, delay)
+        delays.append(delay)
+
+    assert delays[0] == serve.RESPAWN_DELAY
+    assert delays == sorted(delays)
+    assert delays[-1] == serve.MAX_RESPAWN_DELAY
+
+
+def test_respawn_delay_resets_after_a_worker_ran():
+    assert serve.respawn_delay(serve.MIN_UPTIME, serve.MAX_RESPAWN_DELAY) == 0
@@ -0,0 +1,33 @@
+"""Tests for wrapping and fitting captions with TextLayout."""
+
+import os
+import sys
+from concurrent.futures import ThreadPoolExecutor
+
+from conftest import REPO_ROOT
+from MemeGenerator.TextLayout import TextLayout
+
+FONT = os.path.join(REPO_ROOT, 'font', 'Arial.ttf')
+CAPTIONS = [f"caption {index} that wraps over a few lines of the box" for index in range(20)]
+
+
+def lookups(layout):
+    stats = layout.stats()
+    return stats['measured'] + stats['hits']
+
+
+def test_counters_are_exact_under_threads():
+    serial = TextLayout()
+    for caption in CAPTIONS:
+        serial.layout(FONT, caption, 200, 120, 10, 40)
+    shared = TextLayout()
+
+    interval = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)
+    try:
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            list(pool.map(lambda caption: shared.layout(FONT, caption, 200, 120, 10, 40), CAPTIONS * 8))
+    finally:
+        sys.setswitchinterval(interval)
+
+    assert lookups(shared) == lookups(serial) * 8